@@ -13,13 +13,12 @@
 
 import os
 import sys
-import time
 import pickle
 import numpy as np
 from math import pi
 import matplotlib.pyplot as plt
 
-from hyppopy.SolverPool import SolverPool
+from hyppopy.RepeatedStudy import RepeatedStudy
 from hyppopy.HyppopyProject import HyppopyProject
 from hyppopy.FunctionSimulator import FunctionSimulator
 from hyppopy.BlackboxFunction import BlackboxFunction
@@ -80,54 +79,26 @@ def compute_deviation(solver_name, vfunc_id, iterations, N, fname):
                          "set_difference": None,
                          "loss": None,
                          "loss_history": {}}
-        for i in range(vfunc.dims()):
-            results[iter]["minima"]["axis_0{}".format(i)] = []
-            results[iter]["distance"]["axis_0{}".format(i)] = []
 
         project.add_setting("max_iterations", iter)
         project.add_setting("solver", solver_name)
 
-        solver = SolverPool.get(project=project)
-        solver.blackbox = blackbox
+        print("\rSolver={} iteration={} repeats={}".format(solver_name, iter, N), end="")
+        study = RepeatedStudy(project, blackbox, repeats=N)
+        study.run()
 
-        axis_minima = []
-        best_losses = []
-        best_sets_diff = []
-        for i in range(vfunc.dims()):
-            axis_minima.append([])
-
-        loss_history = []
-        durations = []
-        for n in range(N):
-            print("\rSolver={} iteration={} round={}".format(solver, iter, n), end="")
-
-            start = time.time()
-            solver.run(print_stats=False)
-            end = time.time()
-            durations.append(end-start)
-
-            df, best = solver.get_results()
-
-            loss_history.append(np.flip(np.sort(df['losses'].values)))
-            best_row = df['losses'].idxmin()
-            best_losses.append(df['losses'][best_row])
-            best_sets_diff.append(abs(df['axis_00'][best_row] - best['axis_00'])+
-                                  abs(df['axis_01'][best_row] - best['axis_01'])+
-                                  abs(df['axis_02'][best_row] - best['axis_02'])+
-                                  abs(df['axis_03'][best_row] - best['axis_03'])+
-                                  abs(df['axis_04'][best_row] - best['axis_04']))
-            for i in range(vfunc.dims()):
-                tmp = df['axis_0{}'.format(i)][best_row]
-                axis_minima[i].append(tmp)
-
-        results[iter]["loss_history"] = loss_history
+        # best parameter set per repeat, shape (repeat x axis)
+        axis_minima = study.best_params()
+        reported = np.array([[best["axis_0{}".format(i)] for i in range(vfunc.dims())] for best in study.best])
+
+        results[iter]["loss_history"] = list(study.cumulative_minimum())
         for i in range(vfunc.dims()):
-            results[iter]["minima"]["axis_0{}".format(i)] = [np.mean(axis_minima[i]), np.std(axis_minima[i])]
-            dist = np.sqrt((axis_minima[i]-results["gt"][i])**2)
+            results[iter]["minima"]["axis_0{}".format(i)] = [np.mean(axis_minima[:, i]), np.std(axis_minima[:, i])]
+            dist = study.distance_to_optimum({"axis_0{}".format(i): results["gt"][i]})
             results[iter]["distance"]["axis_0{}".format(i)] = [np.mean(dist), np.std(dist)]
-        results[iter]["loss"] = [np.mean(best_losses), np.std(best_losses)]
-        results[iter]["set_difference"] = sum(best_sets_diff)
-        results[iter]["duration"] = np.mean(durations)
+        results[iter]["loss"] = list(study.best_loss_statistics())
+        results[iter]["set_difference"] = np.sum(np.abs(axis_minima - reported))
+        results[iter]["duration"] = np.mean(study.durations)
 
     file = open(fname, 'wb')
     pickle.dump(results, file)
@@ -250,7 +221,7 @@ def plot_loss_histories(results, fname=None):
                 else:
                     plt.plot(history, color=colors[n], alpha=0.5)
         plt.legend()
-        plt.ylabel('Loss')
+        plt.ylabel('Best Loss so far')
         plt.xlabel('Iteration')
 
         if fname is None:
@@ -28,8 +28,9 @@ def default_kwargs(**defaultKwargs):
     def actual_decorator(fn):
         @functools.wraps(fn)
         def g(*args, **kwargs):
-            defaultKwargs.update(kwargs)
-            return fn(*args, **defaultKwargs)
+            merged = dict(defaultKwargs)
+            merged.update(kwargs)
+            return fn(*args, **merged)
         return g
     return actual_decorator
 
@@ -47,6 +48,10 @@ class BlackboxFunction(object):
     - callback_func: this function is called at each iteration step getting passed the trail info content, can be used for
                      custom visualization
     - data: add a data object directly
+    - worker_init: this function is called once per process with the data object, foo(data), and returns a context
+                   object, e.g. a loaded model or tokenizer. If set, the context is passed as third argument to the
+                   blackbox function, foo(data, params, context), and kept alive between calls. Used together with
+                   a WorkerPool each worker process holds its own context.
 
     The constructor accepts several function pointers or a data object which are all None by default (see below).
     Additionally one can define an arbitrary number of arg pairs. These are passed as input to each function pointer as
@@ -56,29 +61,47 @@ class BlackboxFunction(object):
     :param preprocess_func: data preprocessing function pointer, default=None
     :param callback_func: callback function pointer, default=None
     :param data: data object, default=None
+    :param worker_init: worker context initialization function pointer, default=None
     :param kwargs: additional arg=value pairs
     """
 
-    @default_kwargs(blackbox_func=None, dataloader_func=None, preprocess_func=None, callback_func=None, data=None)
+    @default_kwargs(blackbox_func=None, dataloader_func=None, preprocess_func=None, callback_func=None, data=None,
+                    worker_init=None)
     def __init__(self, **kwargs):
         self._blackbox_func = None
         self._preprocess_func = None
         self._dataloader_func = None
         self._callback_func = None
+        self._worker_init = None
+        self._context = None
+        self._context_ready = False
         self._raw_data = None
         self._data = None
         self.setup(kwargs)
 
     def __call__(self, **kwargs):
         """
-        Call method calls blackbox_func passing the data object and the args passed
+        Call method calls blackbox_func passing the data object and the args passed, and the worker context if
+        worker_init is set
 
         :param kwargs: [dict] args
 
-        :return: blackbox_func(data, kwargs)
+        :return: blackbox_func(data, kwargs) or blackbox_func(data, kwargs, context)
         """
+        if self.worker_init is not None:
+            return self.blackbox_func(self.data, kwargs, self.context)
         return self.blackbox_func(self.data, kwargs)
 
+    def __getstate__(self):
+        """
+        The worker context belongs to the process it was created in and is not pickled, a process receiving a
+        BlackboxFunction creates its own context on first use.
+        """
+        state = self.__dict__.copy()
+        state['_context'] = None
+        state['_context_ready'] = False
+        return state
+
     def setup(self, kwargs):
         """
         Alternative to Constructor, kwargs signature see __init__
@@ -89,11 +112,15 @@ class BlackboxFunction(object):
         self._preprocess_func = kwargs['preprocess_func']
         self._dataloader_func = kwargs['dataloader_func']
         self._callback_func = kwargs['callback_func']
+        self._worker_init = kwargs['worker_init']
+        self._context = None
+        self._context_ready = False
         self._raw_data = kwargs['data']
         self._data = self._raw_data
         del kwargs['blackbox_func']
         del kwargs['preprocess_func']
         del kwargs['dataloader_func']
+        del kwargs['worker_init']
         del kwargs['data']
         params = kwargs
 
@@ -151,6 +178,28 @@ class BlackboxFunction(object):
         """
         return self._callback_func
 
+    @property
+    def worker_init(self):
+        """
+        This function is called once per process getting passed the data object and returns the worker context
+        passed to each blackbox function call.
+
+        :return: [object] worker_init
+        """
+        return self._worker_init
+
+    @property
+    def context(self):
+        """
+        The worker context of the current process, worker_init is called on first access.
+
+        :return: [object] context
+        """
+        if not self._context_ready and self.worker_init is not None:
+            self._context = self.worker_init(self.data)
+            self._context_ready = True
+        return self._context
+
     @property
     def raw_data(self):
         """
@@ -0,0 +1,293 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['CommandBlackbox']
+
+import os
+import json
+import time
+import queue
+import itertools
+import logging
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+
+def _to_json(obj):
+    """
+    json.dumps fallback converting numpy scalars into native types.
+    """
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+class _ChildProcess(object):
+    """
+    A single long-lived child process. A reader thread forwards each line the child writes to stdout into a queue,
+    this allows waiting for an answer with timeout.
+    """
+    def __init__(self, command, cwd=None, env=None):
+        self._command = command
+        self._cwd = cwd
+        self._env = env
+        self._process = None
+        self._lines = None
+
+    def __read(self, process, lines):
+        for line in process.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    @property
+    def alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        self._lines = queue.Queue()
+        self._process = subprocess.Popen(self._command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         cwd=self._cwd, env=self._env, universal_newlines=True, bufsize=1)
+        reader = threading.Thread(target=self.__read, args=(self._process, self._lines), daemon=True)
+        reader.start()
+
+    def stop(self, timeout=5):
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=timeout)
+            except Exception:
+                self._process.kill()
+                self._process.wait()
+        self._process = None
+
+    def kill(self):
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._process = None
+        # pending lines of the killed process must not be taken as answers
+        self._lines = None
+
+    def request(self, line, timeout=None):
+        """
+        Sends an encoded parameter set and waits for the answer line.
+
+        :param line: [str] JSON encoded request line
+        :param timeout: [float] max seconds to wait for the answer, default=None waits forever
+
+        :return: [str] answer line
+        """
+        if not self.alive:
+            if self._process is not None:
+                LOG.warning("child process {} exited with code {}, restarting".format(self._command, self._process.returncode))
+                self.kill()
+            self.start()
+        else:
+            # lines written after the last answer, e.g. log output, are not an answer to this request
+            while True:
+                try:
+                    stray = self._lines.get_nowait()
+                except queue.Empty:
+                    break
+                if stray is None:
+                    self._lines.put(None)
+                    break
+                LOG.warning("child process {} wrote an unexpected line, discarded: {}".format(self._command, stray.strip()))
+        try:
+            self._process.stdin.write(line)
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.kill()
+            raise RuntimeError("child process {} died before receiving the parameter set: {}".format(self._command, e))
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise TimeoutError("child process {} did not answer within {}s".format(self._command, timeout))
+        if line is None:
+            self.kill()
+            raise RuntimeError("child process {} exited while computing the loss".format(self._command))
+        return line
+
+
+class CommandBlackbox(object):
+    """
+    The CommandBlackbox class is a blackbox adapter for external command line tools. It keeps a pool of long-lived
+    child processes and communicates with them using a line-delimited JSON protocol, this way the startup cost of an
+    interpreter or binary is paid once per child and not per trial. For each evaluation a line
+
+    {"id": 7, "params": {"p1": 0.123, "p2": 3.87}}
+
+    is written to the child's stdin. The child has to answer with a single line on stdout, either a plain number, a
+    JSON object {"loss": value} or {"error": message}. A JSON object answer may echo the request id, {"id": 7, "loss":
+    value}, answers with a different id are rejected. A child that exits or crashes is restarted with the next call,
+    a child exceeding the timeout or sending an answer that cannot be parsed or belongs to another request is killed
+    and restarted, so later trials never receive a shifted answer. In all these cases the trial fails. The encoding and decoding
+    time and bytes are accumulated in serialization_stats. A CommandBlackbox instance can be used as solver blackbox:
+
+    blackbox = CommandBlackbox(["python", "my_objective.py"], workers=2, timeout=60)
+    solver.blackbox = blackbox
+    solver.run()
+    blackbox.close()
+
+    :param command: [list] command and arguments starting a child process
+    :param workers: [int] number of child processes, default=1
+    :param timeout: [float] max seconds per evaluation, default=None
+    :param cwd: [str] working directory of the child processes, default=None
+    :param env: [dict] environment of the child processes, default=None
+    :param callback_func: [object] callback function pointer called in the solver process, default=None
+    """
+    def __init__(self, command, workers=1, timeout=None, cwd=None, env=None, callback_func=None):
+        assert isinstance(command, (list, tuple)) and len(command) > 0, "Precondition violation, command needs to be a non empty list!"
+        assert isinstance(workers, int) and workers > 0, "Precondition violation, workers needs to be an int > 0, got {}!".format(workers)
+        self._command = list(command)
+        self._workers = workers
+        self._timeout = timeout
+        self._callback_func = callback_func
+        self._children = [_ChildProcess(self._command, cwd, env) for _ in range(workers)]
+        self._idle = queue.Queue()
+        for child in self._children:
+            self._idle.put(child)
+        self._stats = {"setup_bytes": 0, "setup_time": 0.0, "messages": 0, "bytes": 0, "time": 0.0}
+        self._stats_lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def __call__(self, **params):
+        """
+        Evaluates a parameter set in an idle child process.
+
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+
+        :return: [float] loss
+        """
+        with self._stats_lock:
+            request_id = next(self._ids)
+        start = time.perf_counter()
+        request = json.dumps({"id": request_id, "params": params}, default=_to_json) + "\n"
+        dt = time.perf_counter() - start
+        child = self._idle.get()
+        try:
+            line = child.request(request, self._timeout)
+            start = time.perf_counter()
+            try:
+                loss = self.parse(line, request_id)
+            except (ValueError, KeyError, TypeError) as e:
+                # the child is out of sync, e.g. it wrote a stray line, the real answer would be taken by the next trial
+                child.kill()
+                raise RuntimeError("child process {} sent an invalid answer {!r}, restarting it: {}".format(self._command, line.strip(), e))
+            dt += time.perf_counter() - start
+        finally:
+            self._idle.put(child)
+        with self._stats_lock:
+            self._stats["time"] += dt
+            self._stats["bytes"] += len(request) + len(line)
+            self._stats["messages"] += 1
+        return loss
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def map(self, params_list):
+        """
+        Evaluates a list of parameter sets using all child processes in parallel.
+
+        :param params_list: [list] list of parameter set dicts
+
+        :return: [list] losses
+        """
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            return list(executor.map(lambda params: self(**params), params_list))
+
+    def parse(self, line, request_id=None):
+        """
+        Converts an answer line into a loss. Raises a ValueError if the answer echoes an id other than request_id.
+
+        :param line: [str] answer line
+        :param request_id: [int] id of the request, default=None does not check the id
+
+        :return: [float] loss
+        """
+        answer = json.loads(line)
+        if isinstance(answer, dict):
+            if request_id is not None and "id" in answer and answer["id"] != request_id:
+                raise ValueError("answer to request {} received for request {}".format(answer["id"], request_id))
+            if "error" in answer:
+                raise RuntimeError("child process {} reported: {}".format(self._command, answer["error"]))
+            answer = answer["loss"]
+        if answer is None:
+            return None
+        return float(answer)
+
+    def close(self):
+        """
+        Shuts down all child processes by closing their stdin.
+        """
+        for child in self._children:
+            child.stop()
+
+    @property
+    def callback_func(self):
+        """
+        This function is called at each iteration step getting passed the trail info content.
+
+        :return: [object] callback_func
+        """
+        return self._callback_func
+
+    @property
+    def serialization_stats(self):
+        """
+        Accumulated serialization statistics in the format of WorkerPool.serialization_stats, setup_bytes and
+        setup_time are always zero.
+
+        :return: [dict] serialization statistics
+        """
+        return dict(self._stats)
+
+    @property
+    def command(self):
+        """
+        Command starting a child process.
+
+        :return: [list] command
+        """
+        return self._command
+
+    @property
+    def workers(self):
+        """
+        Number of child processes.
+
+        :return: [int] number of children
+        """
+        return self._workers
+
+    @property
+    def timeout(self):
+        """
+        Max seconds per evaluation.
+
+        :return: [float] timeout
+        """
+        return self._timeout
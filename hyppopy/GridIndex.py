@@ -0,0 +1,396 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['GridIndex', 'SparseGridIndex', 'parse_shard', 'van_der_corput_order', 'GRID_ORDERS']
+
+import os
+import math
+import logging
+import itertools
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+# visiting orders supported by GridIndex.visit
+GRID_ORDERS = ["sequential", "strided", "random", "vandercorput"]
+
+_MASK64 = (1 << 64) - 1
+
+
+def parse_shard(shard):
+    """
+    Parses a shard description of the form "i/k", shard i of k shards, i in [0, k).
+
+    :param shard: [str] shard description, "" means no sharding
+
+    :return: [int], [int] shard index and number of shards
+    """
+    if shard == "":
+        return 0, 1
+    try:
+        index, shards = [int(part) for part in shard.split("/")]
+    except ValueError:
+        index, shards = -1, 0
+    if not 0 <= index < shards:
+        msg = "Invalid shard {}, expected i/k with 0 <= i < k!".format(shard)
+        LOG.error(msg)
+        raise ValueError(msg)
+    return index, shards
+
+
+def van_der_corput_order(n):
+    """
+    Returns the indices of an axis of n values in coarse to fine order, the two end points first, then the indices
+    closest to the van der Corput sequence 1/2, 1/4, 3/4, 1/8, ... scaled to the axis, each index once.
+
+    :param n: [int] number of axis values
+
+    :return: [list] permutation of range(n)
+    """
+    order = [0] if n == 1 else []
+    seen = set(order)
+    t = -1
+    while len(order) < n:
+        if t < 1:
+            x = float(t + 1)
+        else:
+            x = 0.0
+            base, rest = 0.5, t
+            while rest > 0:
+                rest, bit = divmod(rest, 2)
+                x += bit * base
+                base /= 2
+        t += 1
+        index = int(math.floor(x * (n - 1) + 0.5))
+        if index not in seen:
+            seen.add(index)
+            order.append(index)
+    return order
+
+
+def _mix(x):
+    """
+    splitmix64 finalizer, used as Feistel round function.
+    """
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & _MASK64
+    return x ^ (x >> 31)
+
+
+class GridIndex(object):
+    """
+    The GridIndex class addresses the points of a grid by index arithmetic instead of enumerating them. Point k is
+    mapped to one index per axis in mixed radix, the last axis varying fastest, i.e. the sequential order equals
+    itertools.product of the axes. The grid size is an exact python int, grids larger than any array can be
+    addressed, sharded and resumed:
+
+    grid = GridIndex(["C", "kernel"], [[0.1, 1, 10], ["rbf", "linear"]])
+    for k in grid.visit(order="random", shard=1, shards=4, key=42):
+        params = grid.params(k)
+
+    :param names: [list] axis names
+    :param axes: [list] axis values per axis
+    """
+    def __init__(self, names, axes):
+        assert len(names) == len(axes), "Precondition violation, number of names and axes differ!"
+        self._names = list(names)
+        self._axes = [list(axis) for axis in axes]
+        self._shape = [len(axis) for axis in self._axes]
+        self._size = 1
+        for length in self._shape:
+            self._size *= length
+
+    def __len__(self):
+        return self._size
+
+    def unravel(self, k):
+        """
+        Maps a point number to the per axis indices.
+
+        :param k: [int] point number in [0, size)
+
+        :return: [list] index per axis
+        """
+        if not 0 <= k < self._size:
+            msg = "Grid point {} out of range [0, {})!".format(k, self._size)
+            LOG.error(msg)
+            raise IndexError(msg)
+        indices = [0] * len(self._shape)
+        for d in range(len(self._shape) - 1, -1, -1):
+            k, indices[d] = divmod(k, self._shape[d])
+        return indices
+
+    def ravel(self, indices):
+        """
+        Maps per axis indices to the point number, inverse of unravel.
+
+        :param indices: [list] index per axis
+
+        :return: [int] point number
+        """
+        k = 0
+        for index, length in zip(indices, self._shape):
+            k = k * length + index
+        return k
+
+    def params(self, k):
+        """
+        Returns the parameter set of a grid point.
+
+        :param k: [int] point number in [0, size)
+
+        :return: [dict] parameter set {'name': value, ...}
+        """
+        return {name: axis[i] for name, axis, i in zip(self._names, self._axes, self.unravel(k))}
+
+    def count(self, shard=0, shards=1):
+        """
+        Returns the exact number of grid points visited by a shard.
+
+        :param shard: [int] shard index
+        :param shards: [int] number of shards
+
+        :return: [int] number of points
+        """
+        return max(0, (self._size - shard + shards - 1) // shards)
+
+    def __stride(self):
+        """
+        Returns a stride coprime to the grid size close to size / golden ratio, consecutive points of the strided
+        order are spread over the whole grid.
+        """
+        stride = max(1, int(round(self._size * (math.sqrt(5) - 1) / 2)))
+        while math.gcd(stride, self._size) != 1:
+            stride += 1
+        return stride
+
+    def __permutation(self, key):
+        """
+        Returns a pseudo random bijection of [0, size), a 4 round Feistel network on the next even number of bits with
+        cycle walking. It needs O(1) memory, so it works for grids of any size.
+        """
+        half = max(1, (max(1, self._size - 1).bit_length() + 1) // 2)
+        mask = (1 << half) - 1
+        keys = [_mix((key + 0x9e3779b97f4a7c15 * (n + 1)) & _MASK64) for n in range(4)]
+
+        def permute(j):
+            while True:
+                left, right = j >> half, j & mask
+                for round_key in keys:
+                    left, right = right, left ^ (_mix(right ^ round_key) & mask)
+                j = (left << half) | right
+                if j < self._size:
+                    return j
+        return permute
+
+    def _anytime(self):
+        """
+        Returns the bijection of [0, size) of the van der Corput order. Each axis is ordered by van_der_corput_order
+        and the grid is refined level by level, level L contains the first min(n, 2**L + 1) values of every axis. The
+        points new on a level form one box per axis, so position j is mapped to a point in O(number of axes) without
+        enumerating the grid. Every prefix of the order is a complete coarser grid plus a part of the next finer one.
+        """
+        orders = [van_der_corput_order(length) for length in self._shape]
+        levels = max([max(0, length - 2).bit_length() for length in self._shape] + [0])
+        counts = [[min(length, 2 ** level + 1) for length in self._shape] for level in range(levels + 1)]
+        sizes = []
+        for level_counts in counts:
+            size = 1
+            for count in level_counts:
+                size *= count
+            sizes.append(size)
+
+        def decode(o, radices):
+            ranks = [0] * len(radices)
+            for d in range(len(radices) - 1, -1, -1):
+                o, ranks[d] = divmod(o, radices[d])
+            return ranks
+
+        def permute(j):
+            level = 0
+            while sizes[level] <= j:
+                level += 1
+            if level == 0:
+                ranks = decode(j, counts[0])
+            else:
+                o = j - sizes[level - 1]
+                previous, current = counts[level - 1], counts[level]
+                for d in range(len(current)):
+                    radices = previous[:d] + [current[d] - previous[d]] + current[d + 1:]
+                    part = 1
+                    for radix in radices:
+                        part *= radix
+                    if o < part:
+                        ranks = decode(o, radices)
+                        ranks[d] += previous[d]
+                        break
+                    o -= part
+            return self.ravel([axis_order[rank] for axis_order, rank in zip(orders, ranks)])
+        return permute
+
+    def visit(self, order="sequential", shard=0, shards=1, start=0, key=0):
+        """
+        Generates the point numbers of a shard in visiting order. The visiting order is a bijection of [0, size), the
+        shard visits every shards-th position of it starting at position shard, so all shards together visit each
+        point exactly once. Using start the first start points of the shard are skipped, e.g. to resume an
+        interrupted run.
+
+        :param order: [str] one of GRID_ORDERS, "sequential" (itertools.product order), "strided" (consecutive
+                      points are far apart), "random" (pseudo random permutation defined by key) or "vandercorput"
+                      (coarse to fine, every prefix covers the whole grid evenly), default="sequential"
+        :param shard: [int] shard index, default=0
+        :param shards: [int] number of shards, default=1
+        :param start: [int] number of points of the shard skipped, default=0
+        :param key: [int] key of the random order, all shards need the same key, default=0
+
+        :return: [generator] point numbers
+        """
+        assert 0 <= shard < shards, "Precondition violation, shard index {} not in [0, {})!".format(shard, shards)
+        assert start >= 0, "Precondition violation, start needs to be >= 0, got {}!".format(start)
+        if order == "sequential":
+            mapping = None
+        elif order == "strided":
+            stride = self.__stride()
+            mapping = lambda j: (j * stride) % self._size
+        elif order == "random":
+            mapping = self.__permutation(key)
+        elif order == "vandercorput":
+            mapping = self._anytime()
+        else:
+            msg = "Unknown grid order {}, expected one of {}!".format(order, GRID_ORDERS)
+            LOG.error(msg)
+            raise LookupError(msg)
+        for j in range(shard + start * shards, self._size, shards):
+            yield j if mapping is None else mapping(j)
+
+    @property
+    def size(self):
+        """
+        Number of grid points.
+
+        :return: [int] size
+        """
+        return self._size
+
+    @property
+    def shape(self):
+        """
+        Number of values per axis.
+
+        :return: [list] shape
+        """
+        return list(self._shape)
+
+    @property
+    def names(self):
+        """
+        Axis names.
+
+        :return: [list] names
+        """
+        return list(self._names)
+
+
+class SparseGridIndex(GridIndex):
+    """
+    The SparseGridIndex class addresses the points of a Smolyak sparse grid. Each axis value has a level, the level
+    it first appears on in the hierarchy of increasingly fine axis samplings. A point is part of the sparse grid if the
+    levels of its values sum up to at most level. Compared to the full grid of the finest axis samplings, which grows
+    exponentially with the number of axes, the sparse grid only grows polynomially. The points are stored as table
+    of value indices, visit, count and the shard logic are the same as for GridIndex:
+
+    grid = SparseGridIndex(["x", "y"], [[0.5, 0, 1], [0.5, 0, 1]], [[0, 1, 1], [0, 1, 1]], level=1)
+    grid.size  # 5 of 9 points, the center and the centers of the four edges
+
+    :param names: [list] axis names
+    :param axes: [list] distinct axis values per axis
+    :param levels: [list] level of each axis value per axis
+    :param level: [int] maximum level sum of a point
+    """
+    def __init__(self, names, axes, levels, level):
+        assert len(axes) == len(levels), "Precondition violation, number of axes and levels differ!"
+        assert isinstance(level, int) and level >= 0, "Precondition violation, level needs to be an int >= 0, got {}!".format(level)
+        GridIndex.__init__(self, names, axes)
+        self._level = level
+        # value indices per axis and level
+        groups = []
+        for axis_levels in levels:
+            axis_groups = {}
+            for i, value_level in enumerate(axis_levels):
+                axis_groups.setdefault(value_level, []).append(i)
+            groups.append(axis_groups)
+        rows = []
+        for multi_index in self.__multi_indices(groups, 0, level):
+            rows.extend(itertools.product(*[groups[d][l] for d, l in enumerate(multi_index)]))
+        self._points = np.array(rows, dtype=np.int64).reshape(len(rows), len(axes))
+        self._size = len(rows)
+        self._level_sums = np.zeros(self._size, dtype=np.int64)
+        for d, axis_levels in enumerate(levels):
+            self._level_sums += np.asarray(axis_levels, dtype=np.int64)[self._points[:, d]]
+
+    def __multi_indices(self, groups, axis, budget):
+        """
+        Generates all combinations of per axis levels existing on the axes with a level sum <= budget.
+        """
+        if axis == len(groups):
+            yield ()
+            return
+        for l in sorted(groups[axis].keys()):
+            if l > budget:
+                break
+            for rest in self.__multi_indices(groups, axis + 1, budget - l):
+                yield (l,) + rest
+
+    def _anytime(self):
+        """
+        The van der Corput order of a sparse grid visits the points by increasing level sum.
+        """
+        order = np.argsort(self._level_sums, kind='stable')
+        return lambda j: int(order[j])
+
+    def unravel(self, k):
+        if not 0 <= k < self._size:
+            msg = "Grid point {} out of range [0, {})!".format(k, self._size)
+            LOG.error(msg)
+            raise IndexError(msg)
+        return self._points[k].tolist()
+
+    def ravel(self, indices):
+        matches = np.nonzero(np.all(self._points == np.asarray(indices), axis=1))[0]
+        if len(matches) == 0:
+            msg = "Indices {} are no sparse grid point!".format(indices)
+            LOG.error(msg)
+            raise IndexError(msg)
+        return int(matches[0])
+
+    @property
+    def full_size(self):
+        """
+        Number of points of the full grid of all axis values.
+
+        :return: [int] full grid size
+        """
+        size = 1
+        for length in self._shape:
+            size *= length
+        return size
+
+    @property
+    def level(self):
+        """
+        Maximum level sum of a point.
+
+        :return: [int] level
+        """
+        return self._level
@@ -0,0 +1,130 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['LossCache']
+
+import os
+import logging
+import itertools
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+
+class LossCache(object):
+    """
+    The LossCache class implements an approximate loss lookup for smooth and deterministic blackbox functions. Each
+    evaluated parameter set is mapped into a normalized space, where every numerical axis is scaled to [0, 1] (in log
+    space for loguniform axes), and stored in a uniform grid index with cell width equal to the cache radius. A query
+    returns the loss of the nearest stored point if its euclidean distance in normalized space is below the radius.
+    Categorical axes are not interpolated, a hit requires all categorical values to match exactly.
+    """
+    def __init__(self, hyperparameter, radius):
+        """
+        The constructor expects the hyppopy hyperparameter description and the cache radius.
+
+        :param hyperparameter: [dict] nested parameter description dict e.g. {'name': {'domain':'uniform', 'data':[0,1], 'type':'float'}, ...}
+        :param radius: [float] max distance in normalized space for a cache hit
+        """
+        assert radius > 0, "Precondition violation, radius needs to be > 0, got {}!".format(radius)
+        self._radius = float(radius)
+        self._numerical = []
+        self._categorical = []
+        for name, param in hyperparameter.items():
+            if param["domain"] == "categorical":
+                self._categorical.append(name)
+            else:
+                a, b = float(param["data"][0]), float(param["data"][1])
+                if param["domain"] == "loguniform":
+                    a, b = np.log(a), np.log(b)
+                self._numerical.append((name, param["domain"] == "loguniform", a, b - a))
+        self._cells = {}
+        self._points = {}
+        self._size = 0
+        self._offsets = None
+        if 3 ** len(self._numerical) <= 4096:
+            self._offsets = list(itertools.product((-1, 0, 1), repeat=len(self._numerical)))
+
+    def __len__(self):
+        return self._size
+
+    def _normalize(self, params):
+        """
+        Maps a parameter set into the normalized space.
+
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+
+        :return: [tuple], [ndarray] categorical key and normalized numerical coordinates
+        """
+        x = np.empty(len(self._numerical))
+        for n, (name, logscale, offset, width) in enumerate(self._numerical):
+            value = float(params[name])
+            if logscale:
+                value = np.log(value)
+            x[n] = (value - offset) / width if width != 0 else 0.0
+        key = tuple(params[name] for name in self._categorical)
+        return key, x
+
+    def _cell(self, x):
+        return tuple(np.floor(x / self._radius).astype(int))
+
+    def add(self, params, loss):
+        """
+        Adds an evaluated parameter set to the cache.
+
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+        :param loss: [float] loss computed for params
+        """
+        key, x = self._normalize(params)
+        self._cells.setdefault((key, self._cell(x)), []).append((x, loss))
+        points = self._points.setdefault(key, [[], []])
+        points[0].append(x)
+        points[1].append(loss)
+        self._size += 1
+
+    def query(self, params):
+        """
+        Returns the loss of the nearest stored neighbour within the cache radius or None if there is none.
+
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+
+        :return: [float] cached loss or None
+        """
+        key, x = self._normalize(params)
+        if key not in self._points:
+            return None
+        candidates = self._points[key]
+        if self._offsets is not None and len(self._offsets) < len(candidates[0]):
+            cell = np.array(self._cell(x))
+            candidates = [[], []]
+            for offset in self._offsets:
+                for y, loss in self._cells.get((key, tuple(cell + offset)), []):
+                    candidates[0].append(y)
+                    candidates[1].append(loss)
+            if len(candidates[0]) == 0:
+                return None
+        dist = np.linalg.norm(np.array(candidates[0]).reshape(-1, x.shape[0]) - x, axis=1)
+        nearest = int(np.argmin(dist))
+        if dist[nearest] <= self._radius:
+            return candidates[1][nearest]
+        return None
+
+    @property
+    def radius(self):
+        """
+        Cache radius in normalized space.
+
+        :return: [float] radius
+        """
+        return self._radius
@@ -0,0 +1,130 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+"""
+Anytime-performance measures of optimization runs. All functions take loss arrays of shape (trial,) or
+(repeat x trial), e.g. RepeatedStudy.field('loss'), and operate along the last axis. Failed trials can be excluded by
+passing the ok flags, nan losses (failed trials or padding) are always ignored.
+"""
+
+__all__ = ['cumulative_minimum', 'cumulative_minimum_over_time', 'simple_regret', 'evaluations_to_target', 'time_to_target']
+
+import os
+import logging
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+
+def _valid_losses(losses, ok=None):
+    losses = np.array(losses, dtype=float)
+    if ok is not None:
+        losses[~np.asarray(ok, dtype=bool)] = np.nan
+    return losses
+
+
+def cumulative_minimum(losses, ok=None):
+    """
+    Computes the cumulative minimum of the losses over the iterations, nan until the first valid loss.
+
+    :param losses: [ndarray] losses (trial) or (repeat x trial)
+    :param ok: [ndarray] success flags of the same shape, default=None
+
+    :return: [ndarray] best loss after each iteration
+    """
+    return np.fmin.accumulate(_valid_losses(losses, ok), axis=-1)
+
+
+def cumulative_minimum_over_time(losses, times, grid, ok=None):
+    """
+    Computes the best loss reached until each point of a time grid, nan before the first valid loss.
+
+    :param losses: [ndarray] losses (trial) or (repeat x trial)
+    :param times: [ndarray] time the trial finished, e.g. seconds since the start of the run, same shape as losses
+    :param grid: [ndarray] time points (point)
+    :param ok: [ndarray] success flags of the same shape as losses, default=None
+
+    :return: [ndarray] best loss at each time point (point) or (repeat x point)
+    """
+    losses = _valid_losses(losses, ok)
+    times = np.array(times, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    assert losses.shape == times.shape, "Precondition violation, losses and times need to have the same shape!"
+    squeeze = losses.ndim == 1
+    losses, times = np.atleast_2d(losses), np.atleast_2d(times)
+    if times.size == 0 or np.all(np.isnan(times)):
+        curves = np.full((losses.shape[0], len(grid)), np.nan)
+        return curves[0] if squeeze else curves
+    low = min(np.nanmin(times), np.min(grid, initial=np.inf))
+    high = max(np.nanmax(times), np.max(grid, initial=-np.inf))
+    # padded trials without time never count as reached
+    times[np.isnan(times)] = high + 1
+    order = np.argsort(times, axis=-1, kind='stable')
+    times = np.take_along_axis(times, order, axis=-1) - low
+    curves = np.fmin.accumulate(np.take_along_axis(losses, order, axis=-1), axis=-1)
+    # a single searchsorted over all repeats, each repeat is shifted into its own time interval
+    stride = high - low + 2
+    offsets = np.arange(times.shape[0])[:, None] * stride
+    positions = np.searchsorted((times + offsets).ravel(), ((grid - low)[None, :] + offsets).ravel(), side='right')
+    positions = positions.reshape(times.shape[0], len(grid)) - np.arange(times.shape[0])[:, None] * times.shape[1]
+    values = np.full((times.shape[0], len(grid)), np.nan)
+    reached = positions > 0
+    rows = np.nonzero(reached)[0]
+    values[reached] = curves[rows, positions[reached] - 1]
+    return values[0] if squeeze else values
+
+
+def simple_regret(losses, optimum, ok=None):
+    """
+    Computes the simple regret, the difference between the best loss so far and the known optimal loss.
+
+    :param losses: [ndarray] losses (trial) or (repeat x trial)
+    :param optimum: [float] optimal loss
+    :param ok: [ndarray] success flags of the same shape, default=None
+
+    :return: [ndarray] regret after each iteration
+    """
+    return cumulative_minimum(losses, ok) - optimum
+
+
+def evaluations_to_target(losses, target, ok=None):
+    """
+    Computes the number of evaluations until a loss <= target was reached.
+
+    :param losses: [ndarray] losses (trial) or (repeat x trial)
+    :param target: [float] target loss
+    :param ok: [ndarray] success flags of the same shape, default=None
+
+    :return: [ndarray] number of evaluations (1-based) or nan if the target was not reached, per repeat
+    """
+    reached = _valid_losses(losses, ok) <= target
+    evaluations = np.argmax(reached, axis=-1) + 1.0
+    return np.where(np.any(reached, axis=-1), evaluations, np.nan)
+
+
+def time_to_target(losses, times, target, ok=None):
+    """
+    Computes the time until a loss <= target was reached.
+
+    :param losses: [ndarray] losses (trial) or (repeat x trial)
+    :param times: [ndarray] time the trial finished, same shape as losses
+    :param target: [float] target loss
+    :param ok: [ndarray] success flags of the same shape, default=None
+
+    :return: [ndarray] time or nan if the target was not reached, per repeat
+    """
+    reached = _valid_losses(losses, ok) <= target
+    times = np.where(reached, np.asarray(times, dtype=float), np.inf)
+    times = np.min(times, axis=-1, initial=np.inf)
+    return np.where(np.isinf(times), np.nan, times)
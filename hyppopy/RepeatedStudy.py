@@ -0,0 +1,317 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['RepeatedStudy', 'STUDY_FIELDS']
+
+import os
+import time
+import random
+import logging
+import multiprocessing
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+from hyppopy.SolverPool import SolverPool
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.PerformanceCurves import cumulative_minimum, cumulative_minimum_over_time, evaluations_to_target, time_to_target
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+# per trial fields stored in front of the hyperparameters, time is the seconds from the start of the repeat until the
+# trial finished
+STUDY_FIELDS = ['loss', 'ok', 'duration', 'time']
+
+
+def _init_repeat_worker():
+    """
+    Worker process initializer, forked workers inherit the random state of the parent and are reseeded.
+    """
+    random.seed()
+    np.random.seed()
+
+
+def _run_repeat(args):
+    """
+    Runs a single repeat and converts its trials into a 2-D array (trial x field).
+
+    :param args: [tuple] project, solver name, blackbox, SeedSequence of the repeat
+    :return: [ndarray], [float], [dict] trial array, run duration in seconds and best parameter set
+    """
+    project, solver_name, blackbox, seed_sequence = args
+    solver = SolverPool.get(solver_name, project)
+    solver.blackbox = blackbox
+    solver.seed_sequence = seed_sequence
+    start = time.perf_counter()
+    solver.run(print_stats=False)
+    duration = time.perf_counter() - start
+    trials = solver.trials
+    names = list(project.hyperparameter.keys())
+    results = np.full((len(trials), len(STUDY_FIELDS) + len(names)), np.nan)
+    results[:, 0] = trials.losses
+    results[:, 1] = trials.ok
+    results[:, 2] = trials.durations
+    if len(trials) > 0:
+        results[:, 3] = trials.refresh_time - np.nanmin(trials.book_time)
+    for n, name in enumerate(names):
+        if name not in trials.names:
+            continue
+        column = len(STUDY_FIELDS) + n
+        if trials.kind(name) == 'category':
+            # categorical values are stored as index into the project's data list
+            codes, categories = trials.codes(name)
+            data = project.hyperparameter[name]["data"]
+            mapping = np.array([data.index(c) if c in data else np.nan for c in categories] + [np.nan])
+            results[:, column] = mapping[codes]
+        else:
+            results[:, column] = trials.column(name)
+    return results, duration, solver.best
+
+
+class RepeatedStudy(object):
+    """
+    The RepeatedStudy class runs N independent repeats of a project/solver pair, e.g. to compare solvers on a
+    function with known optimum, and stores all trials in a 3-D array results (repeat x trial x field). The fields are
+    STUDY_FIELDS followed by the hyperparameters in project order, categorical hyperparameters are stored as index into
+    their data list. Repeats with fewer trials are padded with nan. Each repeat runs its solver with an independent
+    random stream spawned from one SeedSequence, with a seed the results are reproducible, independent of the number
+    of workers. Statistics are computed vectorized over all repeats:
+
+    study = RepeatedStudy(project, blackbox, solver_name="randomsearch", repeats=50, workers=4, seed=42)
+    study.run()
+    mean, std = study.best_loss_statistics()
+    distances = study.distance_to_optimum({"axis_00": 0.5, "axis_01": 0.25})
+
+    :param project: [HyppopyProject] project instance
+    :param blackbox: [object] BlackboxFunction instance or function, must be picklable if workers > 1
+    :param solver_name: [str] solver name, default=None uses the solver setting of the project
+    :param repeats: [int] number of repeats, default=10
+    :param workers: [int] number of processes the repeats are distributed to, default=1
+    :param seed: [int] seed of the SeedSequence the repeat streams are spawned from, default=None uses the project
+                 setting seed if given, fresh OS entropy otherwise
+    """
+    def __init__(self, project, blackbox, solver_name=None, repeats=10, workers=1, seed=None):
+        assert isinstance(project, HyppopyProject), "Precondition violation, project type HyppopyProject expected, got {}!".format(type(project))
+        assert isinstance(repeats, int) and repeats > 0, "Precondition violation, repeats needs to be an int > 0, got {}!".format(repeats)
+        assert isinstance(workers, int) and workers > 0, "Precondition violation, workers needs to be an int > 0, got {}!".format(workers)
+        self._project = project
+        self._blackbox = blackbox
+        self._solver_name = solver_name
+        self._repeats = repeats
+        self._workers = workers
+        if seed is None and project.settings.get("seed", -1) >= 0:
+            seed = project.settings["seed"]
+        self._seed = seed
+        self._names = list(project.hyperparameter.keys())
+        self._results = None
+        self._durations = None
+        self._best = None
+
+    def run(self):
+        """
+        Runs all repeats.
+
+        :return: [ndarray] results array (repeat x trial x field)
+        """
+        streams = np.random.SeedSequence(self._seed).spawn(self._repeats)
+        jobs = [(self._project, self._solver_name, self._blackbox, stream) for stream in streams]
+        if self._workers > 1:
+            with multiprocessing.Pool(self._workers, initializer=_init_repeat_worker) as pool:
+                outputs = pool.map(_run_repeat, jobs, chunksize=1)
+        else:
+            outputs = [_run_repeat(job) for job in jobs]
+        trials = max(len(output[0]) for output in outputs)
+        self._results = np.full((self._repeats, trials, len(self.fields)), np.nan)
+        for n, (results, _, _) in enumerate(outputs):
+            self._results[n, :len(results)] = results
+        self._durations = np.array([output[1] for output in outputs])
+        self._best = [output[2] for output in outputs]
+        LOG.debug("finished {} repeats with up to {} trials".format(self._repeats, trials))
+        return self._results
+
+    def __check(self):
+        if self._results is None:
+            msg = "No results available, call run first!"
+            LOG.error(msg)
+            raise AssertionError(msg)
+
+    def field(self, name):
+        """
+        Returns a field of all trials of all repeats.
+
+        :param name: [str] field name, see fields
+
+        :return: [ndarray] 2-D array (repeat x trial)
+        """
+        self.__check()
+        if name not in self.fields:
+            msg = "Unknown field {}!".format(name)
+            LOG.error(msg)
+            raise LookupError(msg)
+        return self._results[:, :, self.fields.index(name)]
+
+    def best_indices(self):
+        """
+        Returns the trial index of the successful trial with minimal loss per repeat, -1 for repeats without
+        successful trial.
+
+        :return: [ndarray] trial indices (repeat)
+        """
+        losses = np.where(self.field('ok') == 1, self.field('loss'), np.inf)
+        losses[np.isnan(losses)] = np.inf
+        indices = np.argmin(losses, axis=1)
+        indices[np.isinf(losses[np.arange(self._repeats), indices])] = -1
+        return indices
+
+    def best_losses(self):
+        """
+        Returns the best loss per repeat, nan for repeats without successful trial.
+
+        :return: [ndarray] best losses (repeat)
+        """
+        indices = self.best_indices()
+        losses = self.field('loss')[np.arange(self._repeats), indices]
+        losses[indices < 0] = np.nan
+        return losses
+
+    def best_loss_statistics(self):
+        """
+        Returns mean and standard deviation of the best loss over all repeats.
+
+        :return: [float], [float] mean and std
+        """
+        losses = self.best_losses()
+        return float(np.nanmean(losses)), float(np.nanstd(losses))
+
+    def best_params(self):
+        """
+        Returns the best parameter set per repeat as array, categorical hyperparameters as index into their data list.
+
+        :return: [ndarray] 2-D array (repeat x hyperparameter)
+        """
+        indices = self.best_indices()
+        params = self._results[np.arange(self._repeats), indices, len(STUDY_FIELDS):]
+        params[indices < 0] = np.nan
+        return params
+
+    def distance_to_optimum(self, optimum, scale=None):
+        """
+        Returns the euclidean distance of the best parameter set of each repeat to a known optimum.
+
+        :param optimum: [dict] optimum location, e.g. {'axis_00': 0.5, ...}, only the given axes are considered
+        :param scale: [dict] per axis factors the differences are divided by, e.g. the axis range, default=None
+
+        :return: [ndarray] distances (repeat)
+        """
+        for name in optimum.keys():
+            if name not in self._names:
+                msg = "Unknown hyperparameter {}!".format(name)
+                LOG.error(msg)
+                raise LookupError(msg)
+        columns = [self._names.index(name) for name in optimum.keys()]
+        target = np.array(list(optimum.values()), dtype=float)
+        factors = np.ones(len(columns))
+        if scale is not None:
+            factors = np.array([scale.get(name, 1.0) for name in optimum.keys()], dtype=float)
+        differences = (self.best_params()[:, columns] - target) / factors
+        return np.sqrt(np.sum(differences ** 2, axis=1))
+
+    def cumulative_minimum(self, time_grid=None):
+        """
+        Returns the best loss so far of each repeat over the iterations or, if a time grid is given, over the seconds
+        since the start of the repeat.
+
+        :param time_grid: [ndarray] time points in seconds, default=None returns the curves over iterations
+
+        :return: [ndarray] curves (repeat x trial) or (repeat x time point)
+        """
+        if time_grid is None:
+            return cumulative_minimum(self.field('loss'), self.field('ok') == 1)
+        return cumulative_minimum_over_time(self.field('loss'), self.field('time'), time_grid, self.field('ok') == 1)
+
+    def simple_regret(self, optimum, time_grid=None):
+        """
+        Returns the difference between the best loss so far and the known optimal loss, see cumulative_minimum.
+
+        :param optimum: [float] optimal loss
+        :param time_grid: [ndarray] time points in seconds, default=None returns the curves over iterations
+
+        :return: [ndarray] regret curves (repeat x trial) or (repeat x time point)
+        """
+        return self.cumulative_minimum(time_grid) - optimum
+
+    def evaluations_to_target(self, target):
+        """
+        Returns the number of evaluations each repeat needed to reach a loss <= target.
+
+        :param target: [float] target loss
+
+        :return: [ndarray] evaluations or nan if not reached (repeat)
+        """
+        return evaluations_to_target(self.field('loss'), target, self.field('ok') == 1)
+
+    def time_to_target(self, target):
+        """
+        Returns the seconds each repeat needed to reach a loss <= target.
+
+        :param target: [float] target loss
+
+        :return: [ndarray] seconds or nan if not reached (repeat)
+        """
+        return time_to_target(self.field('loss'), self.field('time'), target, self.field('ok') == 1)
+
+    @property
+    def results(self):
+        """
+        All trials of all repeats.
+
+        :return: [ndarray] 3-D array (repeat x trial x field)
+        """
+        self.__check()
+        return self._results
+
+    @property
+    def fields(self):
+        """
+        Field names of the last results axis.
+
+        :return: [list] field names
+        """
+        return STUDY_FIELDS + self._names
+
+    @property
+    def durations(self):
+        """
+        Total run duration in seconds per repeat.
+
+        :return: [ndarray] durations (repeat)
+        """
+        self.__check()
+        return self._durations
+
+    @property
+    def best(self):
+        """
+        Best parameter set reported by the solver per repeat.
+
+        :return: [list] best parameter sets
+        """
+        self.__check()
+        return self._best
+
+    @property
+    def repeats(self):
+        """
+        Number of repeats.
+
+        :return: [int] repeats
+        """
+        return self._repeats
@@ -0,0 +1,145 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['SampleIndex', 'get_searchspace_cardinality']
+
+import os
+import logging
+import itertools
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+
+def get_searchspace_cardinality(hyperparameter):
+    """
+    Returns the number of distinct parameter sets in a searchspace. Categorical axes contribute their number of
+    choices, numerical axes of type int the number of integers in their range. As soon as a numerical axis of type
+    float is involved the searchspace is continuous and np.inf is returned.
+
+    :param hyperparameter: [dict] nested parameter description dict e.g. {'name': {'domain':'uniform', 'data':[0,1], 'type':'float'}, ...}
+
+    :return: [int] number of distinct parameter sets or np.inf
+    """
+    cardinality = 1
+    for name, param in hyperparameter.items():
+        if param["domain"] == "categorical":
+            cardinality *= len(set(param["data"]))
+        elif param["type"] is int:
+            cardinality *= int(np.floor(param["data"][1])) - int(np.ceil(param["data"][0])) + 1
+        else:
+            return np.inf
+    return cardinality
+
+
+class SampleIndex(object):
+    """
+    The SampleIndex class is a hash index keeping track of the parameter sets proposed by a solver. It is used to
+    detect duplicate proposals and to decide whether a discrete searchspace is exhausted.
+    """
+    def __init__(self, hyperparameter):
+        """
+        The constructor expects the hyppopy hyperparameter description the samples are drawn from.
+
+        :param hyperparameter: [dict] nested parameter description dict e.g. {'name': {'domain':'uniform', 'data':[0,1], 'type':'float'}, ...}
+        """
+        self._names = sorted(hyperparameter.keys())
+        self._capacity = get_searchspace_cardinality(hyperparameter)
+        self._index = set()
+        self._values = None
+        if not np.isinf(self._capacity):
+            self._values = []
+            for name in self._names:
+                param = hyperparameter[name]
+                if param["domain"] == "categorical":
+                    self._values.append(list(dict.fromkeys(param["data"])))
+                else:
+                    self._values.append(list(range(int(np.ceil(param["data"][0])), int(np.floor(param["data"][1])) + 1)))
+        self._unseen = None
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, params):
+        return self._key(params) in self._index
+
+    def _key(self, params):
+        return tuple(params[name] for name in self._names)
+
+    def add(self, params):
+        """
+        Adds a parameter set to the index.
+
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+
+        :return: [bool] True if params was not yet in the index
+        """
+        key = self._key(params)
+        if key in self._index:
+            return False
+        self._index.add(key)
+        return True
+
+    def unseen(self):
+        """
+        Generates the parameter sets of a discrete searchspace that are not in the index.
+
+        :return: [generator] parameter sets
+        """
+        if self._values is None:
+            msg = "Unseen parameter sets can only be enumerated for discrete searchspaces!"
+            LOG.error(msg)
+            raise AssertionError(msg)
+        for key in itertools.product(*self._values):
+            if key not in self._index:
+                yield dict(zip(self._names, key))
+
+    def draw_unseen(self, rng):
+        """
+        Draws one of the parameter sets of a discrete searchspace not in the index with equal probability and adds it
+        to the index. The unseen parameter sets are enumerated once, at the first call, so this is meant for the end of
+        a search when few parameter sets are left and rejection sampling mostly hits known ones.
+
+        :param rng: [numpy.random.Generator] random generator
+
+        :return: [dict] parameter set or None if the searchspace is exhausted
+        """
+        if self._unseen is None:
+            self._unseen = list(self.unseen())
+        while len(self._unseen) > 0:
+            # swap remove a random entry, entries added to the index in the meantime are skipped
+            i = int(rng.integers(len(self._unseen)))
+            self._unseen[i], self._unseen[-1] = self._unseen[-1], self._unseen[i]
+            params = self._unseen.pop()
+            if self.add(params):
+                return params
+        return None
+
+    @property
+    def capacity(self):
+        """
+        Number of distinct parameter sets of the searchspace, np.inf for continuous searchspaces.
+
+        :return: [int] capacity
+        """
+        return self._capacity
+
+    @property
+    def exhausted(self):
+        """
+        True if every parameter set of a discrete searchspace is in the index.
+
+        :return: [bool] exhausted
+        """
+        return len(self._index) >= self._capacity
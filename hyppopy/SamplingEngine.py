@@ -0,0 +1,131 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['SamplingEngine', 'draw_block']
+
+import os
+import logging
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+
+def draw_block(param, size, rng):
+    """
+    Draws a block of random samples from a hyperparameter descriptor. The distributions match the draw_*_sample
+    functions of the RandomsearchSolver, clipping and rounding are applied to the whole block.
+
+    :param param: [dict] input hyperparameter discription
+    :param size: [int] number of samples
+    :param rng: [numpy.random.Generator] random generator
+
+    :return: [ndarray] samples, dtype float or int for numerical, object for categorical domains
+    """
+    if param['domain'] == "categorical":
+        data = np.empty(len(param['data']), dtype=object)
+        data[:] = param['data']
+        return data[rng.integers(len(data), size=size)]
+    if param['domain'] not in ["uniform", "normal", "loguniform"]:
+        msg = "Unknown domain {}".format(param['domain'])
+        LOG.error(msg)
+        raise LookupError(msg)
+    assert param['type'] is not str, "cannot sample a string list!"
+    low, high = float(param['data'][0]), float(param['data'][1])
+    assert low < high, "precondition violation: data[0] > data[1]!"
+    if param['domain'] == "uniform":
+        samples = rng.uniform(low, high, size)
+    elif param['domain'] == "normal":
+        mu = (high - low) / 2
+        samples = rng.normal(low + mu, mu / 3, size)
+    else:
+        assert low > 0, "Precondition violation, loguniform bounds need to be > 0!"
+        samples = np.exp(rng.uniform(np.log(low), np.log(high), size))
+    np.clip(samples, low, high, out=samples)
+    if param['type'] is int:
+        samples = np.clip(np.round(samples), np.ceil(low), np.floor(high)).astype(np.int64)
+    return samples
+
+
+class SamplingEngine(object):
+    """
+    The SamplingEngine class draws random parameter sets from a hyppopy hyperparameter description. Instead of one
+    value per axis and parameter set, blocks of block_size values are drawn per axis from a single
+    numpy.random.Generator and handed out one parameter set at a time:
+
+    engine = SamplingEngine(hyperparameter, block_size=4096)
+    params = next(engine)
+    block = engine.draw(10**6)
+
+    :param hyperparameter: [dict] nested parameter description dict e.g. {'name': {'domain':'uniform', 'data':[0,1], 'type':'float'}, ...}
+    :param block_size: [int] number of samples drawn per axis at once, default=1024
+    :param rng: [object] numpy.random.Generator or seed passed to numpy.random.default_rng, default=None
+    """
+    def __init__(self, hyperparameter, block_size=1024, rng=None):
+        assert isinstance(block_size, int) and block_size > 0, "Precondition violation, block_size needs to be an int > 0, got {}!".format(block_size)
+        self._hyperparameter = hyperparameter
+        self._names = list(hyperparameter.keys())
+        self._block_size = block_size
+        self._rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        self._buffer = []
+        self._position = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._position >= len(self._buffer):
+            block = self.draw(self._block_size)
+            self._buffer = [dict(zip(self._names, values)) for values in zip(*[block[name] for name in self._names])]
+            self._position = 0
+        params = self._buffer[self._position]
+        self._position += 1
+        return params
+
+    def draw(self, size):
+        """
+        Draws size samples per axis, independent of the buffered parameter sets.
+
+        :param size: [int] number of samples
+
+        :return: [dict] samples per axis as lists of python scalars {'p1': [...], 'p2': [...], ...}
+        """
+        return {name: draw_block(param, size, self._rng).tolist() for name, param in self._hyperparameter.items()}
+
+    def draw_arrays(self, size):
+        """
+        Same as draw, but returns the samples as arrays.
+
+        :param size: [int] number of samples
+
+        :return: [dict] samples per axis as ndarrays
+        """
+        return {name: draw_block(param, size, self._rng) for name, param in self._hyperparameter.items()}
+
+    @property
+    def block_size(self):
+        """
+        Number of samples drawn per axis at once.
+
+        :return: [int] block size
+        """
+        return self._block_size
+
+    @property
+    def rng(self):
+        """
+        Random generator all samples are drawn from.
+
+        :return: [numpy.random.Generator] generator
+        """
+        return self._rng
@@ -21,6 +21,7 @@ from hyppopy.solvers.OptunaSolver import OptunaSolver
 from hyppopy.solvers.HyperoptSolver import HyperoptSolver
 from hyppopy.solvers.OptunitySolver import OptunitySolver
 from hyppopy.solvers.GridsearchSolver import GridsearchSolver
+from hyppopy.solvers.ZoomingGridsearchSolver import ZoomingGridsearchSolver
 from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
 from hyppopy.solvers.QuasiRandomsearchSolver import QuasiRandomsearchSolver
 from hyppopy.globals import DEBUGLEVEL
@@ -45,7 +46,8 @@ class SolverPool(metaclass=Singleton):
                              "optuna",
                              "randomsearch",
                              "quasirandomsearch",
-                             "gridsearch"]
+                             "gridsearch",
+                             "zoominggridsearch"]
 
     def get_solver_names(self):
         """
@@ -89,6 +91,10 @@ class SolverPool(metaclass=Singleton):
             if project is not None:
                 return GridsearchSolver(project)
             return GridsearchSolver()
+        elif solver_name == "zoominggridsearch":
+            if project is not None:
+                return ZoomingGridsearchSolver(project)
+            return ZoomingGridsearchSolver()
         elif solver_name == "randomsearch":
             if project is not None:
                 return RandomsearchSolver(project)
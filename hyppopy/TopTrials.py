@@ -0,0 +1,93 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['TopTrials']
+
+import os
+import heapq
+import logging
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+
+class TopTrials(object):
+    """
+    The TopTrials class incrementally keeps the k trials with the lowest loss and the best trial seen so far. The k
+    best entries are kept in a bounded max-heap, i.e. adding a trial costs O(log k) and the history never has to be
+    rescanned. Ties are resolved in favour of the earlier trial. Only (loss, tid, row) triples are stored, the row is
+    the trial's index in the TrialStore the parameter sets are read from.
+    """
+    def __init__(self, k):
+        """
+        Constructor
+
+        :param k: [int] number of best trials kept
+        """
+        assert isinstance(k, int) and k > 0, "Precondition violation, k needs to be an int > 0, got {}!".format(k)
+        self._k = k
+        self._heap = []
+        self._best = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, loss, tid, row):
+        """
+        Adds a successful trial, trials with nan loss are ignored.
+
+        :param loss: [float] loss
+        :param tid: [int] trial id
+        :param row: [int] row index of the trial in the TrialStore
+
+        :return: [bool] True if the trial is the new best trial
+        """
+        if loss is None or np.isnan(loss):
+            return False
+        loss = float(loss)
+        entry = (-loss, -row, tid)
+        if len(self._heap) < self._k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+        if self._best is None or loss < self._best[0]:
+            self._best = (loss, tid, row)
+            return True
+        return False
+
+    @property
+    def best(self):
+        """
+        Best trial so far.
+
+        :return: [tuple] (loss, tid, row) or None
+        """
+        return self._best
+
+    @property
+    def k(self):
+        """
+        Number of best trials kept.
+
+        :return: [int] k
+        """
+        return self._k
+
+    def sorted(self):
+        """
+        Returns the kept trials ordered by ascending loss.
+
+        :return: [list] (loss, tid, row) tuples
+        """
+        return [(-loss, tid, -row) for loss, row, tid in sorted(self._heap, reverse=True)]
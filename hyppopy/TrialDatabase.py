@@ -0,0 +1,303 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['TrialDatabase', 'DATABASE_EXTENSIONS']
+
+import os
+import time
+import logging
+import sqlite3
+import datetime
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+from hyppopy.TrialLog import TRIALLOG_FIELDS
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+# file extensions identifying a trial database, e.g. when passed to merge_trials
+DATABASE_EXTENSIONS = ['.db', '.sqlite', '.sqlite3']
+
+
+def _quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _to_sql(value):
+    """
+    Converts numpy scalars, datetimes and nan into types SQLite can store.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+class TrialDatabase(object):
+    """
+    The TrialDatabase class stores trials in an SQLite database, table trials, with one column per trial field, see
+    TRIALLOG_FIELDS, one column per hyperparameter and the columns id and study. Indexes are created on loss and on
+    (parameter, loss) for each categorical parameter, e.g. the best loss for kernel='rbf' is found without a table
+    scan. Trials are inserted in batches, a batch is committed in one transaction as soon as batch_size trials are
+    pending or flush_interval seconds passed since the last commit.
+
+    The database is opened in WAL mode with a busy timeout, this allows several local processes, e.g. solvers of a
+    sharded study, to write into and read from the same database at the same time. Trials of different runs can be
+    separated using the study column.
+
+    Opening an existing database without hyperparameter description gives read access via query, best and count:
+
+    db = TrialDatabase("trials.db")
+    db.best(kernel="rbf", C=(0.1, 10))
+    db.query({"kernel": ["rbf", "poly"]}, limit=10)
+
+    Conditions map a column name to a value (equality), a (low, high) tuple (inclusive range) or a list (membership).
+
+    :param path: [str] database file path
+    :param hyperparameter: [dict] hyppopy hyperparameter description, default=None reads the columns of an existing database
+    :param study: [str] study name written into the study column, default=""
+    :param batch_size: [int] max number of pending trials, default=100
+    :param flush_interval: [float] max seconds between two commits, default=1.0
+    :param timeout: [float] seconds to wait for a lock held by another process, default=30.0
+    """
+    def __init__(self, path, hyperparameter=None, study="", batch_size=100, flush_interval=1.0, timeout=30.0):
+        assert isinstance(batch_size, int) and batch_size > 0, "Precondition violation, batch_size needs to be an int > 0, got {}!".format(batch_size)
+        self._path = path
+        self._study = study
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        if hyperparameter is not None:
+            self.__create(hyperparameter)
+        self._names = [name for name in self.__columns() if name not in TRIALLOG_FIELDS + ['id', 'study']]
+        self._insert = "INSERT INTO trials ({}) VALUES ({})".format(
+            ", ".join(_quote(name) for name in ['study'] + TRIALLOG_FIELDS + self._names),
+            ", ".join("?" * (len(TRIALLOG_FIELDS) + len(self._names) + 1)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self.count()
+
+    def __columns(self):
+        return [row[1] for row in self._connection.execute("PRAGMA table_info(trials)")]
+
+    def __create(self, hyperparameter):
+        """
+        Creates the trials table and its indexes or adds missing hyperparameter columns to an existing table. The
+        schema is changed in an exclusive transaction, concurrent processes creating the same schema wait.
+
+        :param hyperparameter: [dict] hyppopy hyperparameter description
+        """
+        for name in hyperparameter.keys():
+            if name in TRIALLOG_FIELDS + ['id', 'study']:
+                msg = "Hyperparameter name {} is reserved in the trial database!".format(name)
+                LOG.error(msg)
+                raise LookupError(msg)
+        columns = {}
+        for name, param in hyperparameter.items():
+            if param["domain"] == "categorical":
+                columns[name] = ""
+            elif param["type"] is int:
+                columns[name] = "INTEGER"
+            else:
+                columns[name] = "REAL"
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS trials (id INTEGER PRIMARY KEY, study TEXT, tid INTEGER, "
+                                     "loss REAL, status TEXT, cached INTEGER, book_time REAL, refresh_time REAL)")
+            existing = self.__columns()
+            for name, dtype in columns.items():
+                if name not in existing:
+                    self._connection.execute("ALTER TABLE trials ADD COLUMN {} {}".format(_quote(name), dtype))
+            self._connection.execute("CREATE INDEX IF NOT EXISTS trials_loss ON trials (loss)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS trials_study ON trials (study, loss)")
+            for name, param in hyperparameter.items():
+                if param["domain"] == "categorical":
+                    self._connection.execute("CREATE INDEX IF NOT EXISTS {} ON trials ({}, loss)".format(
+                        _quote("trials_" + name), _quote(name)))
+            self._connection.execute("COMMIT")
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
+
+    def write(self, tid, params, loss, status, book_time, refresh_time, cached=False):
+        """
+        Adds a finished trial to the pending batch, the batch is committed if it is full or flush_interval passed.
+
+        :param tid: [int] trial id
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+        :param loss: [float] loss
+        :param status: [str] trial status
+        :param book_time: [datetime] trial start
+        :param refresh_time: [datetime] trial end
+        :param cached: [bool] True if the loss was taken from a cache
+        """
+        row = [self._study, tid, loss, status, cached, book_time, refresh_time] + [params.get(name) for name in self._names]
+        self._pending.append([_to_sql(value) for value in row])
+        if len(self._pending) >= self._batch_size or time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Commits all pending trials in one transaction.
+        """
+        if len(self._pending) > 0:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(self._insert, self._pending)
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """
+        Commits the pending trials and closes the database.
+        """
+        if self._connection is None:
+            return
+        self.flush()
+        self._connection.close()
+        self._connection = None
+
+    def __where(self, conditions):
+        """
+        Translates a conditions dict into an SQL where clause and its arguments.
+        """
+        clauses, args = [], []
+        for name, value in conditions.items():
+            if name not in self._names + TRIALLOG_FIELDS + ['id', 'study']:
+                msg = "Unknown column {} in query!".format(name)
+                LOG.error(msg)
+                raise LookupError(msg)
+            if isinstance(value, tuple):
+                clauses.append("{} BETWEEN ? AND ?".format(_quote(name)))
+                args.extend(_to_sql(v) for v in value)
+            elif isinstance(value, list):
+                clauses.append("{} IN ({})".format(_quote(name), ", ".join("?" * len(value))))
+                args.extend(_to_sql(v) for v in value)
+            else:
+                clauses.append("{} = ?".format(_quote(name)))
+                args.append(_to_sql(value))
+        if len(clauses) == 0:
+            return "", args
+        return " WHERE " + " AND ".join(clauses), args
+
+    def query(self, conditions=None, order_by="loss", limit=None):
+        """
+        Returns the trials matching all conditions, pending trials are committed first.
+
+        :param conditions: [dict] column conditions, see class description, default=None returns all trials
+        :param order_by: [str] column the trials are sorted by ascending, default="loss"
+        :param limit: [int] max number of trials, default=None
+
+        :return: [list] trial records as dicts with the fields TRIALLOG_FIELDS, study and the hyperparameter values
+        """
+        return list(self.records(conditions, order_by, limit))
+
+    def records(self, conditions=None, order_by="loss", limit=None):
+        """
+        Generator version of query, the trials are fetched from the database while iterating.
+
+        :return: [generator] trial records
+        """
+        self.flush()
+        columns, sql, args = self.__select(conditions, order_by, limit)
+        for row in self._connection.execute(sql, args):
+            record = dict(zip(columns, row))
+            record['cached'] = bool(record['cached'])
+            yield record
+
+    def __select(self, conditions, order_by, limit, skip_null=False):
+        """
+        Builds the select statement of a query. Rows with NULL in the order_by column are sorted last or, if skip_null
+        is set, excluded, which lets SQLite walk the (..., loss) indexes in order instead of sorting all matching rows.
+
+        :return: [list], [str], [list] selected columns, SQL statement and its arguments
+        """
+        where, args = self.__where(conditions if conditions is not None else {})
+        if order_by not in self._names + TRIALLOG_FIELDS + ['id', 'study']:
+            msg = "Unknown column {} in query!".format(order_by)
+            LOG.error(msg)
+            raise LookupError(msg)
+        columns = ['study'] + TRIALLOG_FIELDS + self._names
+        if skip_null:
+            where += "{} {} IS NOT NULL".format(" AND" if where else " WHERE", _quote(order_by))
+            order = "{}, id".format(_quote(order_by))
+        else:
+            order = "{} IS NULL, {}, id".format(_quote(order_by), _quote(order_by))
+        sql = "SELECT {} FROM trials{} ORDER BY {}".format(", ".join(_quote(name) for name in columns), where, order)
+        if limit is not None:
+            sql += " LIMIT {}".format(int(limit))
+        return columns, sql, args
+
+    def best(self, **conditions):
+        """
+        Returns the successful trial with the lowest loss matching all conditions.
+
+        :param conditions: column conditions as keyword arguments, e.g. kernel="rbf", C=(0.1, 10)
+
+        :return: [dict] trial record or None
+        """
+        conditions['status'] = 'ok'
+        self.flush()
+        columns, sql, args = self.__select(conditions, "loss", 1, skip_null=True)
+        row = self._connection.execute(sql, args).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(columns, row))
+        record['cached'] = bool(record['cached'])
+        return record
+
+    def count(self, conditions=None):
+        """
+        Returns the number of trials matching all conditions.
+
+        :param conditions: [dict] column conditions, default=None counts all trials
+
+        :return: [int] number of trials
+        """
+        self.flush()
+        where, args = self.__where(conditions if conditions is not None else {})
+        return self._connection.execute("SELECT COUNT(*) FROM trials" + where, args).fetchone()[0]
+
+    @property
+    def path(self):
+        """
+        Database file path.
+
+        :return: [str] path
+        """
+        return self._path
+
+    @property
+    def names(self):
+        """
+        Hyperparameter column names.
+
+        :return: [list] names
+        """
+        return list(self._names)
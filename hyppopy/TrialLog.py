@@ -0,0 +1,254 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['TrialLog', 'read_trial_log', 'TRIALLOG_FIELDS']
+
+import os
+import csv
+import json
+import time
+import logging
+import datetime
+import threading
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+# fields written for each trial in front of the hyperparameters
+TRIALLOG_FIELDS = ['tid', 'loss', 'status', 'cached', 'book_time', 'refresh_time']
+
+
+def _to_native(value):
+    """
+    Converts numpy scalars, datetimes and nan into types writable as JSON or CSV.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _parse_csv_value(value):
+    """
+    Converts a CSV cell back into None, bool, int, float or str.
+    """
+    if value == "":
+        return None
+    if value in ("True", "False"):
+        return value == "True"
+    for dtype in (int, float):
+        try:
+            return dtype(value)
+        except ValueError:
+            pass
+    return value
+
+
+class TrialLog(object):
+    """
+    The TrialLog class appends each finished trial to a line-oriented file while the solver is running, this allows
+    external tools to tail the progress of a run. The format is derived from the file extension, '.csv' files are
+    written as CSV with a header line, all other files as JSON lines, one object per trial. Each record holds the
+    fields tid, loss, status, cached, book_time, refresh_time (seconds since epoch) and the hyperparameter values,
+    a nan loss is written as null or empty cell.
+
+    The file is written through a buffer that is flushed to the operating system at least every flush_interval
+    seconds and synced to disk at least every fsync_interval seconds, an interval of 0 flushes or syncs after each
+    trial. If no further trial is written, e.g. during a long evaluation, a daemon timer thread flushes and syncs the
+    buffered trials when the interval has passed. A crashing process therefore loses at most the trials of the last
+    flush window. Existing files are appended to, not overwritten.
+
+    :param path: [str] log file path
+    :param names: [list] hyperparameter names, defines the CSV columns
+    :param flush_interval: [float] max seconds between two flushes, default=1.0
+    :param fsync_interval: [float] max seconds between two fsyncs, default=60.0
+    """
+    def __init__(self, path, names, flush_interval=1.0, fsync_interval=60.0):
+        assert flush_interval >= 0, "Precondition violation, flush_interval needs to be >= 0, got {}!".format(flush_interval)
+        assert fsync_interval >= 0, "Precondition violation, fsync_interval needs to be >= 0, got {}!".format(fsync_interval)
+        self._path = path
+        self._names = list(names)
+        self._csv = os.path.splitext(path)[1].lower() == ".csv"
+        self._flush_interval = flush_interval
+        self._fsync_interval = fsync_interval
+        self._file = None
+        self._writer = None
+        self._last_flush = None
+        self._last_fsync = None
+        self._dirty = False
+        self._unsynced = False
+        self._timer = None
+        self._lock = threading.RLock()
+        self._count = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self):
+        """
+        Opens the log file for appending, writes the CSV header if the file is empty.
+        """
+        if self._file is not None:
+            return
+        directory = os.path.dirname(os.path.abspath(self._path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._file = open(self._path, "a", newline="" if self._csv else None, buffering=1 << 16)
+        if self._csv:
+            self._writer = csv.writer(self._file)
+            if self._file.tell() == 0:
+                self._writer.writerow(TRIALLOG_FIELDS + self._names)
+        self._last_flush = self._last_fsync = time.monotonic()
+        LOG.debug("opened trial log {}".format(self._path))
+
+    def write(self, tid, params, loss, status, book_time, refresh_time, cached=False):
+        """
+        Appends a finished trial.
+
+        :param tid: [int] trial id
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+        :param loss: [float] loss
+        :param status: [str] trial status
+        :param book_time: [datetime] trial start
+        :param refresh_time: [datetime] trial end
+        :param cached: [bool] True if the loss was taken from a cache
+        """
+        with self._lock:
+            if self._file is None:
+                self.open()
+            record = [tid, loss, status, cached, book_time, refresh_time]
+            if self._csv:
+                row = [_to_native(value) for value in record] + [_to_native(params.get(name)) for name in self._names]
+                self._writer.writerow(["" if value is None else value for value in row])
+            else:
+                data = {field: _to_native(value) for field, value in zip(TRIALLOG_FIELDS, record)}
+                data.update({name: _to_native(value) for name, value in params.items()})
+                self._file.write(json.dumps(data) + "\n")
+            self._count += 1
+            self._dirty = self._unsynced = True
+            self.__maintain()
+
+    def __maintain(self):
+        """
+        Flushes and syncs the buffered trials whose interval has passed and starts a timer for the remaining ones, must
+        be called holding the lock.
+        """
+        now = time.monotonic()
+        fsync = self._unsynced and now - self._last_fsync >= self._fsync_interval
+        if fsync or (self._dirty and now - self._last_flush >= self._flush_interval):
+            self.__flush(fsync)
+        deadlines = []
+        if self._dirty:
+            deadlines.append(self._last_flush + self._flush_interval)
+        if self._unsynced:
+            deadlines.append(self._last_fsync + self._fsync_interval)
+        if len(deadlines) > 0 and self._timer is None:
+            self._timer = threading.Timer(max(0.0, min(deadlines) - now), self.__on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def __on_timer(self):
+        with self._lock:
+            self._timer = None
+            if self._file is not None:
+                self.__maintain()
+
+    def __flush(self, fsync):
+        self._file.flush()
+        self._last_flush = time.monotonic()
+        self._dirty = False
+        if fsync:
+            os.fsync(self._file.fileno())
+            self._last_fsync = self._last_flush
+            self._unsynced = False
+
+    def flush(self, fsync=False):
+        """
+        Flushes the buffer to the operating system.
+
+        :param fsync: [bool] additionally sync the file to disk, default=False
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            self.__flush(fsync)
+
+    def close(self):
+        """
+        Flushes and syncs the remaining trials and closes the file.
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self.__flush(fsync=True)
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    @property
+    def path(self):
+        """
+        Log file path.
+
+        :return: [str] path
+        """
+        return self._path
+
+    @property
+    def count(self):
+        """
+        Number of trials written by this instance.
+
+        :return: [int] number of trials
+        """
+        return self._count
+
+
+def read_trial_log(path):
+    """
+    Reads a trial log written by TrialLog, the format is derived from the file extension. An incomplete last line,
+    e.g. of a log that is still written, is skipped.
+
+    :param path: [str] log file path
+
+    :return: [generator] trial records as dicts with the fields TRIALLOG_FIELDS and the hyperparameter values
+    """
+    if os.path.splitext(path)[1].lower() == ".csv":
+        with open(path, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            for row in reader:
+                if len(row) != len(header):
+                    continue
+                yield {name: _parse_csv_value(value) for name, value in zip(header, row)}
+    else:
+        with open(path, "r") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    continue
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
@@ -0,0 +1,177 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['merge_trials', 'iter_trials']
+
+import os
+import json
+import heapq
+import hashlib
+import logging
+import sqlite3
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+from hyppopy.TrialLog import TrialLog, read_trial_log, TRIALLOG_FIELDS
+from hyppopy.TrialStore import TrialStore, STATUS
+from hyppopy.TrialDatabase import TrialDatabase, DATABASE_EXTENSIONS
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+
+def iter_trials(source):
+    """
+    Iterates the trials of a trial source in the record format of read_trial_log.
+
+    :param source: [object] trial log path, trial database path or TrialStore instance
+
+    :return: [generator] trial records
+    """
+    if isinstance(source, TrialStore):
+        for n in range(len(source)):
+            trial = source.get_trial(n)
+            record = {'tid': trial['tid'],
+                      'loss': None if np.isnan(trial['result']['loss']) else trial['result']['loss'],
+                      'status': trial['result']['status'],
+                      'cached': trial['cached'],
+                      'book_time': None if trial['book_time'] is None else trial['book_time'].timestamp(),
+                      'refresh_time': None if trial['refresh_time'] is None else trial['refresh_time'].timestamp()}
+            record.update(source.get_params(n))
+            yield record
+    elif isinstance(source, str):
+        if not os.path.isfile(source):
+            msg = "Trial source {} not found!".format(source)
+            LOG.error(msg)
+            raise FileNotFoundError(msg)
+        if os.path.splitext(source)[1].lower() in DATABASE_EXTENSIONS:
+            with TrialDatabase(source) as database:
+                for record in database.records(order_by="refresh_time"):
+                    del record['study']
+                    yield record
+        else:
+            for record in read_trial_log(source):
+                yield record
+    else:
+        msg = "Input error, trial source of type: {} not allowed!".format(type(source))
+        LOG.error(msg)
+        raise TypeError(msg)
+
+
+def _params(record, types=None):
+    """
+    Returns the parameter set of a record, with types given the values are cast to their hyperparameter type, e.g.
+    categories like "1" that a CSV log returns as int.
+    """
+    params = {name: value for name, value in record.items() if name not in TRIALLOG_FIELDS}
+    if types is None:
+        return params
+    for name, value in params.items():
+        dtype = types.get(name)
+        if value is None or dtype is None or type(value) is dtype:
+            continue
+        try:
+            params[name] = dtype(value)
+        except (TypeError, ValueError):
+            msg = "Value {!r} of hyperparameter {} cannot be cast to {}!".format(value, name, dtype)
+            LOG.error(msg)
+            raise TypeError(msg)
+    return params
+
+
+def _digest(params):
+    """
+    Returns a digest identifying a parameter set, independent of the parameter order.
+    """
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).digest()
+
+
+def merge_trials(sources, output, top_k=10, deduplicate=True, flush_interval=1.0, fsync_interval=60.0, hyperparameter=None):
+    """
+    Streams the trials of several trial logs, trial databases or TrialStores, e.g. written by the shards of a
+    distributed study, into one trial log. The trials are merged in order of their refresh_time, assuming each source
+    is ordered, and the tids are renumbered from 1. Trials without refresh_time are sorted last, like the trial
+    database does. If deduplicate is True, only the first trial of each parameter set is kept. Duplicates are
+    detected via parameter set digests kept in a temporary SQLite database on disk. Together with the bounded top-k
+    heap this keeps the memory footprint independent of the total number of trials. CSV logs do not store value
+    types, e.g. the category "1" is read as int, so the parameter sets of different source formats only match if the
+    hyperparameter description is given: all values are then cast to their type before hashing and writing.
+
+    :param sources: [list] trial log paths, trial database paths (see DATABASE_EXTENSIONS) or TrialStore instances
+    :param output: [str] trial log path of the merged log, the format is derived from the extension (see TrialLog)
+    :param top_k: [int] number of best trials reported, default=10
+    :param deduplicate: [bool] drop repeated parameter sets, default=True
+    :param flush_interval: [float] max seconds between two flushes of the output log, default=1.0
+    :param fsync_interval: [float] max seconds between two fsyncs of the output log, default=60.0
+    :param hyperparameter: [dict] hyperparameter description, e.g. HyppopyProject.hyperparameter, only the field type
+                           is used, or a dict {'name': type}, default=None keeps the values as read
+
+    :return: [dict] {'trials': ..., 'duplicates': ..., 'best': ..., 'top_k': [...]} with best and top_k entries of the
+             form {'tid': ..., 'loss': ..., 'params': {...}} referring to the merged tids
+    """
+    assert isinstance(top_k, int) and top_k > 0, "Precondition violation, top_k needs to be an int > 0, got {}!".format(top_k)
+    assert len(sources) > 0, "Precondition violation, no trial source given!"
+    for source in sources:
+        if isinstance(source, str) and os.path.abspath(source) == os.path.abspath(output):
+            msg = "Output {} is also a merge source!".format(output)
+            LOG.error(msg)
+            raise AssertionError(msg)
+
+    types = None
+    if hyperparameter is not None:
+        types = {name: value["type"] if isinstance(value, dict) else value for name, value in hyperparameter.items()}
+
+    # hyperparameter names of all sources, the first record of each source is sufficient
+    names = []
+    for source in sources:
+        for record in iter_trials(source):
+            names.extend(name for name in _params(record) if name not in names)
+            break
+
+    def key(record):
+        # NULLs last, the order of TrialDatabase.records
+        return record['refresh_time'] if record['refresh_time'] is not None else np.inf
+
+    digests = sqlite3.connect("") if deduplicate else None
+    if digests is not None:
+        digests.execute("CREATE TABLE digests (digest BLOB PRIMARY KEY)")
+    heap = []
+    count = 0
+    duplicates = 0
+    try:
+        with TrialLog(output, names, flush_interval, fsync_interval) as log:
+            for record in heapq.merge(*[iter_trials(source) for source in sources], key=key):
+                params = _params(record, types)
+                if digests is not None:
+                    if digests.execute("INSERT OR IGNORE INTO digests VALUES (?)", (_digest(params),)).rowcount == 0:
+                        duplicates += 1
+                        continue
+                count += 1
+                log.write(count, params, record['loss'], record['status'], record['book_time'],
+                          record['refresh_time'], bool(record['cached']))
+                loss = record['loss']
+                if record['status'] != STATUS[0] or loss is None or np.isnan(loss):
+                    continue
+                entry = (-loss, -count, params)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+    finally:
+        if digests is not None:
+            digests.close()
+    ranking = [{'tid': -tid, 'loss': -loss, 'params': params}
+               for loss, tid, params in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+    LOG.debug("merged {} trials from {} sources into {}, {} duplicates dropped".format(count, len(sources), output, duplicates))
+    return {'trials': count,
+            'duplicates': duplicates,
+            'best': ranking[0] if len(ranking) > 0 else None,
+            'top_k': ranking}
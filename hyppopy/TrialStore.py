@@ -0,0 +1,551 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['TrialStore', 'TrialsView', 'STATUS', 'FIELDS']
+
+import os
+import shutil
+import logging
+import weakref
+import datetime
+import tempfile
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+# trial status values, the status column keeps the index into this list
+STATUS = ['ok', 'failed']
+
+# fixed trial fields and their dtypes, stored in front of the hyperparameter columns
+FIELDS = [('tid', np.int64), ('loss', np.float64), ('status', np.int8), ('cached', bool), ('book_time', np.float64),
+          ('refresh_time', np.float64)]
+
+# number of rows processed at once when scanning columns partially held on disk
+CHUNKSIZE = 1 << 16
+
+
+class TrialsView(object):
+    """
+    Read-only sequence view on a TrialStore presenting each trial as hyperopt-like trial dict of the form
+    {'tid': ..., 'result': {'loss': ..., 'status': ...}, 'misc': {'tid': ..., 'idxs': {...}, 'vals': {...}},
+    'book_time': ..., 'refresh_time': ..., 'cached': ...}. The dicts are created on access only.
+    """
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __iter__(self):
+        for n in range(len(self._store)):
+            yield self._store.get_trial(n)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._store.get_trial(n) for n in range(*item.indices(len(self._store)))]
+        if item < 0:
+            item += len(self._store)
+        if not 0 <= item < len(self._store):
+            raise IndexError("trial index out of range")
+        return self._store.get_trial(item)
+
+
+class TrialStore(object):
+    """
+    The TrialStore class keeps the optimization history in growable NumPy columns, one per hyperparameter plus the
+    columns tid, loss, status, cached, book_time and refresh_time (seconds since epoch). If a hyperparameter description
+    is passed, the column kind is taken from it: categorical axes are stored as int32 category codes, whatever the
+    types of their choices, all other axes as int64 or float64 columns according to their type. Columns without
+    description get their kind from the first value, numbers become int64 or float64 columns and all other values,
+    e.g. strings or bools, category codes. An int column is converted to float64 if a non-integral value arrives.
+    Compared to a list of hyperopt trial dicts this keeps the memory footprint per trial at a few bytes per column.
+
+    If max_trials_in_memory is set, at most this number of trials is held in RAM. When the in-memory rows are full
+    they are appended to one binary file per column in a temporary directory and read back as memory-mapped arrays.
+    All accessors transparently read across disk and memory, best_index scans the columns chunkwise. The temporary
+    directory is removed when the store is garbage collected.
+
+    The trials property offers a hyperopt-like view on the trials for code relying on the trial dict layout.
+    """
+    def __init__(self, capacity=1024, max_trials_in_memory=None, spill_dir=None, hyperparameter=None):
+        """
+        Constructor
+
+        :param capacity: [int] initial number of rows allocated, default=1024
+        :param max_trials_in_memory: [int] max number of rows kept in memory, default=None means unlimited
+        :param spill_dir: [str] directory the spill files are created in, default=None uses the system temp directory
+        :param hyperparameter: [dict] hyperparameter description, e.g. a project's hyperparameter, defining the column
+                               kinds, default=None derives them from the first values
+        """
+        if max_trials_in_memory is not None:
+            assert max_trials_in_memory > 0, "Precondition violation, max_trials_in_memory needs to be > 0, got {}!".format(max_trials_in_memory)
+            capacity = min(capacity, max_trials_in_memory)
+        self._capacity = max(int(capacity), 1)
+        self._max_trials_in_memory = max_trials_in_memory
+        self._spill_dir = spill_dir
+        self._hyperparameter = hyperparameter if hyperparameter is not None else {}
+        self._directory = None
+        self._finalizer = None
+        self._size = 0
+        self._offset = 0
+        self._names = []
+        self._kinds = {}
+        self._fields = {name: np.empty(self._capacity, dtype=dtype) for name, dtype in FIELDS}
+        self._columns = {}
+        self._categories = {}
+        self._codes = {}
+        self._maps = {}
+
+    def __len__(self):
+        return self._size
+
+    def __grow(self):
+        """
+        Doubles the number of allocated rows of all columns, limited by max_trials_in_memory.
+        """
+        rows = self._size - self._offset
+        self._capacity *= 2
+        if self._max_trials_in_memory is not None:
+            self._capacity = min(self._capacity, self._max_trials_in_memory)
+        for columns in [self._fields, self._columns]:
+            for name, column in columns.items():
+                grown = np.empty(self._capacity, dtype=column.dtype)
+                grown[:rows] = column[:rows]
+                columns[name] = grown
+
+    def __path(self, key):
+        """
+        Returns the spill file path of a column.
+
+        :param key: [tuple] ('field', name) or ('param', name)
+
+        :return: [str] file path
+        """
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="hyppopy_trials_", dir=self._spill_dir)
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._directory, True)
+            LOG.debug("spilling trials to {}".format(self._directory))
+        if key[0] == 'field':
+            return os.path.join(self._directory, "field_{}.bin".format(key[1]))
+        return os.path.join(self._directory, "param_{}.bin".format(self._names.index(key[1])))
+
+    def __memory(self, key):
+        return self._fields[key[1]] if key[0] == 'field' else self._columns[key[1]]
+
+    def __disk(self, key):
+        """
+        Returns the memory map of the rows of a column already written to disk.
+
+        :param key: [tuple] ('field', name) or ('param', name)
+
+        :return: [ndarray] read-only memory map
+        """
+        dtype = self.__memory(key).dtype
+        if self._offset == 0:
+            return np.empty(0, dtype=dtype)
+        if key not in self._maps:
+            self._maps[key] = np.memmap(self.__path(key), dtype=dtype, mode='r', shape=(self._offset,))
+        return self._maps[key]
+
+    def __range(self, key, start, stop):
+        """
+        Returns the rows start to stop of a column, a view if the rows are either all on disk or all in memory.
+        """
+        if stop <= self._offset:
+            return self.__disk(key)[start:stop]
+        if start >= self._offset:
+            return self.__memory(key)[start - self._offset:stop - self._offset]
+        return np.concatenate([self.__disk(key)[start:], self.__memory(key)[:stop - self._offset]])
+
+    def __value(self, key, index):
+        if index < self._offset:
+            return self.__disk(key)[index]
+        return self.__memory(key)[index - self._offset]
+
+    def spill(self):
+        """
+        Appends all rows held in memory to the spill files and frees the in-memory rows.
+        """
+        rows = self._size - self._offset
+        if rows == 0:
+            return
+        keys = [('field', name) for name, _ in FIELDS] + [('param', name) for name in self._names]
+        for key in keys:
+            with open(self.__path(key), "ab") as f:
+                self.__memory(key)[:rows].tofile(f)
+        self._offset = self._size
+        self._maps = {}
+
+    def __fill_disk(self, key, dtype, value):
+        """
+        Creates the spill file of a column added after rows were spilled, the spilled rows are marked as missing.
+        """
+        chunk = np.full(min(self._offset, CHUNKSIZE), value, dtype=dtype)
+        with open(self.__path(key), "wb") as f:
+            for start in range(0, self._offset, CHUNKSIZE):
+                chunk[:min(CHUNKSIZE, self._offset - start)].tofile(f)
+
+    def __convert_disk(self, key, dtype):
+        """
+        Converts the spill file of a column into another dtype.
+        """
+        path = self.__path(key)
+        source = self.__disk(key)
+        with open(path + ".tmp", "wb") as f:
+            for start in range(0, self._offset, CHUNKSIZE):
+                source[start:start + CHUNKSIZE].astype(dtype).tofile(f)
+        self._maps.pop(key, None)
+        del source
+        os.replace(path + ".tmp", path)
+
+    def __kind(self, name, value):
+        """
+        Returns the column kind of a new hyperparameter column, taken from the hyperparameter description if available,
+        otherwise derived from the first value.
+
+        :param name: [str] hyperparameter name
+        :param value: [object] first value
+
+        :return: [str] 'int', 'float' or 'category'
+        """
+        description = self._hyperparameter.get(name)
+        if isinstance(description, dict):
+            dtype = description.get("type")
+            if description.get("domain") == "categorical":
+                return 'category'
+            if isinstance(dtype, type):
+                if issubclass(dtype, (bool, np.bool_)):
+                    return 'category'
+                if issubclass(dtype, (int, np.integer)):
+                    return 'int'
+                if issubclass(dtype, (float, np.floating)):
+                    return 'float'
+        if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, np.integer, np.floating)):
+            return 'category'
+        if isinstance(value, (int, np.integer)):
+            return 'int'
+        return 'float'
+
+    def __add_column(self, name, value):
+        """
+        Adds a hyperparameter column of the kind returned by __kind. Previous rows are marked as missing, so an int
+        column added after the first trial is stored as float column.
+
+        :param name: [str] hyperparameter name
+        :param value: [object] first value
+        """
+        self._names.append(name)
+        kind = self.__kind(name, value)
+        if kind == 'category':
+            self._kinds[name] = 'category'
+            self._categories[name] = []
+            self._codes[name] = {}
+            self._columns[name] = np.full(self._capacity, -1, dtype=np.int32)
+        elif kind == 'int' and self._size == 0:
+            self._kinds[name] = 'int'
+            self._columns[name] = np.empty(self._capacity, dtype=np.int64)
+        else:
+            self._kinds[name] = 'float'
+            self._columns[name] = np.full(self._capacity, np.nan, dtype=np.float64)
+        if self._offset > 0:
+            self.__fill_disk(('param', name), self._columns[name].dtype, -1 if self._kinds[name] == 'category' else np.nan)
+
+    def __set_value(self, name, row, value):
+        """
+        Writes a hyperparameter value, converts int columns to float if necessary.
+
+        :param name: [str] hyperparameter name
+        :param row: [int] in-memory row index
+        :param value: [object] value, None marks a missing value
+        """
+        kind = self._kinds[name]
+        if kind == 'category':
+            if value is None:
+                self._columns[name][row] = -1
+                return
+            key = (type(value), value)
+            code = self._codes[name].get(key)
+            if code is None:
+                code = len(self._categories[name])
+                self._categories[name].append(value)
+                self._codes[name][key] = code
+            self._columns[name][row] = code
+            return
+        if kind == 'int' and (value is None or not isinstance(value, (int, np.integer))):
+            self._kinds[name] = 'float'
+            if self._offset > 0:
+                self.__convert_disk(('param', name), np.float64)
+            self._columns[name] = self._columns[name].astype(np.float64)
+        self._columns[name][row] = np.nan if value is None else value
+
+    def append(self, params, loss, status='ok', book_time=None, refresh_time=None, cached=False, tid=None):
+        """
+        Appends a finished trial.
+
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+        :param loss: [float] loss, None is stored as nan
+        :param status: [str] trial status, one of STATUS
+        :param book_time: [float] trial start in seconds since epoch or datetime, default=None
+        :param refresh_time: [float] trial end in seconds since epoch or datetime, default=None
+        :param cached: [bool] True if the loss was taken from a cache
+        :param tid: [int] trial id, default=None uses the row number
+
+        :return: [int] trial id
+        """
+        if self._size - self._offset == self._capacity:
+            if self._max_trials_in_memory is not None and self._capacity >= self._max_trials_in_memory:
+                self.spill()
+            else:
+                self.__grow()
+        row = self._size - self._offset
+        for name, value in params.items():
+            if name not in self._kinds:
+                self.__add_column(name, value)
+        for name in self._names:
+            self.__set_value(name, row, params.get(name))
+        if tid is None:
+            tid = self._size
+        self._fields['tid'][row] = tid
+        self._fields['loss'][row] = np.nan if loss is None else loss
+        self._fields['status'][row] = STATUS.index(status)
+        self._fields['cached'][row] = cached
+        self._fields['book_time'][row] = self.__timestamp(book_time)
+        self._fields['refresh_time'][row] = self.__timestamp(refresh_time)
+        self._size += 1
+        return tid
+
+    @staticmethod
+    def __timestamp(value):
+        if value is None:
+            return np.nan
+        if isinstance(value, datetime.datetime):
+            return value.timestamp()
+        return float(value)
+
+    def field(self, name, start=0, stop=None):
+        """
+        Returns one of the trial fields tid, loss, status, cached, book_time or refresh_time or a row range of it.
+
+        :param name: [str] field name
+        :param start: [int] first row, default=0
+        :param stop: [int] row after the last row, default=None means all rows
+
+        :return: [ndarray] field values
+        """
+        if stop is None:
+            stop = self._size
+        return self.__range(('field', name), start, stop)
+
+    def column(self, name, start=0, stop=None):
+        """
+        Returns a hyperparameter column or a row range of it. Numerical columns are returned as view if possible,
+        category columns are decoded into an object array.
+
+        :param name: [str] hyperparameter name
+        :param start: [int] first row, default=0
+        :param stop: [int] row after the last row, default=None means all rows
+
+        :return: [ndarray] column values
+        """
+        if stop is None:
+            stop = self._size
+        values = self.__range(('param', name), start, stop)
+        if self._kinds[name] != 'category':
+            return values
+        categories = np.empty(len(self._categories[name]) + 1, dtype=object)
+        categories[:-1] = self._categories[name]
+        categories[-1] = None
+        return categories[values]
+
+    def codes(self, name, start=0, stop=None):
+        """
+        Returns the int32 category codes of a category column or a row range of it, -1 marks a missing value.
+
+        :param name: [str] hyperparameter name
+        :param start: [int] first row, default=0
+        :param stop: [int] row after the last row, default=None means all rows
+
+        :return: [ndarray], [list] codes and the categories they refer to
+        """
+        assert self._kinds[name] == 'category', "Precondition violation, {} is no category column!".format(name)
+        if stop is None:
+            stop = self._size
+        return self.__range(('param', name), start, stop), list(self._categories[name])
+
+    def kind(self, name):
+        """
+        Returns the column kind of a hyperparameter.
+
+        :param name: [str] hyperparameter name
+
+        :return: [str] 'int', 'float' or 'category'
+        """
+        return self._kinds[name]
+
+    def get_params(self, index):
+        """
+        Returns the parameter set of a trial.
+
+        :param index: [int] row index
+
+        :return: [dict] parameter set
+        """
+        if index < 0:
+            index += self._size
+        params = {}
+        for name in self._names:
+            value = self.__value(('param', name), index)
+            if self._kinds[name] == 'category':
+                params[name] = self._categories[name][value] if value >= 0 else None
+            elif self._kinds[name] == 'int':
+                params[name] = int(value)
+            else:
+                params[name] = float(value)
+        return params
+
+    def get_trial(self, index):
+        """
+        Returns a trial as hyperopt-like trial dict.
+
+        :param index: [int] row index
+
+        :return: [dict] trial dict
+        """
+        if index < 0:
+            index += self._size
+        tid = int(self.__value(('field', 'tid'), index))
+        params = self.get_params(index)
+        times = []
+        for name in ['book_time', 'refresh_time']:
+            value = self.__value(('field', name), index)
+            times.append(None if np.isnan(value) else datetime.datetime.fromtimestamp(value))
+        return {'tid': tid,
+                'result': {'loss': float(self.__value(('field', 'loss'), index)),
+                           'status': STATUS[self.__value(('field', 'status'), index)]},
+                'misc': {
+                    'tid': tid,
+                    'idxs': {name: [tid] for name in params.keys()},
+                    'vals': {name: [value] for name, value in params.items()}
+                },
+                'book_time': times[0],
+                'refresh_time': times[1],
+                'cached': bool(self.__value(('field', 'cached'), index))}
+
+    @property
+    def best_index(self):
+        """
+        Row index of the trial with minimal loss among all successful trials.
+
+        :return: [int] row index or None if there is no successful trial
+        """
+        best, best_loss = None, np.inf
+        for start in range(0, self._size, CHUNKSIZE):
+            stop = min(start + CHUNKSIZE, self._size)
+            losses = np.where(self.field('status', start, stop) == 0, self.field('loss', start, stop), np.nan)
+            if np.all(np.isnan(losses)):
+                continue
+            index = int(np.nanargmin(losses))
+            if best is None or losses[index] < best_loss:
+                best, best_loss = start + index, losses[index]
+        return best
+
+    @property
+    def argmin(self):
+        """
+        Parameter set of the trial with minimal loss, analogous to hyperopt's Trials.argmin.
+
+        :return: [dict] best parameter set
+        """
+        index = self.best_index
+        if index is None:
+            raise AssertionError("No successful trial available!")
+        return self.get_params(index)
+
+    @property
+    def names(self):
+        """
+        Hyperparameter names in column order.
+
+        :return: [list] names
+        """
+        return list(self._names)
+
+    @property
+    def max_trials_in_memory(self):
+        """
+        Max number of rows kept in memory.
+
+        :return: [int] max rows or None
+        """
+        return self._max_trials_in_memory
+
+    @property
+    def trials_on_disk(self):
+        """
+        Number of rows written to the spill files.
+
+        :return: [int] number of rows
+        """
+        return self._offset
+
+    @property
+    def tids(self):
+        return self.field('tid')
+
+    @property
+    def losses(self):
+        return self.field('loss')
+
+    @property
+    def status(self):
+        return self.field('status')
+
+    @property
+    def ok(self):
+        """
+        Boolean column, True for successful trials.
+
+        :return: [ndarray] ok flags
+        """
+        return self.status == 0
+
+    @property
+    def cached(self):
+        return self.field('cached')
+
+    @property
+    def book_time(self):
+        return self.field('book_time')
+
+    @property
+    def refresh_time(self):
+        return self.field('refresh_time')
+
+    @property
+    def durations(self):
+        """
+        Trial durations in seconds.
+
+        :return: [ndarray] durations
+        """
+        return self.refresh_time - self.book_time
+
+    @property
+    def trials(self):
+        """
+        Hyperopt-like view on the trials.
+
+        :return: [TrialsView] trials view
+        """
+        return TrialsView(self)
@@ -53,7 +53,7 @@ class VisdomViewer(object):
 
         self._project = project
         self._best_win = None
-        self._best_loss = None
+        self._best_tid = None
         self._loss_iter_plot = None
         self._status_report = None
         self._axis_tags = None
@@ -126,42 +126,33 @@ class VisdomViewer(object):
         else:
             self._viz.text(report, win=self._status_report, append=True)
 
-    def show_best(self, input_data):
+    def show_best(self, best):
         """
-        Shows best parameter set
+        Shows best parameter set, the window is only redrawn if the best trial changed
 
-        :param input_data: [dict] trail infos
+        :param best: [dict] best trial as returned by HyppopySolver.best_so_far
         """
+        if best is None or best["tid"] == self._best_tid:
+            return
+        self._best_tid = best["tid"]
+        txt = "Best Parameter Set:<hr>Loss: {}<hr><ul>".format(best["loss"])
+        for axis, value in best["params"].items():
+            txt += "<li>{} = {}</li>".format(axis, value)
+        txt += "</ul>"
         if self._best_win is None:
-            self._best_loss = input_data["loss"]
-            txt = "Best Parameter Set:<hr>Loss: {}<hr><ul>".format(self._best_loss)
-            for axis in self._axis_tags:
-                if self._project.hyperparameter[axis]["domain"] == "categorical":
-                    txt += "<li>{} = {}</li>".format(axis, self._project.hyperparameter[axis]["data"][input_data[axis]])
-                else:
-                    txt += "<li>{} = {}</li>".format(axis, input_data[axis])
-            txt += "</ul>"
             self._best_win = self._viz.text(txt)
         else:
-            if input_data["loss"] < self._best_loss:
-                self._best_loss = input_data["loss"]
-                txt = "Best Parameter Set:<hr>Loss: {}<hr><ul>".format(self._best_loss)
-                for axis in self._axis_tags:
-                    if self._project.hyperparameter[axis]["domain"] == "categorical":
-                        txt += "<li>{} = {}</li>".format(axis, self._project.hyperparameter[axis]["data"][input_data[axis]])
-                    else:
-                        txt += "<li>{} = {}</li>".format(axis, input_data[axis])
-                txt += "</ul>"
-                self._viz.text(txt, win=self._best_win, append=False)
+            self._viz.text(txt, win=self._best_win, append=False)
 
-    def update(self, input_data):
+    def update(self, input_data, best=None):
         """
         This function calls all visdom displaying routines
 
         :param input_data: [dict] trail infos
+        :param best: [dict] best trial so far, see HyppopySolver.best_so_far, default=None
         """
         if self._enabled:
             self.show_statusreport(input_data)
             self.plot_losshistory(input_data)
             self.plot_hyperparameter(input_data)
-            self.show_best(input_data)
+            self.show_best(best)
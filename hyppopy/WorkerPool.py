@@ -0,0 +1,247 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['WorkerPool']
+
+import os
+import copy
+import time
+import pickle
+import random
+import logging
+import multiprocessing
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+from hyppopy.BlackboxFunction import BlackboxFunction
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+# blackbox registry of the current worker process, set once by _init_worker
+_WORKER_BLACKBOX = None
+
+
+def _init_worker(payload):
+    """
+    Worker process initializer, deserializes the blackbox once, registers it in the process and creates the worker
+    context.
+
+    :param payload: [bytes] pickled BlackboxFunction instance or function
+    """
+    global _WORKER_BLACKBOX
+    _WORKER_BLACKBOX = pickle.loads(payload)
+    if isinstance(_WORKER_BLACKBOX, BlackboxFunction):
+        _WORKER_BLACKBOX.context
+
+
+def _evaluate(message, stream=None):
+    """
+    Evaluates the registered worker blackbox for a pickled parameter set. If a seed stream is given, the global random
+    states of the process are seeded from it before the evaluation.
+
+    :param message: [bytes] pickled hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+    :param stream: [SeedSequence] seed stream of the trial, default=None
+
+    :return: [bytes], [float] pickled loss and the time in seconds spent for (de)serialization in the worker
+    """
+    if stream is not None:
+        random.seed(int(stream.generate_state(2, np.uint64)[0]))
+        np.random.seed(stream.generate_state(4))
+    start = time.perf_counter()
+    params = pickle.loads(message)
+    dt = time.perf_counter() - start
+    loss = _WORKER_BLACKBOX(**params)
+    start = time.perf_counter()
+    answer = pickle.dumps(loss, protocol=pickle.HIGHEST_PROTOCOL)
+    return answer, dt + time.perf_counter() - start
+
+
+def _evaluate_job(job):
+    """
+    Same as _evaluate for a (message, stream) tuple, used by WorkerPool.map.
+    """
+    return _evaluate(*job)
+
+
+class WorkerPool(object):
+    """
+    The WorkerPool class evaluates a blackbox function in a pool of long-lived worker processes. The blackbox, including
+    its data, is serialized once and each worker deserializes it once when it is started. If the blackbox is a
+    BlackboxFunction defining worker_init, each worker runs worker_init once to create its worker context. This
+    context, e.g. loaded libraries, models or feature caches, is kept warm between trials. Per trial only the pickled
+    parameter set and the pickled loss are exchanged, the (de)serialization time and bytes are accumulated in
+    serialization_stats. A WorkerPool instance can be used as solver blackbox:
+
+    pool = WorkerPool(BlackboxFunction(blackbox_func=foo, worker_init=init, data=data))
+    solver.blackbox = pool
+    solver.run()
+    pool.close()
+
+    Solvers call the blackbox one trial at a time and each call blocks until its trial is done, so during solver.run
+    a single worker is busy at any time. More workers only pay off for map, which evaluates a list of parameter sets
+    in parallel, each of them running worker_init once.
+
+    :param blackbox: [object] BlackboxFunction instance or function, must be picklable
+    :param workers: [int] number of worker processes, default=1
+    :param start_method: [str] multiprocessing start method, default=None uses the platform default
+    :param seed: [object] int or SeedSequence, if given one stream per trial is spawned from it in the calling process,
+                 in the order the trials are submitted, and the worker seeds the global random and numpy.random
+                 states with it before evaluating the trial. The results do not depend on the number of workers or on
+                 which worker runs which trial. default=None lets a solver using the pool as blackbox set the seed of
+                 each run, derived from its seed_sequence (see seed_run)
+    """
+    def __init__(self, blackbox, workers=1, start_method=None, seed=None):
+        assert isinstance(workers, int) and workers > 0, "Precondition violation, workers needs to be an int > 0, got {}!".format(workers)
+        self._blackbox = blackbox
+        self._workers = workers
+        self._start_method = start_method
+        self._seed_sequence = None
+        self._run_seed_sequence = None
+        if seed is not None:
+            self._seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self._pool = None
+        self._payload = None
+        self._stats = {"setup_bytes": 0, "setup_time": 0.0, "messages": 0, "bytes": 0, "time": 0.0}
+
+    def __call__(self, **params):
+        """
+        Evaluates the blackbox in a worker process.
+
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+
+        :return: [float] loss
+        """
+        self.start()
+        return self.__receive(self._pool.apply(_evaluate, (self.__send(params), self.__stream())))
+
+    def __send(self, params):
+        start = time.perf_counter()
+        message = pickle.dumps(params, protocol=pickle.HIGHEST_PROTOCOL)
+        self._stats["time"] += time.perf_counter() - start
+        self._stats["bytes"] += len(message)
+        self._stats["messages"] += 1
+        return message
+
+    def __stream(self):
+        """
+        Spawns the seed stream of the next trial or returns None if the pool is not seeded.
+        """
+        seed_sequence = self._seed_sequence if self._seed_sequence is not None else self._run_seed_sequence
+        if seed_sequence is None:
+            return None
+        return seed_sequence.spawn(1)[0]
+
+    def seed_run(self, seed_sequence):
+        """
+        Sets the SeedSequence the trial streams of a solver run are spawned from, called by the solver at the start of
+        each run. Ignored if the pool was seeded via its seed argument.
+
+        :param seed_sequence: [SeedSequence] seed sequence of the run or None
+        """
+        self._run_seed_sequence = seed_sequence
+
+    def __receive(self, result):
+        answer, worker_time = result
+        start = time.perf_counter()
+        loss = pickle.loads(answer)
+        self._stats["time"] += time.perf_counter() - start + worker_time
+        self._stats["bytes"] += len(answer)
+        return loss
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def map(self, params_list):
+        """
+        Evaluates a list of parameter sets in parallel.
+
+        :param params_list: [list] list of parameter set dicts
+
+        :return: [list] losses
+        """
+        self.start()
+        jobs = [(self.__send(params), self.__stream()) for params in params_list]
+        return [self.__receive(result) for result in self._pool.map(_evaluate_job, jobs, chunksize=1)]
+
+    def start(self):
+        """
+        Starts the worker processes, does nothing if the pool is already running.
+        """
+        if self._pool is not None:
+            return
+        if self._payload is None:
+            blackbox = self._blackbox
+            if isinstance(blackbox, BlackboxFunction) and blackbox.callback_func is not None:
+                # the callback is called in the solver process only and must not be shipped to the workers
+                blackbox = copy.copy(blackbox)
+                blackbox._callback_func = None
+            start = time.perf_counter()
+            self._payload = pickle.dumps(blackbox, protocol=pickle.HIGHEST_PROTOCOL)
+            self._stats["setup_time"] += time.perf_counter() - start
+            self._stats["setup_bytes"] += len(self._payload)
+        context = multiprocessing.get_context(self._start_method)
+        self._pool = context.Pool(processes=self._workers, initializer=_init_worker, initargs=(self._payload,))
+        LOG.debug("started worker pool with {} processes, blackbox payload {} bytes".format(self._workers, len(self._payload)))
+
+    def close(self):
+        """
+        Shuts down the worker processes.
+        """
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+    @property
+    def blackbox(self):
+        """
+        The blackbox evaluated by the workers.
+
+        :return: [object] BlackboxFunction instance or function
+        """
+        return self._blackbox
+
+    @property
+    def callback_func(self):
+        """
+        The callback_func of the blackbox, called in the solver process.
+
+        :return: [object] callback_func or None
+        """
+        if isinstance(self._blackbox, BlackboxFunction):
+            return self._blackbox.callback_func
+        return None
+
+    @property
+    def serialization_stats(self):
+        """
+        Accumulated serialization statistics. The dict keeps the bytes and seconds spent for serializing the blackbox
+        once (setup_bytes, setup_time) and the number of trial messages with their total bytes and (de)serialization
+        seconds (messages, bytes, time).
+
+        :return: [dict] serialization statistics
+        """
+        return dict(self._stats)
+
+    @property
+    def workers(self):
+        """
+        Number of worker processes.
+
+        :return: [int] number of workers
+        """
+        return self._workers
@@ -0,0 +1,70 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+"""
+Hyppopy command line tools, usage:
+
+hyppopy merge -o merged.jsonl shard_0.jsonl shard_1.jsonl ...
+python -m hyppopy merge -o merged.csv --top-k 5 --type kernel=str shard_*.csv
+"""
+
+import sys
+import argparse
+
+
+# hyperparameter types accepted by merge --type
+TYPES = {"int": int, "float": float, "str": str, "bool": bool}
+
+
+def merge(args):
+    from hyppopy.TrialMerge import merge_trials
+    types = None
+    if args.type:
+        types = {}
+        for entry in args.type:
+            name, _, dtype = entry.partition("=")
+            if dtype not in TYPES:
+                print("invalid --type {}, expected name=type with type one of {}".format(entry, ", ".join(TYPES)))
+                return 1
+            types[name] = TYPES[dtype]
+    summary = merge_trials(args.sources, args.output, top_k=args.top_k, deduplicate=not args.keep_duplicates,
+                           hyperparameter=types)
+    print("merged {} trials into {}, {} duplicates dropped".format(summary['trials'], args.output, summary['duplicates']))
+    if summary['best'] is None:
+        print("no successful trial found")
+        return 0
+    print("\nTop {} trials:".format(len(summary['top_k'])))
+    for trial in summary['top_k']:
+        print(" - tid {}\tloss {}\t{}".format(trial['tid'], trial['loss'], trial['params']))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="hyppopy", description="Hyppopy command line tools")
+    commands = parser.add_subparsers(dest="command")
+    merge_parser = commands.add_parser("merge", help="merge trial logs or databases of sharded or distributed runs")
+    merge_parser.add_argument("sources", nargs="+", help="trial logs (.jsonl or .csv) or trial databases (.db)")
+    merge_parser.add_argument("-o", "--output", required=True, help="merged trial log, format by extension")
+    merge_parser.add_argument("-k", "--top-k", type=int, default=10, help="number of best trials reported")
+    merge_parser.add_argument("--keep-duplicates", action="store_true", help="keep repeated parameter sets")
+    merge_parser.add_argument("--type", action="append", metavar="NAME=TYPE",
+                              help="hyperparameter type (int, float, str or bool) values are cast to, repeatable")
+    merge_parser.set_defaults(func=merge)
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
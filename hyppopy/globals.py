@@ -28,6 +28,8 @@ SUPPORTED_DOMAINS = ["uniform", "normal", "loguniform", "categorical"]
 SUPPORTED_DTYPES = ["int", "float", "str"]
 
 DEFAULTGRIDFREQUENCY = 10
+GRIDSIZEWARNING = 10**9
+MAXRESAMPLINGATTEMPTS = 100
 
 LOGFILENAME = os.path.join(ROOT, '{}_log.log'.format(LIBNAME))
 DEBUGLEVEL = logging.DEBUG
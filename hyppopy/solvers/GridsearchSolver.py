@@ -12,18 +12,47 @@
 
 import os
 import logging
+import itertools
 import warnings
 import numpy as np
 from pprint import pformat
 from scipy.stats import norm
-from itertools import product
-from hyppopy.globals import DEBUGLEVEL, DEFAULTGRIDFREQUENCY
+from hyppopy.GridIndex import GridIndex, SparseGridIndex, parse_shard
+from hyppopy.globals import DEBUGLEVEL, DEFAULTGRIDFREQUENCY, GRIDSIZEWARNING
 from hyppopy.solvers.HyppopySolver import HyppopySolver
 
 LOG = logging.getLogger(os.path.basename(__file__))
 LOG.setLevel(DEBUGLEVEL)
 
 
+def _to_axis(values, dtype):
+    """
+    Converts axis values into a list of dtype, int values are truncated.
+
+    :param values: [ndarray] axis values
+    :param dtype: data type
+
+    :return: [list] axis range
+    """
+    if dtype is int:
+        return values.astype(int).tolist()
+    elif dtype is float:
+        return values.tolist()
+    raise AssertionError("dtype {} not supported for uniform sampling!".format(dtype))
+
+
+def unique_axis(values):
+    """
+    Removes duplicate values of an axis, the first occurence is kept. Values of different type are never equal, e.g. 1
+    and True are kept both.
+
+    :param values: [list] axis values
+
+    :return: [list] axis values without duplicates
+    """
+    return [value for _, value in dict.fromkeys((type(value), value) for value in values)]
+
+
 def get_uniform_axis_sample(a, b, N, dtype):
     """
     Returns a uniform sample x(n) in the range [a,b] sampled at N pojnts
@@ -37,12 +66,7 @@ def get_uniform_axis_sample(a, b, N, dtype):
     """
     assert a < b, "condition a < b violated!"
     assert isinstance(N, int), "condition N of type int violated!"
-    if dtype is int:
-        return list(np.linspace(a, b, N).astype(int))
-    elif dtype is float:
-        return list(np.linspace(a, b, N))
-    else:
-        raise AssertionError("dtype {} not supported for uniform sampling!".format(dtype))
+    return _to_axis(np.linspace(a, b, N), dtype)
 
 
 def get_norm_cdf(N):
@@ -83,17 +107,7 @@ def get_gaussian_axis_sample(a, b, N, dtype):
     """
     assert a < b, "condition a < b violated!"
     assert isinstance(N, int), "condition N of type int violated!"
-
-    data = []
-    for n in range(N):
-        x = a + get_norm_cdf(N)[n]*(b-a)
-        if dtype is int:
-            data.append(int(x))
-        elif dtype is float:
-            data.append(x)
-        else:
-            raise AssertionError("dtype {} not supported for uniform sampling!".format(dtype))
-    return data
+    return _to_axis(a + get_norm_cdf(N) * (b - a), dtype)
 
 
 def get_logarithmic_axis_sample(a, b, N, dtype):
@@ -114,20 +128,43 @@ def get_logarithmic_axis_sample(a, b, N, dtype):
     assert isinstance(N, int), "condition N of type int violated!"
 
     # convert input range into exponent range
-    lexp = np.log(a)
-    rexp = np.log(b)
-    exp_range = np.linspace(lexp, rexp, N)
-
-    data = []
-    for n in range(exp_range.shape[0]):
-        x = np.exp(exp_range[n])
-        if dtype is int:
-            data.append(int(x))
-        elif dtype is float:
-            data.append(x)
-        else:
-            raise AssertionError("dtype {} not supported for uniform sampling!".format(dtype))
-    return data
+    return _to_axis(np.exp(np.linspace(np.log(a), np.log(b), N)), dtype)
+
+
+def get_sparse_axis_sample(param, max_level):
+    """
+    Returns the values of an axis of a sparse grid and the level each value first appears on. Level 0 is the center
+    of the axis, level l >= 1 the axis sampled at 2^l + 1 points by the sampler of the domain. Categorical axes have
+    all values on level 0.
+
+    :param param: [dict] input hyperparameter discription
+    :param max_level: [int] finest level of the axis
+
+    :return: [list], [list] distinct axis values and their levels
+    """
+    if param["domain"] == "categorical":
+        values = unique_axis(param["data"])
+        return values, [0] * len(values)
+    samplers = {"uniform": get_uniform_axis_sample,
+                "normal": get_gaussian_axis_sample,
+                "loguniform": get_logarithmic_axis_sample}
+    if param["domain"] not in samplers:
+        msg = "Unknown domain {}".format(param["domain"])
+        LOG.error(msg)
+        raise LookupError(msg)
+    sampler = samplers[param["domain"]]
+    values, levels, seen = [], [], set()
+    for level in range(max_level + 1):
+        samples = sampler(param["data"][0], param["data"][1], 3, param["type"])[1:2] if level == 0 else \
+            sampler(param["data"][0], param["data"][1], 2 ** level + 1, param["type"])
+        for value in samples:
+            # float values of different levels may differ in the last digits only
+            key = float("{:.12g}".format(value))
+            if key not in seen:
+                seen.add(key)
+                values.append(value)
+                levels.append(level)
+    return values, levels
 
 
 class GridsearchSolver(HyppopySolver):
@@ -135,6 +172,18 @@ class GridsearchSolver(HyppopySolver):
     The GridsearchSolver class implements a gridsearch optimization. The gridsearch supports
     categorical, uniform, normal and loguniform sampling. To use the GridsearchSolver, besides
     a range, one must specifiy the number of samples in the domain, e.g. 'data': [0, 1, 100]
+
+    The grid points are addressed by index (see GridIndex), this allows to split the grid over several nodes via the
+    setting shard, e.g. "2/8" runs the third of eight disjoint shards, to resume an interrupted run by skipping the
+    first grid_start points of the shard and to choose the visiting order via grid_order ("sequential", "strided",
+    "random" or "vandercorput"). All shards of a random order need the same seed setting. The setting max_iterations
+    limits the number of points a shard visits, 0 visits all. With the orders "vandercorput" or "random" such a budget
+    limited or interrupted run still covers the whole grid, the van der Corput order visits the grid coarse to fine.
+
+    If the setting grid_mode is "sparse", a Smolyak sparse grid replaces the full tensor product grid. Each numerical
+    axis is sampled hierarchically, level 0 is the axis center, level l the axis sampled at 2^l + 1 points, and only
+    points whose value levels sum up to at most sparse_level are evaluated. A hyperparameter field 'level' limits the
+    finest level of an axis, e.g. for axes of minor importance, the field frequency is ignored in sparse mode.
     """
     def __init__(self, project=None):
         """
@@ -143,6 +192,8 @@ class GridsearchSolver(HyppopySolver):
         :param project: [HyppopyProject] project instance, default=None
         """
         HyppopySolver.__init__(self, project)
+        self._grid_size = None
+        self._nominal_grid_size = None
 
     def define_interface(self):
         """
@@ -152,6 +203,12 @@ class GridsearchSolver(HyppopySolver):
         Both, members and hyperparameter signatures are later get checked, before executing the solver, ensuring
         settings passed fullfill solver needs.
         """
+        self._add_member("shard", str, default="")
+        self._add_member("grid_order", str, default="sequential")
+        self._add_member("grid_start", int, default=0)
+        self._add_member("grid_mode", str, default="full")
+        self._add_member("sparse_level", int, default=3)
+        self._add_member("max_iterations", int, default=0)
         self._add_hyperparameter_signature(name="domain", dtype=str,
                                           options=["uniform", "normal", "loguniform", "categorical"])
         self._add_hyperparameter_signature(name="data", dtype=list)
@@ -181,29 +238,75 @@ class GridsearchSolver(HyppopySolver):
 
         :param searchspace: converted hyperparameter space
         """
-        for x in product(*searchspace[1]):
-            params = {}
-            for name, value in zip(searchspace[0], x):
-                params[name] = value
+        grid = self._grid(searchspace)
+        shard, shards = parse_shard(self.shard)
+        count = max(0, grid.count(shard, shards) - self.grid_start)
+        if self.max_iterations > 0:
+            count = min(count, self.max_iterations)
+        LOG.info("gridsearch visits {} of {} grid points, nominal grid size {}".format(count, grid.size, self._nominal_grid_size))
+        if count >= GRIDSIZEWARNING:
+            warnings.warn("Gridsearch with {} grid points started, consider sharding or fewer grid points!".format(count))
+        for k in itertools.islice(grid.visit(self.grid_order, shard, shards, self.grid_start, self._order_key(shards)), count):
             try:
-                self.loss_function(**params)
+                self.loss_function(**grid.params(k))
             except Exception as e:
-                msg = "internal error in randomsearch execute_solver occured. {}".format(e)
+                msg = "internal error in gridsearch execute_solver occured. {}".format(e)
                 LOG.error(msg)
                 raise BrokenPipeError(msg)
-        self.best = self._trials.argmin
+        if self.best_so_far is None:
+            msg = "No successful trial available!"
+            LOG.error(msg)
+            raise AssertionError(msg)
+        self.best = self.best_so_far["params"]
+
+    def _grid(self, searchspace):
+        """
+        Creates the grid index of a converted searchspace.
+
+        :param searchspace: converted hyperparameter space
+
+        :return: [GridIndex] GridIndex or SparseGridIndex instance
+        """
+        if len(searchspace) > 2:
+            return SparseGridIndex(searchspace[0], searchspace[1], searchspace[2], self.sparse_level)
+        return GridIndex(searchspace[0], searchspace[1])
+
+    def _order_key(self, shards=1):
+        """
+        Returns the key of the random grid order, derived from the seed setting so that all shards share it.
+
+        :param shards: [int] number of shards
+
+        :return: [int] key
+        """
+        if self.grid_order != "random":
+            return 0
+        if shards > 1 and self.seed < 0:
+            msg = "Random grid order with several shards needs a seed setting shared by all shards!"
+            LOG.error(msg)
+            raise AssertionError(msg)
+        if self.seed >= 0:
+            return int(np.random.SeedSequence(self.seed).generate_state(1, np.uint64)[0])
+        return int(self.rng.integers(2**63))
 
     def convert_searchspace(self, hyperparameter):
         """
         The function converts the standard parameter input into a range list depending
-        on the domain. These rangelists are later used with itertools product to create
+        on the domain. These rangelists are later used as GridIndex axes to create
         a paramater space sample of each combination.
 
         :param hyperparameter: [dict] hyperparameter space
 
-        :return: [list] name and range for each parameter space axis
+        :return: [list] name and range for each parameter space axis, in sparse grid mode additionally the levels of
+                 the axis values
         """
         LOG.debug("convert input parameter\n\n\t{}\n".format(pformat(hyperparameter)))
+        if self.grid_mode == "sparse":
+            return self.__convert_sparse(hyperparameter)
+        elif self.grid_mode != "full":
+            msg = "Unknown grid_mode {}, expected full or sparse!".format(self.grid_mode)
+            LOG.error(msg)
+            raise LookupError(msg)
         searchspace = [[], []]
         for name, param in hyperparameter.items():
             if param["domain"] != "categorical" and "frequency" not in param.keys():
@@ -231,4 +334,55 @@ class GridsearchSolver(HyppopySolver):
                                                                   param["data"][1],
                                                                   param["frequency"],
                                                                   param["type"]))
+
+        # int axes of few values and categorical data may contain duplicates multiplying the grid size for nothing
+        self._nominal_grid_size = 1
+        self._grid_size = 1
+        for n, name in enumerate(searchspace[0]):
+            self._nominal_grid_size *= len(searchspace[1][n])
+            if hyperparameter[name]["domain"] == "categorical" or hyperparameter[name]["type"] is int:
+                searchspace[1][n] = unique_axis(searchspace[1][n])
+            self._grid_size *= len(searchspace[1][n])
+        if self._grid_size < self._nominal_grid_size:
+            LOG.info("gridsearch duplicates removed, effective grid size {} of nominal {}".format(self._grid_size, self._nominal_grid_size))
         return searchspace
+
+    def __convert_sparse(self, hyperparameter):
+        """
+        Converts the hyperparameter space into the axes of a sparse grid, see get_sparse_axis_sample. The nominal grid
+        size is the size of the full grid of all axis values.
+
+        :param hyperparameter: [dict] hyperparameter space
+
+        :return: [list] names, axis values and value levels
+        """
+        searchspace = [[], [], []]
+        for name, param in hyperparameter.items():
+            values, levels = get_sparse_axis_sample(param, min(param.get("level", self.sparse_level), self.sparse_level))
+            searchspace[0].append(name)
+            searchspace[1].append(values)
+            searchspace[2].append(levels)
+        grid = SparseGridIndex(searchspace[0], searchspace[1], searchspace[2], self.sparse_level)
+        self._nominal_grid_size = grid.full_size
+        self._grid_size = grid.size
+        LOG.info("sparse grid of level {} with {} points, full grid {} points".format(self.sparse_level, grid.size, grid.full_size))
+        return searchspace
+
+    @property
+    def grid_size(self):
+        """
+        Get the effective number of grid points of the last converted searchspace, i.e. without duplicate axis values.
+
+        :return: [int] grid size
+        """
+        return self._grid_size
+
+    @property
+    def nominal_grid_size(self):
+        """
+        Get the number of grid points of the last converted searchspace given by the axis frequencies and categorical
+        data, including duplicate axis values.
+
+        :return: [int] nominal grid size
+        """
+        return self._nominal_grid_size
@@ -11,15 +11,14 @@
 # See LICENSE
 
 import os
-import copy
 import logging
+import datetime
 import numpy as np
 from pprint import pformat
 from hyperopt import fmin, tpe, hp, STATUS_OK, STATUS_FAIL, Trials
 
 from hyppopy.globals import DEBUGLEVEL
 from hyppopy.solvers.HyppopySolver import HyppopySolver
-from hyppopy.BlackboxFunction import BlackboxFunction
 
 LOG = logging.getLogger(os.path.basename(__file__))
 LOG.setLevel(DEBUGLEVEL)
@@ -35,6 +34,7 @@ class HyperoptSolver(HyppopySolver):
         """
         HyppopySolver.__init__(self, project)
         self._searchspace = None
+        self._hyperopt_trials = None
 
     def define_interface(self):
         """
@@ -65,6 +65,7 @@ class HyperoptSolver(HyppopySolver):
                 if params[name] > p["data"][1]:
                     params[name] = p["data"][1]
         status = STATUS_FAIL
+        book_time = datetime.datetime.now()
         try:
             loss = self.blackbox(**params)
             if loss is not None:
@@ -75,16 +76,7 @@ class HyperoptSolver(HyppopySolver):
             LOG.error("execution of self.blackbox(**params) failed due to:\n {}".format(e))
             status = STATUS_FAIL
             loss = 1e9
-        cbd = copy.deepcopy(params)
-        cbd['iterations'] = self._trials.trials[-1]['tid'] + 1
-        cbd['loss'] = loss
-        cbd['status'] = status
-        cbd['book_time'] = self._trials.trials[-1]['book_time']
-        cbd['refresh_time'] = self._trials.trials[-1]['refresh_time']
-        if isinstance(self.blackbox, BlackboxFunction) and self.blackbox.callback_func is not None:
-            self.blackbox.callback_func(**cbd)
-        if self._visdom_viewer is not None:
-            self._visdom_viewer.update(cbd)
+        self._record_trial(params, loss, 'ok' if status == STATUS_OK else 'failed', book_time, datetime.datetime.now())
         return {'loss': loss, 'status': status}
 
     def execute_solver(self, searchspace):
@@ -95,19 +87,29 @@ class HyperoptSolver(HyppopySolver):
         :param searchspace: converted hyperparameter space
         """
         LOG.debug("execute_solver using solution space:\n\n\t{}\n".format(pformat(searchspace)))
-        self.trials = Trials()
+        self._hyperopt_trials = Trials()
 
         try:
             self.best = fmin(fn=self.loss_function,
                              space=searchspace,
                              algo=tpe.suggest,
                              max_evals=self.max_iterations,
-                             trials=self.trials)
+                             trials=self._hyperopt_trials,
+                             rstate=self.rng)
         except Exception as e:
             msg = "internal error in hyperopt.fmin occured. {}".format(e)
             LOG.error(msg)
             raise BrokenPipeError(msg)
 
+    @property
+    def hyperopt_trials(self):
+        """
+        The hyperopt Trials object of the last run, the optimization history is available via trials as well.
+
+        :return: [Trials] hyperopt Trials instance
+        """
+        return self._hyperopt_trials
+
     def convert_searchspace(self, hyperparameter):
         """
         This function gets the unified hyppopy-like parameterspace description as input and, if necessary, should
@@ -17,10 +17,16 @@ import copy
 import types
 import datetime
 import numpy as np
-import pandas as pd
-from hyperopt import Trials
 from hyppopy.globals import *
 from hyppopy.VisdomViewer import VisdomViewer
+from hyppopy.LossCache import LossCache
+from hyppopy.TopTrials import TopTrials
+from hyppopy.PerformanceCurves import cumulative_minimum, cumulative_minimum_over_time
+from hyppopy.TrialLog import TrialLog
+from hyppopy.TrialDatabase import TrialDatabase
+from hyppopy.TrialStore import TrialStore, STATUS
+from hyppopy.WorkerPool import WorkerPool
+from hyppopy.CommandBlackbox import CommandBlackbox
 from hyppopy.HyppopyProject import HyppopyProject
 from hyppopy.BlackboxFunction import BlackboxFunction
 from hyppopy.FunctionSimulator import FunctionSimulator
@@ -88,16 +94,34 @@ class HyppopySolver(object):
         """
         self._idx = None                        # current iteration counter
         self._best = None                       # best parameter set
-        self._trials = None                     # trials object (hyppopy uses the Trials object from hyperopt)
+        self._trials = None                     # TrialStore instance keeping the optimization history
         self._blackbox = None                   # blackbox function (either a function or a BlackboxFunction instance)
         self._total_duration = None             # keep track of the solver's running time
         self._solver_overhead = None            # store time overhead of the solver, i.e. total time minus time in blackbox
         self._time_per_iteration = None         # mean time per iterration
         self._accumulated_blackbox_time = None  # total time the solver was in the blackbox function
+        self._serialization_stats = None        # serialization costs per trial if the blackbox runs in other processes
         self._visdom_viewer = None              # visdom viewer instance
+        self._results = None                    # preallocated results columns and DataFrame of get_results
+        self._loss_cache = None                 # approximate loss cache, only used if approx_cache_radius > 0
+        self._trial_sinks = []                  # TrialLog and TrialDatabase instances each finished trial is written to
+        self._top_trials = None                 # incrementally updated best trial and top_k_size best trials
+        self._seed_sequence = None              # SeedSequence set from outside, e.g. a spawned child per repeat or shard
+        self._rng = None                        # random generator of the current run, created from the seed setting
 
         self._child_members = {}                # dict keeping track of settings defined by child solver
         self._hopt_signatures = {}              # dict keeping track of hyperparameter signatures defined by child solver
+        self._add_member("approx_cache_radius", float, default=0.0)  # optional settings available for all solvers
+        self._add_member("trial_log", str, default="")
+        self._add_member("trial_log_flush_interval", float, default=1.0)
+        self._add_member("trial_log_fsync_interval", float, default=60.0)
+        self._add_member("trial_db", str, default="")
+        self._add_member("trial_db_study", str, default="")
+        self._add_member("trial_db_batch_size", int, default=100)
+        self._add_member("max_trials_in_memory", int, default=0)
+        self._add_member("trial_spill_dir", str, default="")
+        self._add_member("top_k_size", int, default=10)
+        self._add_member("seed", int, default=-1)
         self.define_interface()                 # child define interface function is called to define settings and hyperparameter signatures
 
         if project is not None:
@@ -156,6 +180,8 @@ class HyppopySolver(object):
         When designing your child solver class you need to implement the define_interface abstract method where you can
         call _add_member to define custom solver options that are automatically converted to class attributes.
 
+        If a default value is given, the option is optional and the default is used when the project does not define it.
+
         :param name: [str] option name
         :param dtype: [type] option data type
         :param value: [object] option value
@@ -208,8 +234,11 @@ class HyppopySolver(object):
                             raise LookupError(msg)
 
         # check child members
-        for name in self._child_members.keys():
+        for name, member in self._child_members.items():
             if name not in self.project.__dict__.keys():
+                if member["default"] is not None:
+                    self.__dict__[name] = member["default"]
+                    continue
                 msg = "Missing settings field {}!".format(name)
                 LOG.error(msg)
                 raise LookupError(msg)
@@ -219,92 +248,161 @@ class HyppopySolver(object):
         """
         Evaluates all time statistic values available
         """
-        dts = []
-        for trial in self._trials.trials:
-            if 'book_time' in trial.keys() and 'refresh_time' in trial.keys():
-                dt = trial['refresh_time'] - trial['book_time']
-                dts.append(dt.total_seconds())
+        dts = self._trials.durations
+        dts = dts[~np.isnan(dts)]
         self._time_per_iteration = np.mean(dts) * 1e3
         self._accumulated_blackbox_time = np.sum(dts) * 1e3
         tmp = self.total_duration - self._accumulated_blackbox_time
         self._solver_overhead = int(np.round(100.0 / (self.total_duration + 1e-12) * tmp))
 
+    def __serialization_snapshot(self):
+        """
+        Returns the current serialization statistics of the blackbox if it is evaluated in other processes.
+
+        :return: [dict] serialization statistics or None
+        """
+        if isinstance(self.blackbox, (WorkerPool, CommandBlackbox)):
+            return self.blackbox.serialization_stats
+        return None
+
+    def __compute_serialization_statistics(self, start_stats):
+        """
+        Evaluates the serialization costs of the last run by comparing the blackbox serialization statistics before
+        and after the run.
+
+        :param start_stats: [dict] serialization statistics before the run
+        """
+        end_stats = self.__serialization_snapshot()
+        if start_stats is None or end_stats is None:
+            self._serialization_stats = None
+            return
+        n = max(end_stats["messages"] - start_stats["messages"], 1)
+        self._serialization_stats = {"bytes_per_trial": (end_stats["bytes"] - start_stats["bytes"]) / n,
+                                     "time_per_trial": (end_stats["time"] - start_stats["time"]) / n * 1e3,
+                                     "setup_bytes": end_stats["setup_bytes"],
+                                     "setup_time": end_stats["setup_time"] * 1e3}
+
     def loss_function(self, **params):
         """
         This function is called each iteration with a selected parameter set. The parameter set selection is driven by
         the solver lib itself. The purpose of this function is to take care of the iteration reporting and the calling
         of the callback_func is available. As a developer you might want to overwrite this function completely (e.g.
-        HyperoptSolver) but then you need to take care of iteration reporting by yourself. The alternative is to only
-        implement loss_function_call (e.g. OptunitySolver).
+        HyperoptSolver) but then you need to take care of iteration reporting by yourself using _record_trial. The
+        alternative is to only implement loss_function_call (e.g. OptunitySolver).
+        If the setting approx_cache_radius is > 0, the loss of a previously evaluated parameter set closer than this
+        radius in normalized parameter space is returned instead of calling the blackbox function. Such trials are
+        marked as cached.
 
         :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
 
         :return: [float] loss
         """
-        self._idx += 1
-        vals = {}
-        idx = {}
-        for key, value in params.items():
-            vals[key] = [value]
-            idx[key] = [self._idx]
-        trial = {'tid': self._idx,
-                 'result': {'loss': None, 'status': 'ok'},
-                 'misc': {
-                     'tid': self._idx,
-                     'idxs': idx,
-                     'vals': vals
-                 },
-                 'book_time': datetime.datetime.now(),
-                 'refresh_time': None
-                 }
+        trial_params = dict(params)
+        cached = False
+        book_time = datetime.datetime.now()
         try:
-            loss = self.loss_function_call(params)
-            trial['result']['loss'] = loss
-            trial['result']['status'] = 'ok'
-            if loss is np.nan:
-                trial['result']['status'] = 'failed'
+            loss = None
+            if self._loss_cache is not None:
+                loss = self._loss_cache.query(params)
+                cached = loss is not None
+            if loss is None:
+                loss = self.loss_function_call(params)
+                if self._loss_cache is not None and loss is not None and not np.isnan(loss):
+                    self._loss_cache.add(params, loss)
+            status = 'ok'
+            if loss is None or np.isnan(loss):
+                status = 'failed'
         except Exception as e:
             LOG.error("computing loss failed due to:\n {}".format(e))
             loss = np.nan
-            trial['result']['loss'] = np.nan
-            trial['result']['status'] = 'failed'
-        trial['refresh_time'] = datetime.datetime.now()
-        self._trials.trials.append(trial)
+            status = 'failed'
+        self._record_trial(trial_params, loss, status, book_time, datetime.datetime.now(), cached)
+        return loss
+
+    def _record_trial(self, params, loss, status, book_time, refresh_time, cached=False):
+        """
+        Stores a finished trial in the trial store and takes care of the iteration reporting, i.e. calling the
+        callback_func and updating the viewer. Solvers overwriting loss_function need to call this function once per
+        trial.
+
+        :param params: [dict] hyperparameter space sample e.g. {'p1': 0.123, 'p2': 3.87, ...}
+        :param loss: [float] loss
+        :param status: [str] 'ok' or 'failed'
+        :param book_time: [datetime] trial start
+        :param refresh_time: [datetime] trial end
+        :param cached: [bool] True if the loss was taken from the loss cache, default=False
+        """
+        self._idx += 1
+        self._trials.append(params, loss, status, book_time, refresh_time, cached, tid=self._idx)
+        for sink in self._trial_sinks:
+            sink.write(self._idx, params, loss, status, book_time, refresh_time, cached)
+        if status == 'ok':
+            self._top_trials.add(loss, self._idx, len(self._trials) - 1)
         cbd = copy.deepcopy(params)
         cbd['iterations'] = self._idx
         cbd['loss'] = loss
-        cbd['status'] = trial['result']['status']
-        cbd['book_time'] = trial['book_time']
-        cbd['refresh_time'] = trial['refresh_time']
-        if isinstance(self.blackbox, BlackboxFunction) and self.blackbox.callback_func is not None:
+        cbd['status'] = status
+        cbd['book_time'] = book_time
+        cbd['refresh_time'] = refresh_time
+        if isinstance(self.blackbox, (BlackboxFunction, WorkerPool, CommandBlackbox)) and self.blackbox.callback_func is not None:
             self.blackbox.callback_func(**cbd)
         if self._visdom_viewer is not None:
-            self._visdom_viewer.update(cbd)
-        return loss
+            self._visdom_viewer.update(cbd, self.best_so_far)
 
     def run(self, print_stats=True):
         """
-        This function starts the optimization process.
+        This function starts the optimization process. If the setting trial_log is set to a file path, each finished
+        trial is appended to this file during the run (see TrialLog), the settings trial_log_flush_interval and
+        trial_log_fsync_interval define the max seconds between two flushes or fsyncs. If the setting trial_db is set
+        to a file path, the trials are additionally inserted into this SQLite database in batches of
+        trial_db_batch_size trials, tagged with trial_db_study (see TrialDatabase). If the setting
+        max_trials_in_memory is > 0, older trials are spilled to memory-mapped files in trial_spill_dir, or the system
+        temp directory if not set, as soon as more trials are recorded (see TrialStore). If the setting seed is >= 0,
+        or a seed_sequence was set, all random decisions of the solver are drawn from rng and the run is reproducible.
+        A WorkerPool blackbox without own seed gets a stream spawned from seed_sequence for the trials of the run.
 
         :param print_stats: [bool] en- or disable console output
         """
         self._idx = 0
-        self.trials = Trials()
+        seed_sequence = self.seed_sequence
+        self._rng = np.random.default_rng(seed_sequence)
+        if isinstance(self.blackbox, WorkerPool):
+            self.blackbox.seed_run(seed_sequence.spawn(1)[0])
+        self.trials = TrialStore(max_trials_in_memory=self.max_trials_in_memory if self.max_trials_in_memory > 0 else None,
+                                 spill_dir=self.trial_spill_dir if self.trial_spill_dir else None,
+                                 hyperparameter=self.project.hyperparameter)
+        self._top_trials = TopTrials(self.top_k_size)
+        self._loss_cache = None
+        if self.approx_cache_radius > 0:
+            self._loss_cache = LossCache(self.project.hyperparameter, self.approx_cache_radius)
 
         start_time = datetime.datetime.now()
+        serialization_stats = self.__serialization_snapshot()
         try:
             search_space = self.convert_searchspace(self.project.hyperparameter)
         except Exception as e:
             msg = "Failed to convert searchspace, error: {}".format(e)
             LOG.error(msg)
             raise AssertionError(msg)
+        self._trial_sinks = []
+        if self.trial_log:
+            self._trial_sinks.append(TrialLog(self.trial_log, self.project.hyperparameter.keys(),
+                                              self.trial_log_flush_interval, self.trial_log_fsync_interval))
+        if self.trial_db:
+            self._trial_sinks.append(TrialDatabase(self.trial_db, self.project.hyperparameter, self.trial_db_study,
+                                                   self.trial_db_batch_size))
         try:
             self.execute_solver(search_space)
         except Exception as e:
             msg = "Failed to execute solver, error: {}".format(e)
             LOG.error(msg)
             raise AssertionError(msg)
+        finally:
+            for sink in self._trial_sinks:
+                sink.close()
+            self._trial_sinks = []
         end_time = datetime.datetime.now()
+        self.__compute_serialization_statistics(serialization_stats)
         dt = end_time - start_time
         days = divmod(dt.total_seconds(), 86400)
         hours = divmod(days[1], 3600)
@@ -316,31 +414,176 @@ class HyppopySolver(object):
             self.print_best()
             self.print_timestats()
 
-    def get_results(self):
+    def get_results(self, format="pandas"):
+        """
+        This function returns a complete optimization history and a dict with the optimal parameter set. The history
+        has the columns duration (ms), losses, status (True if ok), cached (True if the loss was taken from the
+        approximate loss cache) and one column per hyperparameter. Depending on format the history is returned as
+
+        - "pandas": pandas DataFrame (data manipulation and analysis). The result columns are cached and only
+                    extended by the trials added since the last call, the DataFrame wraps them without copying, this
+                    keeps get_results cheap when called periodically during a run, e.g. from a callback. The returned
+                    DataFrame shares its data with subsequent calls and should be copied before modifying it.
+        - "numpy": NumPy structured array, categorical hyperparameters are stored as str or object fields.
+        - "arrow": pyarrow Table built from the internal columns without copying the numerical columns where
+                   possible, categorical hyperparameters become dictionary arrays.
+
+        pandas and pyarrow are optional dependencies (pip install hyppopy[pandas] or hyppopy[arrow]) and only imported
+        when requested.
+
+        :param format: [str] "pandas", "numpy" or "arrow", default="pandas"
+
+        :return: [object], [dict] history and optimal parameter set
+        """
+        assert isinstance(self.trials, TrialStore), "Precondition violation, wrong trials type! Maybe solver was not yet executed?"
+        if format == "pandas":
+            return self.__results_pandas(), self.best
+        if format == "numpy":
+            return self.__results_numpy(), self.best
+        if format == "arrow":
+            return self.__results_arrow(), self.best
+        msg = "Unknown results format {}, expected pandas, numpy or arrow!".format(format)
+        LOG.error(msg)
+        raise LookupError(msg)
+
+    def __results_pandas(self):
         """
-        This function returns a complete optimization history as pandas DataFrame (data manipulation and analysis) and 
-        a dict with the optimal parameter set.
+        Returns the results DataFrame. The result columns are kept in preallocated arrays whose capacity is doubled
+        when full, only the trials added since the last call are written and the DataFrame wraps the filled part of
+        the arrays without copying, so periodic calls cost O(number of new trials). An array is reallocated with a
+        wider dtype if the new values need one, e.g. after the TrialStore converted an int column to float, and is
+        rebuilt from the TrialStore if the kind of its hyperparameter column changed.
+
+        :return: [DataFrame] history
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            msg = "get_results(format='pandas') requires pandas, install it via pip install pandas or use format='numpy'!"
+            LOG.error(msg)
+            raise ImportError(msg)
+        size = len(self.trials)
+        if self._results is None or self._results["trials"] is not self.trials:
+            self._results = {"trials": self.trials, "size": 0, "columns": {}, "kinds": {}, "frame": None}
+        cache = self._results
+        if cache["frame"] is not None and cache["size"] == size:
+            return cache["frame"]
+        columns = cache["columns"]
+        kinds = {name: self.trials.kind(name) for name in self.trials.names}
+        for name, values in self.__results_columns(cache["size"], size).items():
+            if name not in columns or kinds.get(name) != cache["kinds"].get(name):
+                # columns appearing later, e.g. the hyperparameters of the first trial, or columns whose kind changed
+                # are filled for all rows once
+                values = self.__results_columns(0, size)[name]
+                columns[name] = np.empty(max(size, 1), dtype=values.dtype)
+                columns[name][:size] = values
+                continue
+            dtype = np.result_type(columns[name].dtype, values.dtype)
+            if len(columns[name]) < size or dtype != columns[name].dtype:
+                grown = np.empty(max(size, 2 * len(columns[name])) if len(columns[name]) < size else len(columns[name]), dtype=dtype)
+                grown[:cache["size"]] = columns[name][:cache["size"]]
+                columns[name] = grown
+            columns[name][cache["size"]:size] = values
+        cache["kinds"] = kinds
+        cache["size"] = size
+        cache["frame"] = pd.DataFrame({name: column[:size] for name, column in columns.items()}, copy=False)
+        return cache["frame"]
+
+    def __results_numpy(self):
+        """
+        Returns the history as structured array.
+
+        :return: [ndarray] history
+        """
+        columns = self.__results_columns(0, len(self.trials))
+        dtypes = []
+        for name, values in columns.items():
+            if values.dtype == object and all(isinstance(value, str) for value in values):
+                values = columns[name] = values.astype(str)
+            dtypes.append((name, values.dtype))
+        results = np.empty(len(self.trials), dtype=dtypes)
+        for name, values in columns.items():
+            results[name] = values
+        return results
+
+    def __results_arrow(self):
+        """
+        Returns the history as pyarrow Table.
+
+        :return: [Table] history
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            msg = "get_results(format='arrow') requires pyarrow, install it via pip install pyarrow!"
+            LOG.error(msg)
+            raise ImportError(msg)
+        columns = {'duration': pa.array(self.trials.durations * 1e3),
+                   'losses': pa.array(self.trials.losses),
+                   'status': pa.array(self.trials.ok),
+                   'cached': pa.array(self.trials.cached)}
+        for name in self.trials.names:
+            if self.trials.kind(name) == 'category':
+                codes, categories = self.trials.codes(name)
+                columns[name] = pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), pa.array(categories))
+            else:
+                columns[name] = pa.array(self.trials.column(name))
+        return pa.table(columns)
+
+    def __results_columns(self, start, stop):
+        """
+        Collects the result columns of a trial range.
+
+        :param start: [int] first trial row
+        :param stop: [int] row after the last trial row
+
+        :return: [dict] results column dict
+        """
+        results = {'duration': (self.trials.field('refresh_time', start, stop) - self.trials.field('book_time', start, stop)) * 1e3,
+                   'losses': np.array(self.trials.field('loss', start, stop)),
+                   'status': self.trials.field('status', start, stop) == STATUS.index('ok'),
+                   'cached': np.array(self.trials.field('cached', start, stop))}
+        for name in self.trials.names:
+            results[name] = np.array(self.trials.column(name, start, stop))
+        return results
+
+    def top_k(self, k=None):
+        """
+        Returns the k successful trials with the lowest loss ordered by ascending loss, e.g. to be used in a callback
+        during the run. Up to top_k_size trials are kept in an incrementally updated heap, larger k are computed from
+        the trial history.
+
+        :param k: [int] number of trials, default=None uses the setting top_k_size
+
+        :return: [list] list of dicts {'tid': ..., 'loss': ..., 'params': {...}}
+        """
+        if self._top_trials is None:
+            return []
+        if k is None:
+            k = self._top_trials.k
+        if k <= self._top_trials.k:
+            entries = self._top_trials.sorted()[:k]
+        else:
+            losses = np.where(self._trials.ok, self._trials.losses, np.nan)
+            rows = [row for row in np.argsort(losses, kind='stable')[:k] if not np.isnan(losses[row])]
+            entries = [(losses[row], self._trials.field('tid', row, row + 1)[0], row) for row in rows]
+        return [{'tid': int(tid), 'loss': float(loss), 'params': self._trials.get_params(row)} for loss, tid, row in entries]
 
-        :return: [DataFrame], [dict] history and optimal parameter set
+    def best_so_far_curve(self, time_grid=None):
         """
-        assert isinstance(self.trials, Trials), "Precondition violation, wrong trials type! Maybe solver was not yet executed?"
-        results = {'duration': [], 'losses': [], 'status': []}
-        pset = self.trials.trials[0]['misc']['vals']
-        for p in pset.keys():
-            results[p] = []
+        Returns the anytime-performance curve of the run, i.e. the best loss reached after each iteration or, if a time
+        grid is given, until each time point in seconds since the first trial started. Failed trials are ignored, see
+        PerformanceCurves for regret and time-to-target measures.
 
-        for n, trial in enumerate(self.trials.trials):
-            t1 = trial['book_time']
-            t2 = trial['refresh_time']
-            results['duration'].append((t2 - t1).microseconds / 1000.0)
-            results['losses'].append(trial['result']['loss'])
-            results['status'].append(trial['result']['status'] == 'ok')
-            losses = np.array(results['losses'])
-            results['losses'] = list(losses)
-            pset = trial['misc']['vals']
-            for p in pset.items():
-                results[p[0]].append(p[1][0])
-        return pd.DataFrame.from_dict(results), self.best
+        :param time_grid: [ndarray] time points in seconds, default=None returns the curve over iterations
+
+        :return: [ndarray] best loss per iteration or time point
+        """
+        assert isinstance(self.trials, TrialStore), "Precondition violation, wrong trials type! Maybe solver was not yet executed?"
+        if time_grid is None:
+            return cumulative_minimum(self.trials.losses, self.trials.ok)
+        times = self.trials.refresh_time - np.nanmin(self.trials.book_time) if len(self.trials) > 0 else self.trials.refresh_time
+        return cumulative_minimum_over_time(self.trials.losses, times, time_grid, self.trials.ok)
 
     def print_best(self):
         """
@@ -352,7 +595,7 @@ class HyppopySolver(object):
         print("#" * 40)
         for name, value in self.best.items():
             print(" - {}\t:\t{}".format(name, value))
-        print("\n - number of iterations\t:\t{}".format(self.trials.trials[-1]['tid']+1))
+        print("\n - number of iterations\t:\t{}".format(len(self.trials)))
         print(" - total time\t:\t{}d:{}h:{}m:{}s:{}ms".format(self._total_duration[0],
                                                               self._total_duration[1],
                                                               self._total_duration[2],
@@ -376,6 +619,13 @@ class HyppopySolver(object):
                                                            self._total_duration[4]))
         print("#" * 40)
         print(" - solver overhead: {}%".format(self.solver_overhead))
+        if self.serialization_stats is not None:
+            print(" - serialization per iteration: {}ms, {} bytes".format(
+                int(self.serialization_stats["time_per_trial"]*1e4)/10000,
+                int(self.serialization_stats["bytes_per_trial"])))
+            print(" - blackbox serialization: {}ms, {} bytes".format(
+                int(self.serialization_stats["setup_time"]*1e4)/10000,
+                self.serialization_stats["setup_bytes"]))
 
     def start_viewer(self, port=8097, server="http://localhost"):
         """
@@ -423,7 +673,7 @@ class HyppopySolver(object):
         """
         Get the BlackboxFunction object.
 
-        :return: [object] BlackboxFunction instance or function
+        :return: [object] BlackboxFunction, WorkerPool, CommandBlackbox instance or function
         """
         return self._blackbox
 
@@ -431,11 +681,13 @@ class HyppopySolver(object):
     def blackbox(self, value):
         """
         Set the BlackboxFunction wrapper class encapsulating the loss function or a function accepting a hyperparameter set
-        and returning a float.
+        and returning a float. A WorkerPool can be set to evaluate the blackbox in persistent worker processes, a
+        CommandBlackbox to evaluate an external command line tool.
 
         :return: [object] pointer to blackbox_func
         """
-        if isinstance(value, types.FunctionType) or isinstance(value, BlackboxFunction) or isinstance(value, FunctionSimulator):
+        if isinstance(value, types.FunctionType) or isinstance(value, BlackboxFunction) or isinstance(value, FunctionSimulator) \
+                or isinstance(value, WorkerPool) or isinstance(value, CommandBlackbox):
             self._blackbox = value
         else:
             self._blackbox = None
@@ -466,21 +718,80 @@ class HyppopySolver(object):
             raise TypeError(msg)
         self._best = value
 
+    @property
+    def best_so_far(self):
+        """
+        Get the best successful trial recorded so far, updated with each trial during the run.
+
+        :return: [dict] {'tid': ..., 'loss': ..., 'params': {...}} or None if there is no successful trial yet
+        """
+        if self._top_trials is None or self._top_trials.best is None:
+            return None
+        loss, tid, row = self._top_trials.best
+        return {'tid': tid, 'loss': loss, 'params': self._trials.get_params(row)}
+
+    @property
+    def seed_sequence(self):
+        """
+        Get the SeedSequence the random generator of a run is created from. This is a copy of the sequence set via the
+        setter, a sequence of the seed setting if seed >= 0 or a sequence with fresh OS entropy otherwise. Independent
+        streams, e.g. for workers or shards, are derived via seed_sequence.spawn(n).
+
+        :return: [SeedSequence] seed sequence
+        """
+        if self._seed_sequence is not None:
+            return np.random.SeedSequence(self._seed_sequence.entropy, spawn_key=self._seed_sequence.spawn_key,
+                                          pool_size=self._seed_sequence.pool_size)
+        if self.seed is not None and self.seed >= 0:
+            return np.random.SeedSequence(self.seed)
+        return np.random.SeedSequence()
+
+    @seed_sequence.setter
+    def seed_sequence(self, value):
+        """
+        Set a SeedSequence used instead of the seed setting, e.g. a child spawned for a repeat or shard.
+
+        :param value: [SeedSequence] seed sequence or None
+        """
+        if value is not None and not isinstance(value, np.random.SeedSequence):
+            msg = "Input error, seed_sequence of type: {} not allowed!".format(type(value))
+            LOG.error(msg)
+            raise TypeError(msg)
+        self._seed_sequence = value
+
+    @property
+    def rng(self):
+        """
+        Get the random generator of the current run, solvers draw all random decisions from it.
+
+        :return: [numpy.random.Generator] random generator, None before the first run
+        """
+        return self._rng
+
+    @property
+    def seeded(self):
+        """
+        True if the runs are reproducible, i.e. the seed setting is >= 0 or a seed_sequence was set.
+
+        :return: [bool] seeded
+        """
+        return self._seed_sequence is not None or (self.seed is not None and self.seed >= 0)
+
     @property
     def trials(self):
         """
-        Get the Trials instance.
+        Get the TrialStore instance.
 
-        :return: [object] Trials instance
+        :return: [TrialStore] TrialStore instance
         """
         return self._trials
 
     @trials.setter
     def trials(self, value):
         """
-        Set the Trials object.
+        Set the TrialStore object.
 
-        :param value: [object] Trials instance
+        :param value: [TrialStore] TrialStore instance
         """
         self._trials = value
 
@@ -515,6 +826,17 @@ class HyppopySolver(object):
             self.__compute_time_statistics()
         return self._time_per_iteration
 
+    @property
+    def serialization_stats(self):
+        """
+        Get the serialization costs of the last run if the blackbox is a WorkerPool or CommandBlackbox, i.e. mean
+        bytes and milliseconds per trial (bytes_per_trial, time_per_trial) and the bytes and milliseconds spent for
+        shipping the blackbox to the workers once (setup_bytes, setup_time).
+
+        :return: [dict] serialization statistics or None
+        """
+        return self._serialization_stats
+
     @property
     def accumulated_blackbox_time(self):
         """
@@ -92,7 +92,8 @@ class OptunaSolver(HyppopySolver):
         self._searchspace = searchspace
 
         try:
-            study = optuna.create_study()
+            seed = int(self.rng.integers(2**31)) if self.seeded else None
+            study = optuna.create_study(sampler=optuna.samplers.TPESampler(seed=seed))
             study.optimize(self.trial_cache, n_trials=self.max_iterations)
             self.best = study.best_trial.params
         except Exception as e:
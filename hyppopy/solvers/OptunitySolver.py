@@ -11,6 +11,7 @@
 # See LICENSE
 
 import os
+import random
 import logging
 import optunity
 from pprint import pformat
@@ -70,6 +71,9 @@ class OptunitySolver(HyppopySolver):
         :param searchspace: converted hyperparameter space
         """
         LOG.debug("execute_solver using solution space:\n\n\t{}\n".format(pformat(searchspace)))
+        if self.seeded:
+            # optunity draws from the global random module and offers no seed argument
+            random.seed(int(self.rng.integers(2**63)))
         try:
             self.best, _, _ = optunity.minimize_structured(f=self.loss_function,
                                                            num_evals=self.max_iterations,
@@ -10,81 +10,271 @@
 #
 # See LICENSE
 
-__all__ = ['HaltonSequenceGenerator', 'QuasiRandomSampleGenerator', 'QuasiRandomsearchSolver']
+__all__ = ['HaltonSequenceGenerator',
+           'SobolSequenceGenerator',
+           'LatinHypercubeGenerator',
+           'QuasiRandomSampleGenerator',
+           'QuasiRandomsearchSolver',
+           'get_sequence_generator',
+           'radical_inverse',
+           'first_primes',
+           'stratified_categories',
+           'SEQUENCES']
 
 import os
 import logging
 import warnings
+import collections
 import numpy as np
 from pprint import pformat
+from hyppopy.SampleIndex import SampleIndex
 from hyppopy.globals import DEBUGLEVEL
 from hyppopy.solvers.HyppopySolver import HyppopySolver
 
 LOG = logging.getLogger(os.path.basename(__file__))
 LOG.setLevel(DEBUGLEVEL)
 
+# unit space generators selectable via the solver setting sequence
+SEQUENCES = ["halton", "sobol", "lhs"]
+
+
+def first_primes(n, start=2):
+    """
+    Returns the first n primes >= start, found with a sieve of Eratosthenes.
+
+    :param n: [int] number of primes
+    :param start: [int] smallest prime candidate, default=2
+
+    :return: [ndarray] primes
+    """
+    limit = max(16, 2 * start)
+    while True:
+        sieve = np.ones(limit, dtype=bool)
+        sieve[:2] = False
+        for p in range(2, int(limit ** 0.5) + 1):
+            if sieve[p]:
+                sieve[p * p::p] = False
+        primes = np.nonzero(sieve)[0]
+        primes = primes[primes >= start]
+        if len(primes) >= n:
+            return primes[:n]
+        limit *= 2
+
+
+def radical_inverse(indices, base, permutations=None):
+    """
+    Computes the van der Corput radical inverse of all indices at once. If digit permutations are given, the j-th
+    digit is replaced by permutations[j][digit] (scrambling), all len(permutations) digits including leading zeros
+    are permuted.
+
+    :param indices: [ndarray] non-negative integer indices
+    :param base: [int] base
+    :param permutations: [ndarray] digit permutations (digit position x base), default=None
+
+    :return: [ndarray] radical inverses in [0, 1)
+    """
+    n = np.array(indices, dtype=np.int64)
+    result = np.zeros(n.shape)
+    factor = 1.0 / base
+    if permutations is None:
+        while np.any(n > 0):
+            n, digits = np.divmod(n, base)
+            result += digits * factor
+            factor /= base
+        return result
+    for permutation in permutations:
+        n, digits = np.divmod(n, base)
+        result += permutation[digits] * factor
+        factor /= base
+    return result
+
+
+def stratified_categories(unit_values, counts):
+    """
+    Maps one sequence dimension to the combinations of several categorical axes. The values are processed in chunks
+    of as many consecutive elements as there are combinations, within a chunk the i-th smallest value gets the i-th
+    combination, so every combination occurs once per chunk. The values of a trailing incomplete chunk are mapped to
+    the stratum floor(value * combinations) they fall into. Combination k is unraveled in mixed radix of the category
+    counts, the last axis varying fastest.
+
+    :param unit_values: [ndarray] sequence values in [0, 1)
+    :param counts: [list] number of categories per axis
+
+    :return: [ndarray] category indices (axis x value)
+    """
+    unit_values = np.asarray(unit_values, dtype=float)
+    combinations = 1
+    for count in counts:
+        combinations *= count
+    full = len(unit_values) // combinations * combinations
+    combined = np.empty(len(unit_values))
+    if full > 0:
+        chunks = unit_values[:full].reshape(-1, combinations)
+        combined[:full] = np.argsort(np.argsort(chunks, axis=1, kind='stable'), axis=1).ravel()
+    combined[full:] = np.minimum(np.floor(unit_values[full:] * combinations), combinations - 1)
+    indices = np.empty((len(counts), len(unit_values)), dtype=np.int64)
+    for d in range(len(counts) - 1, -1, -1):
+        combined, remainder = np.divmod(combined, counts[d])
+        indices[d] = np.minimum(remainder, counts[d] - 1)
+    return indices
+
 
 class HaltonSequenceGenerator(object):
     """
     This class generates Halton sequences (https://en.wikipedia.org/wiki/Halton_sequence). The class needs a total
     number of samples and the number of dimensions to generate a quasirandom sequence for each axis. The method
     get_unit_space returns a sequence list with N_samples for each axis representing N_samples vectors on a unit sphere.
+    The radical inverses are computed for all samples of an axis at once. If scramble is True, the digits of each
+    axis are permuted randomly, this breaks the correlation between the axes of high base in high dimensions.
+
+    :param scramble: [bool] scramble the digits, default=False
+    :param skip: [int] number of leading sequence elements dropped, default=0
+    :param rng: [object] numpy.random.Generator or seed drawing the permutations, default=None
     """
-    def __init__(self):
-        pass
+    def __init__(self, scramble=False, skip=0, rng=None):
+        self._scramble = scramble
+        self._skip = skip
+        self._rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        self._permutations = {}
 
-    def __next_prime(self):
+    def __permutations(self, base):
         """
-        Checks if num is a prime value
+        Returns the digit permutations of a base, drawn once per generator so continued sequences match.
         """
-        def is_prime(num):
-            for i in range(2, int(num ** 0.5) + 1):
-                if (num % i) == 0: return False
-            return True
+        if base not in self._permutations:
+            # enough digits to resolve the double precision mantissa
+            digits = int(np.ceil(54 * np.log(2) / np.log(base)))
+            self._permutations[base] = np.array([self._rng.permutation(base) for _ in range(digits)])
+        return self._permutations[base]
 
-        prime = 3
-        while 1:
-            if is_prime(prime):
-                yield prime
-            prime += 2
+    def get_unit_array(self, N_samples, N_dims, offset=0):
+        """
+        Same as get_unit_space but returns an array.
 
-    def __vdc(self, n, base):
-        vdc, denom = 0, 1
-        while n:
-            denom *= base
-            n, remainder = divmod(n, base)
-            vdc += remainder / float(denom)
-        return vdc
+        :return: [ndarray] samples array (N_dims x N_samples)
+        """
+        indices = np.arange(self._skip + offset, self._skip + offset + N_samples)
+        # bases start at 5 to keep the sequences of previous versions
+        bases = first_primes(N_dims, start=5)
+        seq = np.empty((N_dims, N_samples))
+        for d, base in enumerate(bases):
+            permutations = self.__permutations(int(base)) if self._scramble else None
+            seq[d] = radical_inverse(indices, int(base), permutations)
+        return seq
 
-    def get_unit_space(self, N_samples, N_dims):
+    def get_unit_space(self, N_samples, N_dims, offset=0):
         """
         Returns a unit space in form of a sequence list keeping N_dims sequences with N_sample samplings. Each sample
-        represents a N_dims dimensional vector on a unit sphere.
+        represents a N_dims dimensional vector on a unit sphere. Using offset the sequence can be continued after the
+        first offset elements.
 
         :param N_samples: [int] Number of samples
         :param N_dims: [int] Number of dimensions
+        :param offset: [int] index of the first sequence element, default=0
 
         :return: [list] samples list of length N_dims keeping lists each of length N_samples
         """
-        seq = []
-        primeGen = self.__next_prime()
-        next(primeGen)
-        for d in range(N_dims):
-            base = next(primeGen)
-            seq.append([self.__vdc(i, base) for i in range(N_samples)])
-        return seq
+        return self.get_unit_array(N_samples, N_dims, offset).tolist()
+
+
+class SobolSequenceGenerator(HaltonSequenceGenerator):
+    """
+    This class generates Sobol sequences using scipy.stats.qmc (scipy >= 1.7), the first skip elements of the
+    sequence are dropped. Sobol sequences are balanced for N_samples being a power of 2.
+
+    :param scramble: [bool] Owen scrambling of the sequence, default=True
+    :param skip: [int] number of leading sequence elements dropped, default=0
+    :param rng: [object] numpy.random.Generator or seed of the scrambling, default=None
+    """
+    def __init__(self, scramble=True, skip=0, rng=None):
+        HaltonSequenceGenerator.__init__(self, scramble, skip, rng)
+        self._engines = {}
+
+    def get_unit_array(self, N_samples, N_dims, offset=0):
+        if N_dims not in self._engines:
+            try:
+                from scipy.stats import qmc
+            except ImportError as e:
+                msg = "Sobol sequences need scipy >= 1.7, {}".format(e)
+                LOG.error(msg)
+                raise ImportError(msg)
+            self._engines[N_dims] = qmc.Sobol(N_dims, scramble=self._scramble, seed=self._rng)
+        engine = self._engines[N_dims]
+        engine.reset()
+        if self._skip + offset > 0:
+            engine.fast_forward(self._skip + offset)
+        with warnings.catch_warnings():
+            # balance properties only hold for powers of 2, the sample count is given by the project
+            warnings.simplefilter("ignore", UserWarning)
+            return engine.random(N_samples).T
+
+
+class LatinHypercubeGenerator(HaltonSequenceGenerator):
+    """
+    This class generates Latin hypercube samples, each axis is divided into N_samples strata and each stratum holds
+    exactly one sample. Each call, e.g. when a sequence is continued via offset, generates a new independent design.
+
+    :param rng: [object] numpy.random.Generator or seed, default=None
+    """
+    def __init__(self, rng=None):
+        HaltonSequenceGenerator.__init__(self, False, 0, rng)
+
+    def get_unit_array(self, N_samples, N_dims, offset=0):
+        strata = np.argsort(self._rng.random((N_dims, N_samples)), axis=1)
+        return (strata + self._rng.random((N_dims, N_samples))) / N_samples
+
+
+def get_sequence_generator(sequence="halton", scramble=False, skip=0, rng=None):
+    """
+    Creates the unit space generator of a sequence name.
+
+    :param sequence: [str] one of SEQUENCES, default="halton"
+    :param scramble: [bool] scramble the sequence, ignored for lhs, default=False
+    :param skip: [int] number of leading sequence elements dropped, ignored for lhs, default=0
+    :param rng: [object] numpy.random.Generator or seed, default=None
+
+    :return: [HaltonSequenceGenerator] generator instance
+    """
+    if sequence == "halton":
+        return HaltonSequenceGenerator(scramble, skip, rng)
+    elif sequence == "sobol":
+        return SobolSequenceGenerator(scramble, skip, rng)
+    elif sequence == "lhs":
+        return LatinHypercubeGenerator(rng)
+    else:
+        msg = "Unknown sequence {}, expected one of {}!".format(sequence, SEQUENCES)
+        LOG.error(msg)
+        raise LookupError(msg)
 
 
 class QuasiRandomSampleGenerator(object):
     """
-    This class takes care of the hyperparameter space creation and next sample delivery.
+    This class takes care of the hyperparameter space creation and next sample delivery. If unique_samples is True,
+    samples already delivered are skipped and the sequence is continued when the generated samples are used up. The
+    sample order is drawn from rng, a numpy.random.Generator or a seed. The numerical axes are sampled from generator,
+    see get_sequence_generator, default is a plain Halton sequence. If categorical_sequence is True, the categorical
+    axes share one further dimension of the sequence, mapped to the combinations of categories by
+    stratified_categories. Every combination is sampled once per chunk of as many samples as there are combinations
+    and the assignment follows the sequence, so the numerical axes are covered evenly per combination too. Otherwise
+    the categories are drawn independently from rng. The numerical dimensions come first, their values do not depend
+    on categorical_sequence.
+
+    Samples are generated in blocks of N_samples sequence elements kept as one array per axis, the sample dicts are
+    created on demand in the order of a random permutation of the block. Each block continues the sequence of the
+    previous one, extend adds a further block without regenerating the pending samples.
     """
-    def __init__(self, N_samples=None):
-        self._axis = None
-        self._samples = []
+    def __init__(self, N_samples=None, unique_samples=False, rng=None, generator=None, categorical_sequence=True):
+        self._blocks = collections.deque()
         self._numerical = []
         self._categorical = []
         self._N_samples = N_samples
+        self._offset = 0
+        self._unique_samples = unique_samples
+        self._index = None
+        self._batch_yield = None
+        self._rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        self._generator = generator if generator is not None else HaltonSequenceGenerator()
+        self._categorical_sequence = categorical_sequence
 
     def set_axis(self, name, data, domain, dtype):
         """
@@ -108,38 +298,77 @@ class QuasiRandomSampleGenerator(object):
 
     def generate_samples(self, N_samples=None):
         """
-        This function is called once when the first sample is requested. It generates the halton sequence space.
+        This function is called when the first sample is requested and whenever the pending samples are used up. It
+        generates the next N_samples elements of the quasirandom sequence space.
 
-        :param N_samples: [int] number of samples
+        :param N_samples: [int] number of samples, default=None uses the number of samples of the last call
         """
-        self._axis = []
         if N_samples is None:
             assert isinstance(self._N_samples, int), "Precondition violation, no number of samples specified!"
         else:
             self._N_samples = N_samples
+        self.__generate(self._N_samples)
 
-        axis_samples = {}
-        if len(self._numerical) > 0:
-            generator = HaltonSequenceGenerator()
-            unit_space = generator.get_unit_space(self._N_samples, len(self._numerical))
+    def extend(self, N_samples):
+        """
+        Adds N_samples further samples by continuing the sequence, pending samples are kept. The number of samples
+        generated when the pending samples are used up is not changed.
+
+        :param N_samples: [int] number of additional samples
+        """
+        assert isinstance(N_samples, int) and N_samples > 0, "Precondition violation, N_samples needs to be an int > 0, got {}!".format(N_samples)
+        self.__generate(N_samples)
+
+    def __generate(self, N_samples):
+        """
+        Appends a block of the next N_samples sequence elements.
+        """
+        columns = []
+        N_dims = len(self._numerical) + (1 if self._categorical_sequence and len(self._categorical) > 0 else 0)
+        if N_dims > 0:
+            unit_space = self._generator.get_unit_array(N_samples, N_dims, self._offset)
             for n, axis in enumerate(self._numerical):
-                width = abs(axis["data"][1] - axis["data"][0])
-                unit_space[n] = [x * width for x in unit_space[n]]
-                unit_space[n] = [x + axis["data"][0] for x in unit_space[n]]
+                values = unit_space[n] * abs(axis["data"][1] - axis["data"][0]) + axis["data"][0]
                 if axis["type"] is int:
-                    unit_space[n] = [int(round(x)) for x in unit_space[n]]
-                axis_samples[axis["name"]] = unit_space[n]
+                    values = np.round(values).astype(np.int64)
+                columns.append((axis["name"], values))
         else:
             warnings.warn("No numerical axis defined, this warning can be ignored if searchspace is categorical only, otherwise check if axis was set!")
+        if self._categorical_sequence and len(self._categorical) > 0:
+            strata = stratified_categories(unit_space[-1], [len(cat["data"]) for cat in self._categorical])
+        for n, cat in enumerate(self._categorical):
+            data = np.empty(len(cat["data"]), dtype=object)
+            data[:] = cat["data"]
+            if self._categorical_sequence:
+                indices = strata[n]
+            else:
+                indices = self._rng.integers(len(data), size=N_samples)
+            columns.append((cat["name"], data[indices]))
+
+        self._blocks.append({"columns": columns, "order": self._rng.permutation(N_samples), "position": 0})
+        self._offset += N_samples
+
+    def __pop(self):
+        """
+        Returns the next pending sample of the current block or None if no samples are pending.
+        """
+        while len(self._blocks) > 0 and self._blocks[0]["position"] >= len(self._blocks[0]["order"]):
+            self._blocks.popleft()
+        if len(self._blocks) == 0:
+            return None
+        block = self._blocks[0]
+        i = block["order"][block["position"]]
+        block["position"] += 1
+        return {name: values[i] if values.dtype == object else values[i].item() for name, values in block["columns"]}
 
-        for n in range(self._N_samples):
-            sample = {}
-            for name, data in axis_samples.items():
-               sample[name] = data[n]
-            for cat in self._categorical:
-                choice = np.random.choice(len(cat["data"]), 1)[0]
-                sample[cat["name"]] = cat["data"][choice]
-            self._samples.append(sample)
+    @property
+    def pending(self):
+        """
+        Number of generated samples not delivered yet.
+
+        :return: [int] pending samples
+        """
+        return sum(len(block["order"]) - block["position"] for block in self._blocks)
 
     def next(self):
         """
@@ -147,20 +376,49 @@ class QuasiRandomSampleGenerator(object):
 
         :return: [dict] sample dict {'name':value, ...}
         """
-        if len(self._samples) == 0:
+        if self._unique_samples:
+            return self.__next_unique()
+        if self.pending == 0:
             self.generate_samples()
-        if len(self._samples) == 0:
-            return None
-        next_index = np.random.choice(len(self._samples), 1)[0]
-        sample = self._samples.pop(next_index)
-        return sample
+        return self.__pop()
+
+    def __next_unique(self):
+        """
+        Returns the next sample not delivered before. Returns None if the searchspace is exhausted or if a whole batch
+        of newly generated samples contained no unseen sample.
+
+        :return: [dict] sample dict {'name':value, ...}
+        """
+        if self._index is None:
+            space = {}
+            for axis in self._numerical:
+                space[axis["name"]] = axis
+            for cat in self._categorical:
+                space[cat["name"]] = {"domain": "categorical", "data": cat["data"], "type": cat["type"]}
+            self._index = SampleIndex(space)
+        while not self._index.exhausted:
+            if self.pending == 0:
+                if self._batch_yield == 0:
+                    return None
+                self.generate_samples()
+                self._batch_yield = 0
+            sample = self.__pop()
+            if self._index.add(sample):
+                self._batch_yield += 1
+                return sample
+        return None
 
 
 class QuasiRandomsearchSolver(HyppopySolver):
     """
     The QuasiRandomsearchSolver class implements a quasi randomsearch optimization. The quasi randomsearch supports
-    categorical and uniform sampling. The solver defines a Halton Sequence distributed hyperparameter space. This
-    means a rather evenly distributed space sampling but no real randomness.
+    categorical and uniform sampling. The solver defines a low-discrepancy distributed hyperparameter space. This
+    means a rather evenly distributed space sampling but no real randomness. The setting sequence selects a Halton
+    sequence ("halton", default), a Sobol sequence ("sobol") or a Latin hypercube design ("lhs"), scramble randomizes
+    the Halton or Sobol sequence and sequence_skip drops its first elements. The combinations of the categorical axes
+    are stratified along a further dimension of the sequence, if the setting categorical_sequence is False they are
+    drawn at random. If the setting unique_samples
+    is True, duplicate samples are skipped and the solver stops early when a discrete parameter space is exhausted.
     """
     def __init__(self, project=None):
         """
@@ -180,6 +438,11 @@ class QuasiRandomsearchSolver(HyppopySolver):
         settings passed fullfill solver needs.
         """
         self._add_member("max_iterations", int)
+        self._add_member("unique_samples", bool, default=False)
+        self._add_member("sequence", str, default="halton")
+        self._add_member("scramble", bool, default=False)
+        self._add_member("sequence_skip", int, default=0)
+        self._add_member("categorical_sequence", bool, default=True)
         self._add_hyperparameter_signature(name="domain", dtype=str,
                                           options=["uniform", "categorical"])
         self._add_hyperparameter_signature(name="data", dtype=list)
@@ -209,7 +472,9 @@ class QuasiRandomsearchSolver(HyppopySolver):
         :param searchspace: converted hyperparameter space
         """
         N = self.max_iterations
-        self._sampler = QuasiRandomSampleGenerator(N)
+        generator = get_sequence_generator(self.sequence, self.scramble, self.sequence_skip, self.rng)
+        self._sampler = QuasiRandomSampleGenerator(N, self.unique_samples, rng=self.rng, generator=generator,
+                                                   categorical_sequence=self.categorical_sequence)
         for name, axis in searchspace.items():
             self._sampler.set_axis(name, axis["data"], axis["domain"], axis["type"])
         try:
@@ -222,7 +487,11 @@ class QuasiRandomsearchSolver(HyppopySolver):
             msg = "internal error in randomsearch execute_solver occured. {}".format(e)
             LOG.error(msg)
             raise BrokenPipeError(msg)
-        self.best = self._trials.argmin
+        if self.best_so_far is None:
+            msg = "No successful trial available!"
+            LOG.error(msg)
+            raise AssertionError(msg)
+        self.best = self.best_so_far["params"]
 
     def convert_searchspace(self, hyperparameter):
         """
@@ -18,12 +18,13 @@ __all__ = ['RandomsearchSolver',
            'draw_sample']
 
 import os
-import copy
 import random
 import logging
 import numpy as np
 from pprint import pformat
-from hyppopy.globals import DEBUGLEVEL
+from hyppopy.SampleIndex import SampleIndex
+from hyppopy.SamplingEngine import SamplingEngine
+from hyppopy.globals import DEBUGLEVEL, MAXRESAMPLINGATTEMPTS
 from hyppopy.solvers.HyppopySolver import HyppopySolver
 
 LOG = logging.getLogger(os.path.basename(__file__))
@@ -85,13 +86,11 @@ def draw_loguniform_sample(param):
     """
     assert param['type'] is not str, "cannot sample a string list!"
     assert param['data'][0] < param['data'][1], "precondition violation: data[0] > data[1]!"
-    p = copy.deepcopy(param)
-    p['data'][0] = np.log(param['data'][0])
-    p['data'][1] = np.log(param['data'][1])
-    assert p['data'][0] is not np.nan, "Precondition violation, left bound input error, results in nan!"
-    assert p['data'][1] is not np.nan, "Precondition violation, right bound input error, results in nan!"
-    x = draw_uniform_sample(p)
-    s = np.exp(x)
+    low = np.log(param['data'][0])
+    high = np.log(param['data'][1])
+    assert not np.isnan(low), "Precondition violation, left bound input error, results in nan!"
+    assert not np.isnan(high), "Precondition violation, right bound input error, results in nan!"
+    s = float(np.exp(low + random.random() * (high - low)))
     if s > param['data'][1]:
         s = param['data'][1]
     if s < param['data'][0]:
@@ -135,7 +134,9 @@ class RandomsearchSolver(HyppopySolver):
     """
     The RandomsearchSolver class implements a randomsearch optimization. The randomsearch supports
     categorical, uniform, normal and loguniform sampling. The solver draws an independent sample
-    from the parameter space each iteration.
+    from the parameter space each iteration. If the setting unique_samples is True, samples already proposed are
+    redrawn and the solver stops early when a discrete parameter space is exhausted. Samples are drawn by a
+    SamplingEngine in blocks of sample_block_size values per axis.
     """
     def __init__(self, project=None):
         """
@@ -154,6 +155,8 @@ class RandomsearchSolver(HyppopySolver):
         settings passed fullfill solver needs.
         """
         self._add_member("max_iterations", int)
+        self._add_member("unique_samples", bool, default=False)
+        self._add_member("sample_block_size", int, default=1024)
         self._add_hyperparameter_signature(name="domain", dtype=str,
                                           options=["uniform", "normal", "loguniform", "categorical"])
         self._add_hyperparameter_signature(name="data", dtype=list)
@@ -175,6 +178,31 @@ class RandomsearchSolver(HyppopySolver):
             return np.nan
         return loss
 
+    def draw_params(self, engine, index=None):
+        """
+        Draws a parameter set from the sampling engine. If a SampleIndex is passed, parameter sets already in the index
+        are redrawn up to MAXRESAMPLINGATTEMPTS times. In a discrete searchspace the remaining parameter sets are
+        enumerated instead, if less than a tenth of the searchspace is left or redrawing failed, so None is only
+        returned once the searchspace is exhausted. The enumerated parameter sets are drawn with equal probability.
+
+        :param engine: [SamplingEngine] sampling engine of the searchspace
+        :param index: [SampleIndex] index of the parameter sets proposed so far, default=None
+
+        :return: [dict] parameter set or None if no unseen parameter set was found
+        """
+        if index is not None and index.exhausted:
+            return None
+        discrete = index is not None and not np.isinf(index.capacity)
+        if discrete and 10 * (index.capacity - len(index)) <= index.capacity:
+            return index.draw_unseen(engine.rng)
+        for attempt in range(MAXRESAMPLINGATTEMPTS):
+            params = next(engine)
+            if index is None or index.add(params):
+                return params
+        if discrete:
+            return index.draw_unseen(engine.rng)
+        return None
+
     def execute_solver(self, searchspace):
         """
         This function is called immediately after convert_searchspace and get the output of the latter as input. It's
@@ -183,17 +211,26 @@ class RandomsearchSolver(HyppopySolver):
         :param searchspace: converted hyperparameter space
         """
         N = self.max_iterations
+        index = None
+        if self.unique_samples:
+            index = SampleIndex(searchspace)
+        engine = SamplingEngine(searchspace, block_size=max(1, min(self.sample_block_size, N)), rng=self.rng)
         try:
             for n in range(N):
-                params = {}
-                for name, p in searchspace.items():
-                    params[name] = draw_sample(p)
+                params = self.draw_params(engine, index)
+                if params is None:
+                    LOG.info("randomsearch stopped after {} iterations, no unseen samples left".format(n))
+                    break
                 self.loss_function(**params)
         except Exception as e:
             msg = "internal error in randomsearch execute_solver occured. {}".format(e)
             LOG.error(msg)
             raise BrokenPipeError(msg)
-        self.best = self._trials.argmin
+        if self.best_so_far is None:
+            msg = "No successful trial available!"
+            LOG.error(msg)
+            raise AssertionError(msg)
+        self.best = self.best_so_far["params"]
 
     def convert_searchspace(self, hyperparameter):
         """
@@ -0,0 +1,162 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+__all__ = ['ZoomingGridsearchSolver']
+
+import os
+import copy
+import logging
+import numpy as np
+from hyppopy.globals import DEBUGLEVEL
+from hyppopy.solvers.GridsearchSolver import GridsearchSolver
+
+LOG = logging.getLogger(os.path.basename(__file__))
+LOG.setLevel(DEBUGLEVEL)
+
+
+class ZoomingGridsearchSolver(GridsearchSolver):
+    """
+    The ZoomingGridsearchSolver class implements a coarse to fine gridsearch. Each round evaluates a grid defined like
+    for the GridsearchSolver, then the range of each numerical axis is shrunk to the cells around the zoom_top_k best
+    points of the round, i.e. to the interval between the grid values neighbouring their values, and categorical axes
+    are reduced to the categories of these points. The next round re-grids the new ranges with the same frequencies.
+    Grid points evaluated in an earlier round are not evaluated again. The search stops when max_iterations
+    evaluations are spent, zoom_rounds rounds are done (0 means no limit) or a round contains no new grid point.
+    The ranges and sizes of all rounds are available via rounds. The settings shard and grid_start are ignored.
+    """
+    def __init__(self, project=None):
+        """
+        The constructor accepts a HyppopyProject.
+
+        :param project: [HyppopyProject] project instance, default=None
+        """
+        GridsearchSolver.__init__(self, project)
+        self._rounds = []
+
+    def define_interface(self):
+        """
+        This function is called when HyppopySolver.__init__ function finished. Child classes need to define their
+        individual parameter here by calling the _add_member function for each class member variable need to be defined.
+        Using _add_hyperparameter_signature the structure of a hyperparameter the solver expects must be defined.
+        Both, members and hyperparameter signatures are later get checked, before executing the solver, ensuring
+        settings passed fullfill solver needs.
+        """
+        GridsearchSolver.define_interface(self)
+        self._add_member("max_iterations", int)
+        self._add_member("zoom_rounds", int, default=0)
+        self._add_member("zoom_top_k", int, default=1)
+
+    def execute_solver(self, searchspace):
+        """
+        This function is called immediately after convert_searchspace and get the output of the latter as input. It's
+        purpose is to call the solver libs main optimization function.
+
+        :param searchspace: converted hyperparameter space
+        """
+        if self.shard or self.grid_start > 0:
+            LOG.warning("zooming gridsearch ignores the settings shard and grid_start")
+        hyperparameter = copy.deepcopy(self.project.hyperparameter)
+        losses = {}
+        budget = self.max_iterations
+        self._rounds = []
+        while budget > 0 and (self.zoom_rounds <= 0 or len(self._rounds) < self.zoom_rounds):
+            grid = self._grid(searchspace)
+            points = []
+            new = 0
+            for k in grid.visit(self.grid_order, key=self._order_key()):
+                params = grid.params(k)
+                key = self.__key(params)
+                if key not in losses:
+                    if budget == 0:
+                        break
+                    try:
+                        losses[key] = self.loss_function(**params)
+                    except Exception as e:
+                        msg = "internal error in zooming gridsearch execute_solver occured. {}".format(e)
+                        LOG.error(msg)
+                        raise BrokenPipeError(msg)
+                    budget -= 1
+                    new += 1
+                points.append((losses.get(key, np.nan), params))
+            self._rounds.append({"hyperparameter": copy.deepcopy(hyperparameter), "grid_size": grid.size, "evaluations": new})
+            LOG.info("zooming gridsearch round {}: {} grid points, {} evaluated".format(len(self._rounds), grid.size, new))
+            if new == 0:
+                break
+            hyperparameter = self.__zoom(hyperparameter, searchspace, points)
+            if hyperparameter is None:
+                break
+            searchspace = self.convert_searchspace(hyperparameter)
+        if self.best_so_far is None:
+            msg = "No successful trial available!"
+            LOG.error(msg)
+            raise AssertionError(msg)
+        self.best = self.best_so_far["params"]
+
+    @staticmethod
+    def __key(params):
+        """
+        Returns the key identifying a grid point across rounds. Float values are rounded to 12 significant digits, so a
+        point re-gridded with a different linspace rounding is recognized as evaluated whatever its magnitude.
+
+        :param params: [dict] parameter set
+
+        :return: [tuple] key
+        """
+        key = []
+        for name, value in sorted(params.items()):
+            if isinstance(value, (float, np.floating)):
+                value = float("{:.12g}".format(value))
+            key.append((name, type(value), value))
+        return tuple(key)
+
+    def __zoom(self, hyperparameter, searchspace, points):
+        """
+        Shrinks the hyperparameter ranges to the cells around the best points of a round.
+
+        :param hyperparameter: [dict] hyperparameter space of the round
+        :param searchspace: converted hyperparameter space of the round
+        :param points: [list] (loss, params) of the grid points of the round
+
+        :return: [dict] hyperparameter space of the next round or None if no successful point exists
+        """
+        points = [point for point in points if not np.isnan(point[0])]
+        if len(points) == 0:
+            return None
+        points.sort(key=lambda point: point[0])
+        top = [params for _, params in points[:self.zoom_top_k]]
+        zoomed = copy.deepcopy(hyperparameter)
+        for name, axis in zip(searchspace[0], searchspace[1]):
+            param = zoomed[name]
+            values = [params[name] for params in top]
+            if param["domain"] == "categorical":
+                param["data"] = [value for value in param["data"] if value in values]
+                continue
+            axis = sorted(axis)
+            positions = [axis.index(value) for value in values]
+            low = axis[max(min(positions) - 1, 0)]
+            high = axis[min(max(positions) + 1, len(axis) - 1)]
+            if low >= high:
+                # single value left, keep it as fixed categorical axis
+                zoomed[name] = {"domain": "categorical", "data": [low], "type": param["type"], "frequency": 1}
+            else:
+                param["data"] = [low, high]
+        return zoomed
+
+    @property
+    def rounds(self):
+        """
+        Get the rounds of the last run, each round as dict with the hyperparameter space of the round, its grid size and
+        the number of evaluated grid points.
+
+        :return: [list] rounds
+        """
+        return self._rounds
@@ -0,0 +1,103 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import sys
+import time
+import unittest
+
+from hyppopy.CommandBlackbox import CommandBlackbox
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+CHILD = """
+import os, sys, json, time
+for line in sys.stdin:
+    x = json.loads(line)["params"]["x"]
+    if x < 0:
+        sys.exit(1)
+    if x > 100:
+        time.sleep(10)
+    if x == 50:
+        print(json.dumps({"error": "x == 50"}), flush=True)
+        continue
+    print(json.dumps({"loss": (x - 3) ** 2, "pid": os.getpid()}), flush=True)
+"""
+
+
+class CommandBlackboxTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.command = [sys.executable, "-c", CHILD]
+
+    def test_call(self):
+        with CommandBlackbox(self.command) as blackbox:
+            self.assertEqual(blackbox(x=3), 0)
+            self.assertEqual(blackbox(x=5), 4)
+            self.assertRaises(RuntimeError, blackbox, x=50)
+            self.assertEqual(blackbox(x=1), 4)
+
+    def test_map(self):
+        with CommandBlackbox(self.command, workers=3) as blackbox:
+            losses = blackbox.map([{"x": n} for n in range(10)])
+        self.assertEqual(losses, [(n - 3) ** 2 for n in range(10)])
+
+    def test_restart(self):
+        with CommandBlackbox(self.command, timeout=1) as blackbox:
+            self.assertEqual(blackbox(x=4), 1)
+            self.assertRaises(RuntimeError, blackbox, x=-1)
+            self.assertEqual(blackbox(x=4), 1)
+            self.assertRaises(TimeoutError, blackbox, x=200)
+            self.assertEqual(blackbox(x=2), 1)
+
+    def test_out_of_sync(self):
+        child = "\n".join(["import sys, json, time",
+                           "for line in sys.stdin:",
+                           "    request = json.loads(line)",
+                           "    x = request['params']['x']",
+                           "    if x == 7:",
+                           "        print('computing', flush=True)",
+                           "    if x == 9:",
+                           "        print(json.dumps({'id': request['id'] + 1, 'loss': 0}), flush=True)",
+                           "        continue",
+                           "    print(json.dumps({'id': request['id'], 'loss': x}), flush=True)",
+                           "    if x == 8:",
+                           "        print(json.dumps({'loss': -1}), flush=True)"])
+        with CommandBlackbox([sys.executable, "-c", child], timeout=5) as blackbox:
+            # a stray line in front of the answer fails the trial and restarts the child
+            self.assertRaises(RuntimeError, blackbox, x=7)
+            self.assertEqual(blackbox(x=1), 1)
+            # a stray line after the answer is discarded before the next request
+            self.assertEqual(blackbox(x=8), 8)
+            time.sleep(0.2)
+            self.assertEqual(blackbox(x=2), 2)
+            # an answer to another request is rejected
+            self.assertRaises(RuntimeError, blackbox, x=9)
+            self.assertEqual(blackbox(x=3), 3)
+
+    def test_solver(self):
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [-1, 10], "type": float}
+            },
+            "max_iterations": 30
+        }
+        solver = RandomsearchSolver(HyppopyProject(config))
+        with CommandBlackbox(self.command, workers=2) as blackbox:
+            solver.blackbox = blackbox
+            solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertEqual(len(df), 30)
+        self.assertTrue(abs(best['x'] - 3) < 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import unittest
+from itertools import product, islice
+
+from hyppopy.GridIndex import *
+
+
+class GridIndexTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.axes = [[0, 1, 2], ["a", "b"], [0.1, 0.2, 0.3, 0.4, 0.5]]
+        self.grid = GridIndex(["x", "c", "y"], self.axes)
+
+    def test_index(self):
+        self.assertEqual(self.grid.size, 30)
+        self.assertEqual(self.grid.shape, [3, 2, 5])
+        points = [tuple(self.grid.params(k).values()) for k in range(self.grid.size)]
+        self.assertEqual(points, list(product(*self.axes)))
+        for k in range(self.grid.size):
+            self.assertEqual(self.grid.ravel(self.grid.unravel(k)), k)
+        self.assertRaises(IndexError, self.grid.unravel, 30)
+
+        huge = GridIndex(["p{}".format(n) for n in range(40)], [list(range(10))] * 40)
+        self.assertEqual(huge.size, 10**40)
+        self.assertEqual(huge.unravel(10**40 - 1), [9] * 40)
+
+    def test_orders(self):
+        for order in GRID_ORDERS:
+            visited = list(self.grid.visit(order, key=3))
+            self.assertEqual(sorted(visited), list(range(30)), order)
+        self.assertEqual(list(self.grid.visit()), list(range(30)))
+        self.assertNotEqual(list(self.grid.visit("random", key=3)), list(self.grid.visit("random", key=4)))
+        self.assertEqual(list(self.grid.visit("random", key=3)), list(self.grid.visit("random", key=3)))
+        self.assertRaises(LookupError, list, self.grid.visit("unknown"))
+
+        huge = GridIndex(["p{}".format(n) for n in range(20)], [list(range(10))] * 20)
+        points = list(islice(huge.visit("random", key=1), 1000))
+        self.assertEqual(len(set(points)), 1000)
+        self.assertTrue(all(0 <= k < huge.size for k in points))
+
+    def test_shards(self):
+        for order in GRID_ORDERS:
+            shards = [list(self.grid.visit(order, shard, 4, key=7)) for shard in range(4)]
+            self.assertEqual(sorted(sum(shards, [])), list(range(30)))
+            self.assertEqual([len(points) for points in shards], [self.grid.count(shard, 4) for shard in range(4)])
+            # resume skips the points already visited by the shard
+            self.assertEqual(list(self.grid.visit(order, 1, 4, start=3, key=7)), shards[1][3:])
+        self.assertEqual(parse_shard(""), (0, 1))
+        self.assertEqual(parse_shard("2/8"), (2, 8))
+        for shard in ["8/8", "-1/2", "1", "a/b"]:
+            self.assertRaises(ValueError, parse_shard, shard)
+
+    def test_van_der_corput(self):
+        self.assertEqual(van_der_corput_order(1), [0])
+        self.assertEqual(van_der_corput_order(5), [0, 4, 2, 1, 3])
+        self.assertEqual(sorted(van_der_corput_order(11)), list(range(11)))
+        grid = GridIndex(["x", "y"], [list(range(5)), list(range(3))])
+        points = [grid.unravel(k) for k in grid.visit("vandercorput")]
+        self.assertEqual(sorted(map(tuple, points)), list(product(range(5), range(3))))
+        # the corners first, then the coarse grid of the axis centers, then the finest level
+        self.assertEqual(sorted(map(tuple, points[:4])), [(0, 0), (0, 2), (4, 0), (4, 2)])
+        self.assertEqual(sorted(map(tuple, points[:9])), list(product([0, 2, 4], [0, 1, 2])))
+        # positions are mapped without enumerating the grid
+        grid = GridIndex(["a", "b", "c"], [list(range(1000))] * 3)
+        self.assertEqual(len(set(islice(grid.visit("vandercorput", start=10**6), 1000))), 1000)
+
+        grid = SparseGridIndex(["x", "y"], [[0.5, 0, 1], [0.5, 0, 1]], [[0, 1, 1], [0, 1, 1]], level=2)
+        self.assertEqual(grid.unravel(next(grid.visit("vandercorput"))), [0, 0])
+        self.assertEqual(sorted(grid.visit("vandercorput")), list(range(9)))
+
+    def test_sparse(self):
+        grid = SparseGridIndex(["x", "y"], [[0.5, 0, 1], [0.5, 0, 1]], [[0, 1, 1], [0, 1, 1]], level=1)
+        self.assertEqual(grid.size, 5)
+        self.assertEqual(grid.full_size, 9)
+        points = sorted(tuple(grid.params(k).values()) for k in range(grid.size))
+        self.assertEqual(points, [(0, 0.5), (0.5, 0), (0.5, 0.5), (0.5, 1), (1, 0.5)])
+        self.assertEqual(grid.ravel(grid.unravel(3)), 3)
+        self.assertEqual(sorted(grid.visit("random", key=1)), list(range(5)))
+        shards = [list(grid.visit("strided", shard, 2)) for shard in range(2)]
+        self.assertEqual(sorted(sum(shards, [])), list(range(5)))
+
+        grid = SparseGridIndex(["x", "y"], [[0.5, 0, 1], [0.5, 0, 1]], [[0, 1, 1], [0, 1, 1]], level=2)
+        self.assertEqual(grid.size, 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
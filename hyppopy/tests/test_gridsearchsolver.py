@@ -279,6 +279,104 @@ class GridsearchTestSuite(unittest.TestCase):
         for loss in df['losses']:
             self.assertTrue(isinstance(loss, float))
 
+    def test_unique_axes(self):
+        self.assertEqual(unique_axis([0, 0, 1, 1, 2]), [0, 1, 2])
+        self.assertEqual(unique_axis(["b", "a", "b", 1, True]), ["b", "a", 1, True])
+        self.assertEqual(get_gaussian_axis_sample(0, 3, 9, int), [0, 1, 1, 1, 1, 1, 1, 1, 3])
+        self.assertEqual(get_logarithmic_axis_sample(1, 4, 5, int), [1, 1, 2, 2, 4])
+
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [0, 3], "type": int, "frequency": 10},
+                "y": {"domain": "uniform", "data": [0, 1], "type": float, "frequency": 3},
+                "kernel": {"domain": "categorical", "data": ["rbf", "rbf", "linear"], "type": str, "frequency": 1}
+            }
+        }
+        solver = GridsearchSolver(config)
+        solver.blackbox = lambda x, y, kernel: x + y
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertEqual(solver.nominal_grid_size, 90)
+        self.assertEqual(solver.grid_size, 24)
+        self.assertEqual(len(df), 24)
+        self.assertEqual(len(df.drop_duplicates(subset=['x', 'y', 'kernel'])), 24)
+
+    def test_sparse_grid(self):
+        values, levels = get_sparse_axis_sample({"domain": "uniform", "data": [0, 1], "type": float}, 3)
+        self.assertEqual(values, [0.5, 0.0, 1.0, 0.25, 0.75, 0.125, 0.375, 0.625, 0.875])
+        self.assertEqual(levels, [0, 1, 1, 2, 2, 3, 3, 3, 3])
+        values, levels = get_sparse_axis_sample({"domain": "loguniform", "data": [1, 100], "type": float}, 1)
+        self.assertAlmostEqual(values[0], 10)
+        values, levels = get_sparse_axis_sample({"domain": "categorical", "data": ["a", "b", "a"], "type": str}, 3)
+        self.assertEqual((values, levels), (["a", "b"], [0, 0]))
+
+        hyperparameter = {"axis_{}".format(n): {"domain": "uniform", "data": [0, 1], "type": float, "frequency": 9}
+                          for n in range(8)}
+        hyperparameter["axis_7"]["level"] = 1
+        solver = GridsearchSolver({"hyperparameter": hyperparameter, "grid_mode": "sparse", "sparse_level": 3})
+        solver.blackbox = lambda **params: (params["axis_0"] - 0.75) ** 2 + params["axis_1"] ** 2 + \
+            sum((params["axis_{}".format(n)] - 0.5) ** 2 for n in range(2, 8))
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertEqual(len(df), solver.grid_size)
+        self.assertTrue(solver.grid_size < 1000)
+        self.assertTrue(solver.nominal_grid_size > 10**6)
+        self.assertEqual(set(df["axis_7"]), {0.0, 0.5, 1.0})
+        self.assertEqual(best["axis_0"], 0.75)
+        self.assertEqual(best["axis_1"], 0.0)
+        for n in range(2, 8):
+            self.assertEqual(best["axis_{}".format(n)], 0.5)
+
+        solver = GridsearchSolver({"hyperparameter": hyperparameter, "grid_mode": "unknown"})
+        self.assertRaises(LookupError, solver.convert_searchspace, hyperparameter)
+
+    def test_solver_shards(self):
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [0, 10], "type": int, "frequency": 11},
+                "kernel": {"domain": "categorical", "data": ["rbf", "linear", "poly"], "type": str, "frequency": 1}
+            },
+            "grid_order": "random",
+            "seed": 3
+        }
+        visited = []
+        for shard in range(3):
+            solver = GridsearchSolver(dict(config, shard="{}/3".format(shard)))
+            solver.blackbox = lambda x, kernel: (x - 4) ** 2 + ["rbf", "linear", "poly"].index(kernel)
+            solver.run(print_stats=False)
+            df, best = solver.get_results()
+            self.assertEqual(len(df), 11)
+            visited += list(zip(df['x'], df['kernel']))
+        self.assertEqual(len(set(visited)), 33)
+
+        resumed = GridsearchSolver(dict(config, shard="1/3", grid_start=5))
+        resumed.blackbox = lambda x, kernel: x
+        resumed.run(print_stats=False)
+        self.assertEqual(list(zip(resumed.get_results()[0]['x'], resumed.get_results()[0]['kernel'])), visited[16:22])
+
+        unseeded = GridsearchSolver(dict(config, shard="1/3", seed=-1))
+        unseeded.blackbox = lambda x, kernel: x
+        self.assertRaises(AssertionError, unseeded.run, False)
+
+    def test_solver_max_iterations(self):
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [0, 100], "type": int, "frequency": 101},
+                "y": {"domain": "uniform", "data": [0, 100], "type": int, "frequency": 101}
+            },
+            "grid_order": "vandercorput",
+            "max_iterations": 25
+        }
+        solver = GridsearchSolver(config)
+        solver.blackbox = lambda x, y: (x - 30) ** 2 + (y - 60) ** 2
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        # a budget limited van der Corput run covers the whole grid at coarse resolution
+        self.assertEqual(len(df), 25)
+        self.assertEqual(sorted(set(df['x'])), [0, 25, 50, 75, 100])
+        self.assertEqual(sorted(set(df['y'])), [0, 25, 50, 75, 100])
+        self.assertEqual(best, {"x": 25, "y": 50})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -15,6 +15,7 @@ import unittest
 from hyppopy.solvers.HyperoptSolver import *
 from hyppopy.FunctionSimulator import FunctionSimulator
 from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.BlackboxFunction import BlackboxFunction
 
 
 class HyperoptSolverTestSuite(unittest.TestCase):
@@ -10,8 +10,12 @@
 #
 # See LICENSE
 
+import sys
 import unittest
+import subprocess
+import numpy as np
 
+from hyppopy.globals import ROOT
 from hyppopy.HyppopyProject import HyppopyProject
 from hyppopy.solvers.HyppopySolver import HyppopySolver
 
@@ -343,6 +347,31 @@ class TestLossFuncSolver2(HyppopySolver):
         pass
 
 
+class TestResultsSolver(HyppopySolver):
+    def __init__(self, project=None):
+        project = HyppopyProject({})
+
+        HyppopySolver.__init__(self, project)
+        self._searchspace = None
+        self.result_lengths = []
+
+    def convert_searchspace(self, hyperparameter):
+        pass
+
+    def loss_function_call(self, params):
+        return params["x"] ** 2
+
+    def execute_solver(self, searchspace):
+        for n in range(10):
+            self.loss_function(**{"x": n - 5, "kernel": ["rbf", "linear"][n % 2]})
+            df, _ = self.get_results()
+            self.result_lengths.append(len(df))
+        self.best = self.trials.argmin
+
+    def define_interface(self):
+        pass
+
+
 class HyppopySolverTestSuite(unittest.TestCase):
 
     def setUp(self):
@@ -379,3 +408,90 @@ class HyppopySolverTestSuite(unittest.TestCase):
     def test_lossfunccall(self):
         TestLossFuncSolver1().run(print_stats=False)
         TestLossFuncSolver2().run(print_stats=False)
+
+    def test_get_results(self):
+        solver = TestResultsSolver()
+        solver.run(print_stats=False)
+        self.assertEqual(solver.result_lengths, list(range(1, 11)))
+        df, best = solver.get_results()
+        self.assertIs(df, solver.get_results()[0])
+        self.assertEqual(list(df.index), list(range(10)))
+        self.assertEqual(list(df['x']), list(range(-5, 5)))
+        self.assertEqual(list(df['kernel']), ["rbf", "linear"] * 5)
+        self.assertEqual(list(df['losses']), [float((n - 5) ** 2) for n in range(10)])
+        self.assertEqual(best, {"x": 0, "kernel": "linear"})
+        solver.run(print_stats=False)
+        self.assertEqual(len(solver.get_results()[0]), 10)
+
+    def test_get_results_no_copy(self):
+        solver = TestResultsSolver()
+        solver.run(print_stats=False)
+        df, _ = solver.get_results()
+        for n in range(3):
+            solver.loss_function(x=10 + n, kernel="rbf")
+        extended, _ = solver.get_results()
+        self.assertEqual(len(extended), 13)
+        self.assertEqual(list(extended['x'])[10:], [10, 11, 12])
+        self.assertEqual(list(extended['kernel'])[:10], list(df['kernel']))
+        # appending trials does not copy the existing rows, both frames share the column buffers
+        for name in ['losses', 'x', 'status', 'duration']:
+            self.assertTrue(np.shares_memory(df[name].to_numpy(), extended[name].to_numpy()))
+        self.assertEqual(len(df), 10)
+
+    def test_get_results_promoted_column(self):
+        solver = TestResultsSolver()
+        solver.run(print_stats=False)
+        self.assertEqual(solver.get_results()[0]['x'].dtype, np.int64)
+        # the TrialStore converts the int column to float, the cached column needs to follow
+        solver.loss_function(x=2.5, kernel="rbf")
+        df, _ = solver.get_results()
+        self.assertEqual(df['x'].dtype, np.float64)
+        self.assertEqual(list(df['x']), list(range(-5, 5)) + [2.5])
+        self.assertEqual(list(df['x']), list(solver.get_results(format="numpy")[0]['x']))
+
+    def test_get_results_numpy(self):
+        solver = TestResultsSolver()
+        solver.run(print_stats=False)
+        df, _ = solver.get_results()
+        results, best = solver.get_results(format="numpy")
+        self.assertEqual(best, {"x": 0, "kernel": "linear"})
+        self.assertEqual(results.shape, (10,))
+        self.assertEqual(results.dtype['x'], np.int64)
+        self.assertEqual(list(results['kernel']), list(df['kernel']))
+        self.assertEqual(list(results['losses']), list(df['losses']))
+        self.assertTrue(results['status'].all())
+        self.assertRaises(LookupError, solver.get_results, "csv")
+
+    def test_get_results_arrow(self):
+        try:
+            import pyarrow
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        solver = TestResultsSolver()
+        solver.run(print_stats=False)
+        table, _ = solver.get_results(format="arrow")
+        self.assertEqual(table.num_rows, 10)
+        self.assertEqual(table.column('kernel').to_pylist(), ["rbf", "linear"] * 5)
+        self.assertEqual(table.column('x').to_pylist(), list(range(-5, 5)))
+
+    def test_lazy_pandas(self):
+        code = "import sys; from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver; print('pandas' in sys.modules)"
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, universal_newlines=True)
+        self.assertEqual(output.strip().split()[-1], "False")
+
+    def test_without_pandas(self):
+        # pandas is an optional dependency, a None entry in sys.modules makes every import of it fail
+        code = "\n".join(["import sys",
+                          "sys.modules['pandas'] = None",
+                          "import hyppopy.solvers",
+                          "from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver",
+                          "solver = RandomsearchSolver({'hyperparameter': {'x': {'domain': 'uniform', 'data': [0, 1], 'type': float}}, 'max_iterations': 5})",
+                          "solver.blackbox = lambda x: x",
+                          "solver.run(print_stats=False)",
+                          "print(len(solver.get_results(format='numpy')[0]))",
+                          "try:",
+                          "    solver.get_results()",
+                          "except ImportError:",
+                          "    print('ImportError')"])
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, universal_newlines=True)
+        self.assertEqual(output.strip().split()[-2:], ["5", "ImportError"])
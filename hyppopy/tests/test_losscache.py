@@ -0,0 +1,70 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import unittest
+
+from hyppopy.LossCache import LossCache
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.FunctionSimulator import FunctionSimulator
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+
+class LossCacheTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.hyperparameter = {
+            "x": {"domain": "uniform", "data": [0, 10], "type": float},
+            "y": {"domain": "loguniform", "data": [1, 1000], "type": float},
+            "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str}
+        }
+
+    def test_query(self):
+        cache = LossCache(self.hyperparameter, 0.01)
+        self.assertIsNone(cache.query({"x": 5.0, "y": 10.0, "kernel": "rbf"}))
+        cache.add({"x": 5.0, "y": 10.0, "kernel": "rbf"}, 1.5)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.query({"x": 5.0, "y": 10.0, "kernel": "rbf"}), 1.5)
+        self.assertEqual(cache.query({"x": 5.05, "y": 10.1, "kernel": "rbf"}), 1.5)
+        self.assertIsNone(cache.query({"x": 5.5, "y": 10.0, "kernel": "rbf"}))
+        self.assertIsNone(cache.query({"x": 5.0, "y": 10.0, "kernel": "linear"}))
+
+    def test_nearest_neighbour(self):
+        cache = LossCache(self.hyperparameter, 0.05)
+        for n in range(100):
+            cache.add({"x": n / 10.0, "y": 1.0, "kernel": "rbf"}, float(n))
+        self.assertEqual(cache.query({"x": 4.31, "y": 1.0, "kernel": "rbf"}), 43.0)
+        self.assertEqual(cache.query({"x": 4.36, "y": 1.0, "kernel": "rbf"}), 44.0)
+
+    def test_solver_cache_hits(self):
+        config = {
+            "hyperparameter": {
+                "axis_00": {"domain": "uniform", "data": [0, 800], "type": float},
+                "axis_01": {"domain": "uniform", "data": [-1, 1], "type": float},
+                "axis_02": {"domain": "uniform", "data": [0, 10], "type": float}
+            },
+            "max_iterations": 300,
+            "approx_cache_radius": 0.2
+        }
+        solver = RandomsearchSolver(HyppopyProject(config))
+        vfunc = FunctionSimulator()
+        vfunc.load_default()
+        solver.blackbox = vfunc
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertEqual(len(df), 300)
+        self.assertTrue(df['cached'].any())
+        self.assertFalse(df['cached'].all())
+        self.assertTrue(df['status'].all())
+
+
+if __name__ == '__main__':
+    unittest.main()
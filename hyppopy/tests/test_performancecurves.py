@@ -0,0 +1,77 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import unittest
+import numpy as np
+
+from hyppopy.PerformanceCurves import *
+from hyppopy.RepeatedStudy import RepeatedStudy
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+
+def blackbox(x):
+    return (x - 0.5) ** 2
+
+
+class PerformanceCurvesTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.losses = np.array([[5.0, 3.0, 4.0, np.nan, 1.0],
+                                [2.0, 6.0, 0.5, 0.2, np.nan]])
+        self.ok = np.array([[True, True, True, False, True],
+                            [False, True, True, True, False]])
+        self.times = np.array([[1.0, 2.0, 3.0, 4.0, 5.0],
+                               [0.5, 1.0, 4.0, 4.5, np.nan]])
+
+    def test_cumulative_minimum(self):
+        curves = cumulative_minimum(self.losses, self.ok)
+        np.testing.assert_array_equal(curves, [[5, 3, 3, 3, 1], [np.nan, 6, 0.5, 0.2, 0.2]])
+        np.testing.assert_array_equal(cumulative_minimum(self.losses[0]), [5, 3, 3, 3, 1])
+        np.testing.assert_array_equal(simple_regret(self.losses, 0.2, self.ok)[1], [np.nan, 5.8, 0.3, 0.0, 0.0])
+
+    def test_over_time(self):
+        grid = [0.0, 1.0, 2.5, 4.0, 10.0]
+        curves = cumulative_minimum_over_time(self.losses, self.times, grid, self.ok)
+        np.testing.assert_array_equal(curves, [[np.nan, 5, 3, 3, 1], [np.nan, 6, 6, 0.5, 0.2]])
+        np.testing.assert_array_equal(cumulative_minimum_over_time(self.losses[0], self.times[0], grid), [np.nan, 5, 3, 3, 1])
+
+    def test_targets(self):
+        np.testing.assert_array_equal(evaluations_to_target(self.losses, 3.0, self.ok), [2, 3])
+        np.testing.assert_array_equal(evaluations_to_target(self.losses, 0.3, self.ok), [np.nan, 4])
+        np.testing.assert_array_equal(time_to_target(self.losses, self.times, 3.0, self.ok), [2.0, 4.0])
+        np.testing.assert_array_equal(time_to_target(self.losses, self.times, 0.1), [np.nan, np.nan])
+
+    def test_solver_and_study(self):
+        project = HyppopyProject({"hyperparameter": {"x": {"domain": "uniform", "data": [0, 1], "type": float}},
+                                  "max_iterations": 30, "solver": "randomsearch"})
+        solver = RandomsearchSolver(project)
+        solver.blackbox = blackbox
+        solver.run(print_stats=False)
+        curve = solver.best_so_far_curve()
+        self.assertEqual(len(curve), 30)
+        self.assertEqual(curve[-1], solver.best_so_far["loss"])
+        self.assertEqual(solver.best_so_far_curve([1e6])[0], curve[-1])
+        self.assertTrue(np.isnan(solver.best_so_far_curve([-1.0])[0]))
+
+        study = RepeatedStudy(project, blackbox, repeats=3)
+        study.run()
+        curves = study.cumulative_minimum()
+        self.assertEqual(curves.shape, (3, 30))
+        np.testing.assert_array_equal(curves[:, -1], study.best_losses())
+        np.testing.assert_array_equal(study.simple_regret(0.0, [1e6])[:, 0], study.best_losses())
+        self.assertTrue(np.all(study.evaluations_to_target(1.0) == 1))
+        self.assertEqual(study.time_to_target(-1.0).shape, (3,))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@
 # See LICENSE
 
 import unittest
+import numpy as np
 
 from hyppopy.solvers.QuasiRandomsearchSolver import *
 from hyppopy.FunctionSimulator import FunctionSimulator
@@ -60,6 +61,132 @@ class QuasiRandomsearchTestSuite(unittest.TestCase):
         for loss in df['losses']:
             self.assertTrue(isinstance(loss, float))
 
+    def test_solver_unique_samples(self):
+        config = {
+            "hyperparameter": {
+                "axis_00": {
+                    "domain": "uniform",
+                    "data": [0, 4],
+                    "type": int
+                },
+                "axis_01": {
+                    "domain": "categorical",
+                    "data": ["a", "b", "c"],
+                    "type": str
+                }
+            },
+            "max_iterations": 100,
+            "unique_samples": True
+        }
+
+        solver = QuasiRandomsearchSolver(config)
+        solver.blackbox = lambda axis_00, axis_01: axis_00 + ["a", "b", "c"].index(axis_01)
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertEqual(len(df), 15)
+        self.assertEqual(len(df.drop_duplicates(subset=['axis_00', 'axis_01'])), 15)
+
+    def test_halton(self):
+        def vdc(n, base):
+            vdc, denom = 0, 1
+            while n:
+                denom *= base
+                n, remainder = divmod(n, base)
+                vdc += remainder / float(denom)
+            return vdc
+
+        self.assertEqual(first_primes(5).tolist(), [2, 3, 5, 7, 11])
+        self.assertEqual(first_primes(3, start=5).tolist(), [5, 7, 11])
+        space = HaltonSequenceGenerator().get_unit_space(50, 3, offset=7)
+        for d, base in enumerate([5, 7, 11]):
+            np.testing.assert_allclose(space[d], [vdc(i, base) for i in range(7, 57)])
+
+        generator = HaltonSequenceGenerator(scramble=True, rng=3)
+        scrambled = generator.get_unit_array(1000, 20)
+        self.assertEqual(scrambled.shape, (20, 1000))
+        self.assertTrue(np.all((scrambled >= 0) & (scrambled < 1)))
+        # each axis keeps the stratification of the radical inverse
+        self.assertTrue(np.all(np.bincount((scrambled[0, :625] * 5).astype(int)) == 125))
+        # continuing the sequence gives the same elements
+        np.testing.assert_array_equal(generator.get_unit_array(10, 20, offset=990), scrambled[:, 990:])
+        np.testing.assert_array_equal(HaltonSequenceGenerator(skip=5).get_unit_array(10, 2),
+                                      HaltonSequenceGenerator().get_unit_array(10, 2, offset=5))
+
+    def test_sobol_and_lhs(self):
+        sobol = SobolSequenceGenerator(scramble=False).get_unit_array(16, 3)
+        self.assertEqual(sobol.shape, (3, 16))
+        self.assertTrue(np.all(np.sort((sobol * 16).astype(int), axis=1) == np.arange(16)))
+        np.testing.assert_array_equal(SobolSequenceGenerator(scramble=False, skip=4).get_unit_array(4, 3), sobol[:, 4:8])
+
+        lhs = LatinHypercubeGenerator(rng=1).get_unit_array(100, 4)
+        self.assertTrue(np.all(np.sort((lhs * 100).astype(int), axis=1) == np.arange(100)))
+        self.assertRaises(LookupError, get_sequence_generator, "unknown")
+
+    def test_sample_generator(self):
+        generator = QuasiRandomSampleGenerator(100, rng=0)
+        generator.set_axis("x", [0, 1], "uniform", float)
+        generator.set_axis("n", [0, 10], "uniform", int)
+        generator.set_axis("kernel", ["rbf", "linear"], "categorical", str)
+        samples = [generator.next() for _ in range(60)]
+        self.assertEqual(generator.pending, 40)
+        self.assertTrue(isinstance(samples[0]["x"], float))
+        self.assertTrue(isinstance(samples[0]["n"], int))
+        self.assertTrue(samples[0]["kernel"] in ["rbf", "linear"])
+        # extending continues the sequence, pending samples are kept
+        generator.extend(50)
+        self.assertEqual(generator.pending, 90)
+        samples += [generator.next() for _ in range(90)]
+        self.assertEqual(generator.pending, 0)
+        expected = HaltonSequenceGenerator().get_unit_array(150, 2)[0]
+        np.testing.assert_array_equal(sorted(sample["x"] for sample in samples[:100]), np.sort(expected[:100]))
+        np.testing.assert_array_equal(sorted(sample["x"] for sample in samples[100:]), np.sort(expected[100:]))
+        # the order within a block is randomized
+        self.assertNotEqual([sample["x"] for sample in samples[:100]], expected[:100].tolist())
+        # used up samples are replaced by a block of the initial size
+        self.assertIsNotNone(generator.next())
+        self.assertEqual(generator.pending, 99)
+
+    def test_categorical_sequence(self):
+        def combinations(categorical_sequence):
+            generator = QuasiRandomSampleGenerator(60, rng=0, categorical_sequence=categorical_sequence)
+            generator.set_axis("x", [0, 1], "uniform", float)
+            generator.set_axis("kernel", ["rbf", "linear", "poly"], "categorical", str)
+            generator.set_axis("depth", [1, 2, 3, 4], "categorical", int)
+            samples = [generator.next() for _ in range(60)]
+            return np.bincount([3 * (sample["depth"] - 1) + ["rbf", "linear", "poly"].index(sample["kernel"])
+                                for sample in samples], minlength=12)
+
+        indices = stratified_categories([0.9, 0.1, 0.5, 0.3, 0.7, 0.2, 0.95], [3, 2])
+        self.assertEqual(indices.tolist(), [[2, 0, 1, 1, 2, 0, 2], [1, 0, 1, 0, 0, 1, 1]])
+        # the sequence covers all 12 category combinations evenly, independent draws clump
+        self.assertEqual(combinations(True).tolist(), [5] * 12)
+        self.assertTrue(combinations(False).max() > 5)
+
+        # the numerical axes keep their values
+        generator = QuasiRandomSampleGenerator(20, rng=0)
+        generator.set_axis("x", [0, 1], "uniform", float)
+        generator.set_axis("kernel", ["rbf", "linear"], "categorical", str)
+        x = sorted(generator.next()["x"] for _ in range(20))
+        np.testing.assert_array_equal(x, np.sort(HaltonSequenceGenerator().get_unit_array(20, 1)[0]))
+
+    def test_solver_sequences(self):
+        for sequence in SEQUENCES:
+            config = {"hyperparameter": {"x": {"domain": "uniform", "data": [0, 1], "type": float},
+                                         "y": {"domain": "uniform", "data": [-5, 5], "type": int},
+                                         "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str}},
+                      "max_iterations": 32,
+                      "sequence": sequence,
+                      "scramble": True,
+                      "seed": 0}
+            solver = QuasiRandomsearchSolver(config)
+            solver.blackbox = lambda x, y, kernel: (x - 0.5) ** 2 + abs(y)
+            solver.run(print_stats=False)
+            df, best = solver.get_results()
+            self.assertEqual(len(df), 32)
+            self.assertTrue(np.all((df['x'] >= 0) & (df['x'] <= 1)))
+            self.assertTrue(np.all((df['y'] >= -5) & (df['y'] <= 5)))
+            self.assertEqual(set(df['kernel']), {"rbf", "linear"})
+
 
 if __name__ == '__main__':
     unittest.main()
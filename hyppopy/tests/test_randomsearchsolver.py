@@ -15,6 +15,7 @@ import numpy as np
 import matplotlib.pylab as plt
 
 from hyppopy.solvers.RandomsearchSolver import *
+from hyppopy.SampleIndex import SampleIndex
 from hyppopy.FunctionSimulator import FunctionSimulator
 from hyppopy.HyppopyProject import HyppopyProject
 
@@ -160,6 +161,58 @@ class RandomsearchTestSuite(unittest.TestCase):
         for loss in df['losses']:
             self.assertTrue(isinstance(loss, float))
 
+    def test_solver_unique_samples(self):
+        config = {
+            "hyperparameter": {
+                "axis_00": {
+                    "domain": "uniform",
+                    "data": [0, 4],
+                    "type": int
+                },
+                "axis_01": {
+                    "domain": "categorical",
+                    "data": ["a", "b", "c"],
+                    "type": str
+                }
+            },
+            "max_iterations": 100,
+            "unique_samples": True,
+            "seed": 0
+        }
+
+        solver = RandomsearchSolver(config)
+        solver.blackbox = lambda axis_00, axis_01: axis_00 + ["a", "b", "c"].index(axis_01)
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertEqual(len(df), 15)
+        self.assertEqual(len(df.drop_duplicates(subset=['axis_00', 'axis_01'])), 15)
+
+    def test_solver_unique_samples_exhausted(self):
+        # the last unseen parameter sets are enumerated instead of redrawn, so the run only stops when all
+        # parameter sets of the searchspace were visited
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "normal", "data": [0, 99], "type": int},
+                "y": {"domain": "uniform", "data": [0, 49], "type": int}
+            },
+            "max_iterations": 6000,
+            "unique_samples": True,
+            "seed": 1
+        }
+        solver = RandomsearchSolver(config)
+        solver.blackbox = lambda x, y: x + y
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertEqual(len(df), 5000)
+        self.assertEqual(len(df.drop_duplicates(subset=['x', 'y'])), 5000)
+
+        index = SampleIndex({"kernel": {"domain": "categorical", "data": ["rbf", "linear", "rbf"], "type": str}})
+        index.add({"kernel": "rbf"})
+        self.assertEqual(list(index.unseen()), [{"kernel": "linear"}])
+        self.assertEqual(index.draw_unseen(np.random.default_rng(0)), {"kernel": "linear"})
+        self.assertIsNone(index.draw_unseen(np.random.default_rng(0)))
+        self.assertTrue(index.exhausted)
+
 
 if __name__ == '__main__':
     unittest.main()
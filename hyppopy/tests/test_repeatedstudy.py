@@ -0,0 +1,68 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import unittest
+import numpy as np
+
+from hyppopy.RepeatedStudy import RepeatedStudy
+from hyppopy.HyppopyProject import HyppopyProject
+
+
+def blackbox(x, y, kernel):
+    return (x - 0.3) ** 2 + (y - 0.7) ** 2 + ["rbf", "linear"].index(kernel)
+
+
+class RepeatedStudyTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [0, 1], "type": float},
+                "y": {"domain": "uniform", "data": [0, 1], "type": float},
+                "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str}
+            },
+            "max_iterations": 40,
+            "solver": "randomsearch"
+        }
+        self.project = HyppopyProject(config)
+
+    def test_study(self):
+        study = RepeatedStudy(self.project, blackbox, repeats=5)
+        results = study.run()
+        self.assertEqual(results.shape, (5, 40, 7))
+        self.assertEqual(study.fields, ['loss', 'ok', 'duration', 'time', 'x', 'y', 'kernel'])
+        self.assertTrue(np.all(study.field('ok') == 1))
+        self.assertTrue(np.all(np.isin(study.field('kernel'), [0, 1])))
+        losses = study.best_losses()
+        self.assertTrue(np.allclose(losses, np.min(study.field('loss'), axis=1)))
+        mean, std = study.best_loss_statistics()
+        self.assertAlmostEqual(mean, np.mean(losses))
+        self.assertAlmostEqual(std, np.std(losses))
+        for n in range(5):
+            self.assertEqual(study.best_params()[n, 0], study.best[n]['x'])
+            self.assertEqual(study.best[n]['kernel'], "rbf")
+        distances = study.distance_to_optimum({"x": 0.3, "y": 0.7})
+        self.assertEqual(distances.shape, (5,))
+        self.assertTrue(np.all(distances < 0.5))
+        self.assertEqual(study.durations.shape, (5,))
+        self.assertTrue(np.all(np.diff(study.field('time'), axis=1) >= 0))
+        self.assertRaises(LookupError, study.field, "z")
+
+    def test_parallel(self):
+        study = RepeatedStudy(self.project, blackbox, solver_name="randomsearch", repeats=4, workers=2)
+        study.run()
+        first = study.field('x')[:, 0]
+        self.assertEqual(len(set(first)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import unittest
+import numpy as np
+
+from hyppopy.SamplingEngine import *
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+
+class SamplingEngineTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.hyperparameter = {
+            "uniform": {"domain": "uniform", "data": [0, 1], "type": float},
+            "integer": {"domain": "uniform", "data": [0, 10], "type": int},
+            "normal": {"domain": "normal", "data": [0, 10], "type": float},
+            "log": {"domain": "loguniform", "data": [1, 1000], "type": float},
+            "kernel": {"domain": "categorical", "data": ["rbf", "linear", 3], "type": str}
+        }
+
+    def test_draw_block(self):
+        rng = np.random.default_rng(0)
+        samples = draw_block(self.hyperparameter["uniform"], 100000, rng)
+        self.assertTrue(np.all((samples >= 0) & (samples <= 1)))
+        self.assertAlmostEqual(np.mean(samples), 0.5, places=2)
+
+        samples = draw_block(self.hyperparameter["integer"], 100000, rng)
+        self.assertEqual(samples.dtype, np.int64)
+        self.assertEqual(set(samples.tolist()), set(range(11)))
+
+        samples = draw_block(self.hyperparameter["normal"], 100000, rng)
+        self.assertTrue(np.all((samples >= 0) & (samples <= 10)))
+        self.assertAlmostEqual(np.mean(samples), 5, places=1)
+        hist = np.histogram(samples, bins=10, range=(0, 10))[0]
+        self.assertTrue(np.all(np.diff(hist[:5]) > 0) and np.all(np.diff(hist[5:]) < 0))
+
+        samples = draw_block(self.hyperparameter["log"], 100000, rng)
+        self.assertTrue(np.all((samples >= 1) & (samples <= 1000)))
+        hist = np.histogram(np.log10(samples), bins=3, range=(0, 3))[0]
+        self.assertTrue(np.all(np.abs(hist / 100000 - 1 / 3) < 0.01))
+
+        samples = draw_block(self.hyperparameter["kernel"], 30000, rng)
+        self.assertEqual(set(samples.tolist()), {"rbf", "linear", 3})
+
+        self.assertRaises(LookupError, draw_block, {"domain": "unknown", "data": [0, 1], "type": float}, 10, rng)
+        self.assertRaises(AssertionError, draw_block, {"domain": "uniform", "data": [1, 0], "type": float}, 10, rng)
+
+    def test_engine(self):
+        engine = SamplingEngine(self.hyperparameter, block_size=16, rng=42)
+        samples = [next(engine) for _ in range(40)]
+        for params in samples:
+            self.assertEqual(list(params.keys()), list(self.hyperparameter.keys()))
+            self.assertTrue(isinstance(params["uniform"], float))
+            self.assertTrue(isinstance(params["integer"], int))
+            self.assertTrue(params["kernel"] in ["rbf", "linear", 3])
+        self.assertEqual(len(set(params["uniform"] for params in samples)), 40)
+
+        # same seed, same parameter sets
+        other = SamplingEngine(self.hyperparameter, block_size=16, rng=np.random.default_rng(42))
+        self.assertEqual(samples, [next(other) for _ in range(40)])
+
+        block = engine.draw(1000000)
+        self.assertEqual(len(block["log"]), 1000000)
+        self.assertEqual(engine.draw_arrays(5)["integer"].dtype, np.int64)
+
+    def test_solver(self):
+        config = {"hyperparameter": self.hyperparameter, "max_iterations": 50, "sample_block_size": 8}
+        solver = RandomsearchSolver(config)
+        self.assertEqual(solver.sample_block_size, 8)
+        solver.blackbox = lambda uniform, integer, normal, log, kernel: uniform + integer
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertEqual(len(df), 50)
+        self.assertEqual(len(df.drop_duplicates(subset=['uniform'])), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import unittest
+import numpy as np
+
+from hyppopy.SolverPool import SolverPool
+from hyppopy.WorkerPool import WorkerPool
+from hyppopy.RepeatedStudy import RepeatedStudy
+from hyppopy.HyppopyProject import HyppopyProject
+
+
+def blackbox(x, kernel):
+    return (x - 0.5) ** 2 + (0.0 if kernel == "rbf" else 0.1)
+
+
+def noisy_blackbox(x):
+    return float(np.random.random())
+
+
+class SeedTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {"hyperparameter": {"x": {"domain": "uniform", "data": [0, 1], "type": float},
+                                          "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str}},
+                       "max_iterations": 15}
+
+    def run_solver(self, name, seed):
+        config = {"hyperparameter": {"x": {"domain": "uniform", "data": [0, 1], "type": float},
+                                     "y": {"domain": "uniform", "data": [0, 1], "type": float}},
+                  "max_iterations": 15,
+                  "seed": seed}
+        solver = SolverPool.get(name, HyppopyProject(config))
+        solver.blackbox = lambda x, y: (x - 0.5) ** 2 + y
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        return list(zip(df["x"], df["y"]))
+
+    def test_solvers(self):
+        for name in ["randomsearch", "quasirandomsearch", "hyperopt", "optuna", "optunity"]:
+            first = self.run_solver(name, 7)
+            self.assertEqual(first, self.run_solver(name, 7), name)
+            self.assertNotEqual(first, self.run_solver(name, 8), name)
+
+    def test_seed_sequence(self):
+        solver = SolverPool.get("randomsearch", HyppopyProject(self.config))
+        solver.blackbox = blackbox
+        self.assertFalse(solver.seeded)
+        solver.seed_sequence = np.random.SeedSequence(3).spawn(2)[1]
+        self.assertTrue(solver.seeded)
+        solver.run(print_stats=False)
+        first = solver.get_results()[0]["x"].tolist()
+        solver.run(print_stats=False)
+        self.assertEqual(first, solver.get_results()[0]["x"].tolist())
+        self.assertRaises(TypeError, setattr, solver, "seed_sequence", 3)
+
+    def test_repeated_study(self):
+        project = HyppopyProject(dict(self.config, solver="randomsearch"))
+        study = RepeatedStudy(project, blackbox, repeats=4, seed=11)
+        study.run()
+        parallel = RepeatedStudy(project, blackbox, repeats=4, workers=2, seed=11)
+        parallel.run()
+        np.testing.assert_array_equal(study.field("x"), parallel.field("x"))
+        self.assertEqual(len(np.unique(study.field("x")[:, 0])), 4)
+
+        project = HyppopyProject(dict(self.config, solver="randomsearch", seed=11))
+        from_settings = RepeatedStudy(project, blackbox, repeats=4)
+        from_settings.run()
+        np.testing.assert_array_equal(study.field("x"), from_settings.field("x"))
+
+    def test_worker_pool(self):
+        params = [{"x": n} for n in range(5)]
+        with WorkerPool(noisy_blackbox, workers=1, seed=5) as pool:
+            first = pool.map(params)
+        with WorkerPool(noisy_blackbox, workers=1, seed=5) as pool:
+            self.assertEqual(first, pool.map(params))
+        with WorkerPool(noisy_blackbox, workers=1, seed=6) as pool:
+            self.assertNotEqual(first, pool.map(params))
+        # each trial gets its own stream, independent of the number of workers and the scheduling
+        params = [{"x": n} for n in range(20)]
+        with WorkerPool(noisy_blackbox, workers=1, seed=5) as pool:
+            sequential = pool.map(params)
+            sequential += [pool(x=n) for n in range(5)]
+        for _ in range(2):
+            with WorkerPool(noisy_blackbox, workers=2, seed=5) as pool:
+                parallel = pool.map(params)
+                parallel += [pool(x=n) for n in range(5)]
+            self.assertEqual(sequential, parallel)
+
+    def test_worker_pool_solver_seed(self):
+        config = {"hyperparameter": {"x": {"domain": "uniform", "data": [0, 1], "type": float}},
+                  "max_iterations": 8}
+        losses = []
+        for seed in [42, 42, 43]:
+            solver = SolverPool.get("randomsearch", HyppopyProject(dict(config, seed=seed)))
+            with WorkerPool(noisy_blackbox, workers=2) as pool:
+                solver.blackbox = pool
+                solver.run(print_stats=False)
+                losses.append(solver.get_results()[0]["losses"].tolist())
+                solver.run(print_stats=False)
+                self.assertEqual(losses[-1], solver.get_results()[0]["losses"].tolist())
+        self.assertEqual(losses[0], losses[1])
+        self.assertNotEqual(losses[0], losses[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
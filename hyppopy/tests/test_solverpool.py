@@ -36,6 +36,7 @@ class SolverPoolTestSuite(unittest.TestCase):
         self.assertTrue("randomsearch" in names)
         self.assertTrue("quasirandomsearch" in names)
         self.assertTrue("gridsearch" in names)
+        self.assertTrue("zoominggridsearch" in names)
 
     def test_getHyperoptSolver(self):
         config = {
@@ -0,0 +1,72 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import unittest
+import numpy as np
+
+from hyppopy.TopTrials import TopTrials
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.BlackboxFunction import BlackboxFunction
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+
+class TopTrialsTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def test_heap(self):
+        top = TopTrials(3)
+        losses = [5.0, 3.0, np.nan, 3.0, 7.0, 1.0, 2.0, 1.0]
+        news = [top.add(loss, tid=n + 1, row=n) for n, loss in enumerate(losses)]
+        self.assertEqual(news, [True, True, False, False, False, True, False, False])
+        self.assertEqual(len(top), 3)
+        self.assertEqual(top.best, (1.0, 6, 5))
+        self.assertEqual(top.sorted(), [(1.0, 6, 5), (1.0, 8, 7), (2.0, 7, 6)])
+
+    def test_solver(self):
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [-10, 10], "type": float},
+                "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str}
+            },
+            "max_iterations": 100,
+            "top_k_size": 5
+        }
+        best_losses = []
+
+        def callback(**kwargs):
+            best_losses.append(solver.best_so_far["loss"])
+
+        def blackbox(data, params):
+            return params["x"] ** 2
+
+        solver = RandomsearchSolver(HyppopyProject(config))
+        solver.blackbox = BlackboxFunction(blackbox_func=blackbox, callback_func=callback, data=[0])
+        solver.run(print_stats=False)
+        self.assertEqual(len(best_losses), 100)
+        self.assertEqual(best_losses, list(np.minimum.accumulate(best_losses)))
+
+        df, best = solver.get_results()
+        self.assertEqual(best, solver.best_so_far["params"])
+        self.assertEqual(solver.best_so_far["loss"], df['losses'].min())
+        expected = sorted(df['losses'])
+        for k in [3, 5, 20]:
+            top = solver.top_k(k)
+            self.assertEqual([t['loss'] for t in top], expected[:k])
+            for t in top:
+                self.assertEqual(df['x'][t['tid'] - 1], t['params']['x'])
+        self.assertEqual(len(solver.top_k()), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
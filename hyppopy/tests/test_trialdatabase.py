@@ -0,0 +1,108 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import os
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+
+from hyppopy.TrialDatabase import TrialDatabase
+from hyppopy.TrialMerge import merge_trials
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+CONFIG = {
+    "hyperparameter": {
+        "C": {"domain": "loguniform", "data": [0.01, 100], "type": float},
+        "n": {"domain": "uniform", "data": [1, 5], "type": int},
+        "kernel": {"domain": "categorical", "data": ["rbf", "linear", "poly"], "type": str}
+    },
+    "max_iterations": 50,
+    "trial_db_batch_size": 7
+}
+
+
+def blackbox(C, n, kernel):
+    return abs(C - 1) + n + ["rbf", "linear", "poly"].index(kernel)
+
+
+def run_shard(path, shard):
+    config = dict(CONFIG, trial_db=path, trial_db_study="shard_{}".format(shard))
+    solver = RandomsearchSolver(HyppopyProject(config))
+    solver.blackbox = blackbox
+    solver.run(print_stats=False)
+
+
+class TrialDatabaseTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "trials.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_write_and_query(self):
+        with TrialDatabase(self.path, CONFIG["hyperparameter"], batch_size=3, flush_interval=100) as db:
+            for n in range(10):
+                db.write(n + 1, {"C": 0.5 * n, "n": n % 5, "kernel": ["rbf", "linear"][n % 2]}, float(10 - n),
+                         'failed' if n == 9 else 'ok', 100.0 + n, 100.5 + n)
+            self.assertEqual(len(db), 10)
+            self.assertEqual(db.best()['tid'], 9)
+            self.assertEqual(db.best(kernel="rbf")['tid'], 9)
+            self.assertEqual(db.best(kernel="linear", C=(0.0, 2.0))['tid'], 4)
+            self.assertIsNone(db.best(kernel="poly"))
+            self.assertEqual([r['tid'] for r in db.query({"n": [0, 1]}, order_by="tid")], [1, 2, 6, 7])
+            self.assertEqual(db.count({"status": "failed"}), 1)
+            self.assertRaises(LookupError, db.query, {"gamma": 1})
+        with TrialDatabase(self.path) as db:
+            self.assertEqual(db.names, ["C", "n", "kernel"])
+            self.assertEqual(db.query(limit=1)[0]['loss'], 1.0)
+            indexes = [row[1] for row in db._connection.execute("PRAGMA index_list(trials)")]
+            self.assertIn("trials_kernel", indexes)
+            self.assertIn("trials_loss", indexes)
+
+    def test_best_uses_index(self):
+        with TrialDatabase(self.path, CONFIG["hyperparameter"]) as db:
+            for n in range(20):
+                db.write(n + 1, {"C": 0.5 * n, "n": n % 5, "kernel": ["rbf", "linear"][n % 2]},
+                         None if n % 3 == 0 else float(n), 'ok', 100.0 + n, 100.5 + n)
+            statements = []
+            db._connection.set_trace_callback(statements.append)
+            self.assertEqual(db.best()['tid'], 2)
+            self.assertEqual(db.best(kernel="linear")['tid'], 2)
+            db._connection.set_trace_callback(None)
+            for statement in [statement for statement in statements if statement.startswith("SELECT")]:
+                plan = " ".join(row[3] for row in db._connection.execute("EXPLAIN QUERY PLAN " + statement))
+                self.assertIn("USING INDEX", plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_processes(self):
+        processes = [multiprocessing.Process(target=run_shard, args=(self.path, shard)) for shard in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        with TrialDatabase(self.path) as db:
+            self.assertEqual(db.count(), 150)
+            for shard in range(3):
+                self.assertEqual(db.count({"study": "shard_{}".format(shard)}), 50)
+            best = db.best()
+        summary = merge_trials([self.path], os.path.join(self.root, "merged.jsonl"))
+        self.assertEqual(summary['trials'], 150)
+        self.assertEqual(summary['best']['loss'], best['loss'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from hyppopy.TrialLog import TrialLog, read_trial_log
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.BlackboxFunction import BlackboxFunction
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+
+class TrialLogTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_write_and_read(self):
+        for ext in [".jsonl", ".csv"]:
+            path = os.path.join(self.root, "log" + ext)
+            with TrialLog(path, ["x", "kernel"], flush_interval=0.0, fsync_interval=0.0) as log:
+                log.write(1, {"x": np.float64(0.5), "kernel": "rbf"}, 0.25, 'ok', 10.0, 10.5)
+                self.assertEqual(len(list(read_trial_log(path))), 1)
+                log.write(2, {"x": 1.5, "kernel": "linear"}, np.nan, 'failed', 11.0, 11.5, cached=True)
+            self.assertEqual(log.count, 2)
+            with TrialLog(path, ["x", "kernel"]) as log:
+                log.write(3, {"x": 2, "kernel": "rbf"}, 1.0, 'ok', 12.0, 12.5)
+            records = list(read_trial_log(path))
+            self.assertEqual([r['tid'] for r in records], [1, 2, 3])
+            self.assertEqual(records[0]['x'], 0.5)
+            self.assertEqual(records[1]['kernel'], "linear")
+            self.assertIsNone(records[1]['loss'])
+            self.assertEqual(records[1]['status'], 'failed')
+            self.assertTrue(records[1]['cached'])
+            self.assertEqual(records[2]['book_time'], 12.0)
+
+    def test_incomplete_line(self):
+        path = os.path.join(self.root, "log.jsonl")
+        with TrialLog(path, ["x"]) as log:
+            log.write(1, {"x": 0.5}, 0.25, 'ok', 10.0, 10.5)
+        with open(path, "a") as f:
+            f.write('{"tid": 2, "lo')
+        self.assertEqual(len(list(read_trial_log(path))), 1)
+
+    def test_flush_without_further_writes(self):
+        for ext in [".jsonl", ".csv"]:
+            path = os.path.join(self.root, "idle" + ext)
+            log = TrialLog(path, ["x"], flush_interval=0.5, fsync_interval=1.0)
+            log.write(1, {"x": 0.5}, 0.25, 'ok', 10.0, 10.5)
+            log.write(2, {"x": 1.5}, 0.5, 'ok', 11.0, 11.5)
+            self.assertEqual(len(list(read_trial_log(path))), 0)
+            # no further trial is written, the timer flushes the buffered trials once the interval has passed
+            time.sleep(1.0)
+            self.assertEqual([r['tid'] for r in read_trial_log(path)], [1, 2])
+            log.close()
+
+    def test_solver(self):
+        path = os.path.join(self.root, "sub", "trials.csv")
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [0, 10], "type": float},
+                "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str}
+            },
+            "max_iterations": 20,
+            "trial_log": path,
+            "trial_log_flush_interval": 0.0
+        }
+
+        lengths = []
+
+        def callback(**kwargs):
+            lengths.append(len(list(read_trial_log(path))))
+
+        def blackbox(data, params):
+            return params["x"] ** 2
+
+        solver = RandomsearchSolver(HyppopyProject(config))
+        solver.blackbox = BlackboxFunction(blackbox_func=blackbox, callback_func=callback, data=[0])
+        solver.run(print_stats=False)
+        records = list(read_trial_log(path))
+        self.assertEqual(len(records), 20)
+        self.assertEqual(lengths, list(range(1, 21)))
+        df, _ = solver.get_results()
+        self.assertEqual(list(df['losses']), [r['loss'] for r in records])
+        self.assertEqual(list(df['kernel']), [r['kernel'] for r in records])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from hyppopy.__main__ import main
+from hyppopy.TrialStore import TrialStore
+from hyppopy.TrialLog import TrialLog, read_trial_log
+from hyppopy.TrialMerge import merge_trials
+from hyppopy.TrialDatabase import TrialDatabase
+
+
+class TrialMergeTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.shards = []
+        for shard, ext in enumerate([".jsonl", ".csv"]):
+            path = os.path.join(self.root, "shard_{}{}".format(shard, ext))
+            with TrialLog(path, ["x", "kernel"]) as log:
+                for n in range(10):
+                    x = n * 2 + shard
+                    log.write(n + 1, {"x": x, "kernel": "rbf"}, (x - 7) ** 2, 'ok', 100.0 + x, 100.5 + x)
+                # every shard evaluated x=100 once
+                log.write(11, {"x": 100, "kernel": "rbf"}, 1.0, 'ok', 200.0 + shard, 200.5 + shard)
+            self.shards.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_merge(self):
+        output = os.path.join(self.root, "merged.jsonl")
+        summary = merge_trials(self.shards, output, top_k=3)
+        self.assertEqual(summary['trials'], 21)
+        self.assertEqual(summary['duplicates'], 1)
+        records = list(read_trial_log(output))
+        self.assertEqual([r['tid'] for r in records], list(range(1, 22)))
+        self.assertEqual([r['x'] for r in records], list(range(20)) + [100])
+        self.assertEqual(summary['best'], {'tid': 8, 'loss': 0.0, 'params': {'x': 7, 'kernel': 'rbf'}})
+        self.assertEqual([t['loss'] for t in summary['top_k']], [0.0, 1.0, 1.0])
+        self.assertEqual([t['tid'] for t in summary['top_k']], [8, 7, 9])
+
+        summary = merge_trials(self.shards, os.path.join(self.root, "all.csv"), deduplicate=False)
+        self.assertEqual(summary['trials'], 22)
+
+    def test_merge_store(self):
+        store = TrialStore()
+        store.append({"x": 7.5, "kernel": "linear"}, loss=-1.0, book_time=50.0, refresh_time=50.5, tid=1)
+        store.append({"x": 3, "kernel": "rbf"}, loss=2.0, status='failed', book_time=51.0, refresh_time=51.5, tid=2)
+        summary = merge_trials([self.shards[0], store], os.path.join(self.root, "merged.jsonl"))
+        self.assertEqual(summary['trials'], 13)
+        self.assertEqual(summary['best']['params'], {'x': 7.5, 'kernel': 'linear'})
+        self.assertEqual(summary['best']['tid'], 1)
+
+    def test_merge_missing_refresh_time(self):
+        # the database returns trials without refresh_time last, the merge has to use the same order
+        hyperparameter = {"x": {"domain": "uniform", "data": [0, 100], "type": int},
+                          "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str}}
+        path = os.path.join(self.root, "shard.db")
+        with TrialDatabase(path, hyperparameter) as database:
+            database.write(1, {"x": 50, "kernel": "rbf"}, 1.0, 'ok', 100.0, None)
+            database.write(2, {"x": 51, "kernel": "rbf"}, 1.0, 'ok', 150.0, 150.5)
+        records = list(read_trial_log(self.merge([self.shards[0], path])))
+        refresh_times = [r['refresh_time'] for r in records]
+        self.assertIsNone(refresh_times[-1])
+        self.assertEqual(refresh_times[:-1], sorted(refresh_times[:-1]))
+        self.assertEqual(records[-1]['x'], 50)
+
+    def test_merge_types(self):
+        # CSV logs read the category "1" as int, the JSON log keeps the str
+        paths = []
+        for ext in [".jsonl", ".csv"]:
+            paths.append(os.path.join(self.root, "types" + ext))
+            with TrialLog(paths[-1], ["kernel"]) as log:
+                log.write(1, {"kernel": "1"}, 1.0, 'ok', 10.0 + len(ext), 10.5 + len(ext))
+        self.assertEqual(merge_trials(paths, os.path.join(self.root, "untyped.jsonl"))['duplicates'], 0)
+        summary = merge_trials(paths, os.path.join(self.root, "typed.jsonl"), hyperparameter={"kernel": str})
+        self.assertEqual(summary['duplicates'], 1)
+        self.assertEqual(summary['best']['params'], {"kernel": "1"})
+        hyperparameter = {"kernel": {"domain": "categorical", "data": ["1", "2"], "type": str}}
+        self.assertEqual(merge_trials(paths, os.path.join(self.root, "project.jsonl"), hyperparameter=hyperparameter)['duplicates'], 1)
+        output = os.path.join(self.root, "cli.jsonl")
+        self.assertEqual(main(["merge", "-o", output, "--type", "kernel=str"] + paths), 0)
+        self.assertEqual(len(list(read_trial_log(output))), 1)
+        self.assertEqual(main(["merge", "-o", output, "--type", "kernel=list"] + paths), 1)
+
+    def merge(self, sources):
+        output = os.path.join(self.root, "merged.jsonl")
+        merge_trials(sources, output)
+        return output
+
+    def test_cli(self):
+        output = os.path.join(self.root, "merged.csv")
+        self.assertEqual(main(["merge", "-o", output, "-k", "2"] + self.shards), 0)
+        self.assertEqual(len(list(read_trial_log(output))), 21)
+        self.assertRaises(AssertionError, main, ["merge", "-o", self.shards[0], self.shards[0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
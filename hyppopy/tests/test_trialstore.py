@@ -0,0 +1,128 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import os
+import unittest
+import datetime
+import numpy as np
+
+from hyppopy.TrialStore import TrialStore
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+
+class TrialStoreTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def test_append(self):
+        store = TrialStore(capacity=2)
+        for n in range(10):
+            store.append({"x": n * 0.5, "n": n, "kernel": ["rbf", "linear"][n % 2]}, loss=(n - 4) ** 2,
+                         book_time=100.0 + n, refresh_time=100.5 + n, tid=n + 1)
+        self.assertEqual(len(store), 10)
+        self.assertEqual(store.names, ["x", "n", "kernel"])
+        self.assertEqual(store.column("n").dtype, np.int64)
+        self.assertEqual(list(store.column("kernel")[:3]), ["rbf", "linear", "rbf"])
+        self.assertTrue(np.allclose(store.durations, 0.5))
+        self.assertEqual(list(store.tids), list(range(1, 11)))
+        self.assertEqual(store.argmin, {"x": 2.0, "n": 4, "kernel": "rbf"})
+
+    def test_status_and_types(self):
+        store = TrialStore()
+        store.append({"n": 1}, loss=-10, status='failed')
+        store.append({"n": 2.5}, loss=None)
+        store.append({"n": 3, "extra": "a"}, loss=1.0, cached=True)
+        self.assertEqual(store.column("n").dtype, np.float64)
+        self.assertEqual(list(store.column("extra")), [None, None, "a"])
+        self.assertEqual(list(store.ok), [False, True, True])
+        self.assertEqual(list(store.cached), [False, False, True])
+        self.assertEqual(store.best_index, 2)
+
+    def test_hyperparameter_kinds(self):
+        hyperparameter = {"gamma": {"domain": "categorical", "data": [0.5, "auto"], "type": str},
+                          "degree": {"domain": "categorical", "data": [2, 3], "type": int},
+                          "n": {"domain": "uniform", "data": [0, 10], "type": int}}
+        store = TrialStore(hyperparameter=hyperparameter)
+        store.append({"gamma": 0.5, "degree": 2, "n": 1}, loss=1.0)
+        store.append({"gamma": "auto", "degree": 3, "n": 2}, loss=0.5)
+        self.assertEqual([store.kind(name) for name in store.names], ["category", "category", "int"])
+        self.assertEqual(list(store.column("gamma")), [0.5, "auto"])
+        self.assertEqual(store.get_params(1), {"gamma": "auto", "degree": 3, "n": 2})
+        self.assertIsInstance(store.get_params(0)["degree"], int)
+
+    def test_trials_view(self):
+        store = TrialStore()
+        now = datetime.datetime.now()
+        store.append({"x": 1.5, "kernel": "rbf"}, loss=0.5, book_time=now, refresh_time=now, tid=1)
+        store.append({"x": 2.5, "kernel": "linear"}, loss=0.2, status='failed', tid=2)
+        trials = store.trials
+        self.assertEqual(len(trials), 2)
+        self.assertEqual(trials[0]['misc']['vals'], {"x": [1.5], "kernel": ["rbf"]})
+        self.assertEqual(trials[0]['result'], {'loss': 0.5, 'status': 'ok'})
+        self.assertEqual(trials[0]['book_time'], now)
+        self.assertEqual(trials[-1]['tid'], 2)
+        self.assertIsNone(trials[-1]['book_time'])
+        self.assertEqual([t['tid'] for t in trials], [1, 2])
+
+    def test_spill(self):
+        store = TrialStore(max_trials_in_memory=4)
+        reference = TrialStore()
+        for n in range(23):
+            params = {"n": n, "kernel": ["rbf", "linear", "poly"][n % 3]}
+            if n == 9:
+                params["n"] = 9.5
+            if n >= 13:
+                params["extra"] = n * 2
+            for s in [store, reference]:
+                s.append(params, loss=(n - 17) ** 2, status='failed' if n == 17 else 'ok', book_time=n, refresh_time=n + 1)
+        self.assertEqual(len(store), 23)
+        self.assertEqual(store.trials_on_disk, 20)
+        self.assertTrue(os.path.isdir(store._directory))
+        for name in reference.names:
+            np.testing.assert_array_equal(store.column(name), reference.column(name))
+            np.testing.assert_array_equal(store.column(name, 2, 21), reference.column(name, 2, 21))
+        self.assertTrue(np.array_equal(store.losses, reference.losses))
+        self.assertEqual(store.column("n").dtype, np.float64)
+        self.assertEqual(store.best_index, 16)
+        self.assertEqual(store.argmin, reference.argmin)
+        self.assertEqual(store.trials[14], reference.trials[14])
+        self.assertEqual(store.trials[-1], reference.trials[-1])
+        directory = store._directory
+        del store
+        self.assertFalse(os.path.isdir(directory))
+
+    def test_spill_solver(self):
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [0, 10], "type": float},
+                "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str}
+            },
+            "max_iterations": 50,
+            "max_trials_in_memory": 8
+        }
+
+        def blackbox(x, kernel):
+            return x ** 2
+
+        solver = RandomsearchSolver(HyppopyProject(config))
+        solver.blackbox = blackbox
+        solver.run(print_stats=False)
+        self.assertEqual(solver.trials.trials_on_disk, 48)
+        df, best = solver.get_results()
+        self.assertEqual(len(df), 50)
+        self.assertEqual(best["x"], df['x'].min())
+
+
+if __name__ == '__main__':
+    unittest.main()
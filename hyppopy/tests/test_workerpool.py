@@ -0,0 +1,92 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import os
+import unittest
+
+from hyppopy.WorkerPool import WorkerPool
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.BlackboxFunction import BlackboxFunction
+from hyppopy.solvers.RandomsearchSolver import RandomsearchSolver
+
+
+def worker_init(values):
+    return {"pid": os.getpid(), "offset": sum(values), "calls": 0}
+
+
+def blackbox_func(data, params, context):
+    context["calls"] += 1
+    return [context["pid"], context["calls"], params["x"] + context["offset"]]
+
+
+def loss_func(data, params, context):
+    context["calls"] += 1
+    return (params["x"] - context["offset"]) ** 2
+
+
+class WorkerPoolTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def test_context_in_process(self):
+        bb = BlackboxFunction(blackbox_func=blackbox_func, worker_init=worker_init, data=[1, 2])
+        self.assertEqual(bb(x=1)[1:], [1, 4])
+        self.assertEqual(bb(x=2)[1:], [2, 5])
+
+    def test_warm_workers(self):
+        bb = BlackboxFunction(blackbox_func=blackbox_func, worker_init=worker_init, data=[1, 2])
+        with WorkerPool(bb, workers=2) as pool:
+            results = pool.map([{"x": n} for n in range(20)])
+            results.append(pool(x=100))
+        pids = set(r[0] for r in results)
+        self.assertTrue(0 < len(pids) <= 2)
+        self.assertNotIn(os.getpid(), pids)
+        for pid in pids:
+            calls = sorted(r[1] for r in results if r[0] == pid)
+            self.assertEqual(calls, list(range(1, len(calls) + 1)))
+        self.assertEqual(sorted(r[2] for r in results), [n + 3 for n in range(20)] + [103])
+
+    def test_solver(self):
+        config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [0, 10], "type": float}
+            },
+            "max_iterations": 50
+        }
+        bb = BlackboxFunction(blackbox_func=loss_func, worker_init=worker_init, data=[1, 2])
+        pool = WorkerPool(bb, workers=2)
+        solver = RandomsearchSolver(HyppopyProject(config))
+        solver.blackbox = pool
+        solver.run(print_stats=False)
+        pool.close()
+        df, best = solver.get_results()
+        self.assertEqual(len(df), 50)
+        self.assertTrue(df['status'].all())
+        self.assertTrue(abs(best['x'] - 3) < 1)
+        stats = solver.serialization_stats
+        self.assertTrue(0 < stats["bytes_per_trial"] < 1000)
+        self.assertTrue(stats["time_per_trial"] > 0)
+        self.assertTrue(stats["setup_bytes"] > 0)
+
+    def test_serialize_once(self):
+        bb = BlackboxFunction(blackbox_func=blackbox_func, worker_init=worker_init, data=list(range(100000)))
+        with WorkerPool(bb, workers=2) as pool:
+            pool.map([{"x": n} for n in range(10)])
+            stats = pool.serialization_stats
+        self.assertEqual(stats["messages"], 10)
+        self.assertTrue(stats["setup_bytes"] > 100000)
+        self.assertTrue(stats["bytes"] < 10 * 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# Hyppopy - A Hyper-Parameter Optimization Toolbox
+#
+# Copyright (c) German Cancer Research Center,
+# Division of Medical Image Computing.
+# All rights reserved.
+#
+# This software is distributed WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.
+#
+# See LICENSE
+
+import unittest
+import numpy as np
+
+from hyppopy.SolverPool import SolverPool
+from hyppopy.HyppopyProject import HyppopyProject
+from hyppopy.solvers.ZoomingGridsearchSolver import *
+
+
+class ZoomingGridsearchTestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {
+            "hyperparameter": {
+                "x": {"domain": "uniform", "data": [0, 10], "type": float, "frequency": 5},
+                "y": {"domain": "uniform", "data": [0, 100], "type": int, "frequency": 5},
+                "kernel": {"domain": "categorical", "data": ["rbf", "linear"], "type": str, "frequency": 1}
+            },
+            "max_iterations": 120
+        }
+
+    @staticmethod
+    def blackbox(x, y, kernel):
+        return (x - 3.3) ** 2 + (y - 41) ** 2 / 100 + ["rbf", "linear"].index(kernel)
+
+    def test_solver(self):
+        solver = SolverPool.get("zoominggridsearch", HyppopyProject(self.config))
+        self.assertTrue(isinstance(solver, ZoomingGridsearchSolver))
+        solver.blackbox = self.blackbox
+        solver.run(print_stats=False)
+        df, best = solver.get_results()
+        self.assertTrue(len(df) <= 120)
+        self.assertEqual(len(df), len(set(zip(df['x'], df['y'], df['kernel']))))
+        self.assertTrue(len(solver.rounds) > 1)
+        self.assertEqual(solver.rounds[0]["grid_size"], 50)
+        self.assertEqual(sum(r["evaluations"] for r in solver.rounds), len(df))
+        self.assertEqual(best["kernel"], "rbf")
+        self.assertAlmostEqual(best["x"], 3.3, delta=0.2)
+        self.assertAlmostEqual(best["y"], 41, delta=2)
+
+        # the ranges shrink around the best cell and the categorical axis is reduced to the best category
+        second = solver.rounds[1]["hyperparameter"]
+        self.assertEqual(second["x"]["data"], [0.0, 5.0])
+        self.assertEqual(second["y"]["data"], [25, 75])
+        self.assertEqual(second["kernel"]["data"], ["rbf"])
+
+    def test_rounds(self):
+        solver = ZoomingGridsearchSolver(dict(self.config, max_iterations=1000, zoom_rounds=2))
+        solver.blackbox = self.blackbox
+        solver.run(print_stats=False)
+        self.assertEqual(len(solver.rounds), 2)
+        self.assertEqual(len(solver.get_results()[0]), sum(r["evaluations"] for r in solver.rounds))
+
+        solver = ZoomingGridsearchSolver(dict(self.config, max_iterations=1000, zoom_top_k=3))
+        solver.blackbox = self.blackbox
+        solver.run(print_stats=False)
+        self.assertTrue(len(solver.get_results()[0]) < 1000)
+        self.assertEqual(solver.rounds[-1]["evaluations"], 0)
+
+    def test_float_keys(self):
+        # re-gridded loguniform axes differ from the previous round's values in the last digits only
+        for data, frequency, center, evaluations in [([0.001, 1000], 7, 0.3, [7, 4, 4, 4, 4, 4]),
+                                                     ([1, 1e7], 7, 3.8, [7, 4, 4, 4, 4, 4]),
+                                                     ([1, 1e12], 11, 6.3, [11, 8, 8, 8, 8, 8])]:
+            config = {"hyperparameter": {"x": {"domain": "loguniform", "data": data, "type": float, "frequency": frequency}},
+                      "max_iterations": 200,
+                      "zoom_rounds": 6}
+            solver = ZoomingGridsearchSolver(config)
+            solver.blackbox = lambda x: (np.log10(x) - center) ** 2
+            solver.run(print_stats=False)
+            x = solver.get_results()[0]['x']
+            self.assertEqual(len(x), len(set(float("{:.12g}".format(value)) for value in x)))
+            self.assertEqual([r["evaluations"] for r in solver.rounds], evaluations)
+
+    def test_budget(self):
+        solver = ZoomingGridsearchSolver(dict(self.config, max_iterations=30))
+        solver.blackbox = self.blackbox
+        solver.run(print_stats=False)
+        self.assertEqual(len(solver.get_results()[0]), 30)
+        self.assertEqual(len(solver.rounds), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
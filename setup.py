@@ -35,20 +35,27 @@ setup(
     url='',
     license=license,
     packages=find_packages(exclude=('tests', 'doc')),
+    entry_points={
+        'console_scripts': ['hyppopy=hyppopy.__main__:main'],
+    },
     # the requirements to install this project.
     # Since this one is so simple this is empty.
     install_requires=[
 		'bayesian-optimization>=1.0.1',
-		'hyperopt>=0.1.2',
+		'hyperopt>=0.2.7',
 		'matplotlib>=3.0.3',
-		'numpy>=1.16.2',
+		'numpy>=1.17.0',
 		'optuna>=0.9.0',
 		'Optunity>=1.1.1',
-		'pandas>=0.24.2',
 		'pytest>=4.3.1',
 		'scikit-learn>=0.20.3',
 		'scipy>=1.2.1',
 		'visdom>=0.1.8.8'
 	],
+    # optional result formats of HyppopySolver.get_results, numpy results need no extra package
+    extras_require={
+		'pandas': ['pandas>=0.24.2'],
+		'arrow': ['pyarrow>=0.15.0']
+	},
 )
 